@@ -0,0 +1,97 @@
+"""Compare upstream bytes and latency of the docs_get_content read paths.
+
+Runs each path against a real document using the configured credentials:
+
+    python benchmarks/bench_docs_export.py DOCUMENT_ID [--runs 5] [--config config.json]
+
+``structured-full`` is the original Docs API read, ``structured`` the text-run
+field mask, and ``text``/``markdown`` the Drive export endpoint.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any, List
+
+from tabulate import tabulate
+
+from mcp_google_suite.auth.google_auth import GoogleAuth
+from mcp_google_suite.config import Config
+from mcp_google_suite.docs.service import EXPORT_MIME_TYPES, TEXT_RUN_FIELDS, DocsService
+from mcp_google_suite.drive.service import DriveService
+
+
+async def fetch_structured(docs: DocsService, document_id: str, fields: str = None) -> int:
+    """Read a document through the Docs API and return the response size in bytes."""
+    service = await docs.get_service()
+    request_args = {"documentId": document_id}
+    if fields:
+        request_args["fields"] = fields
+    request = service.documents().get(**request_args)
+
+    size = 0
+    postproc = request.postproc
+
+    def capture(resp: Any, content: bytes) -> Any:
+        nonlocal size
+        size = len(content)
+        return postproc(resp, content)
+
+    request.postproc = capture
+    await docs.execute(request)
+    return size
+
+
+async def fetch_export(drive: DriveService, document_id: str, mime_type: str) -> int:
+    """Stream a Drive export and return the number of bytes received."""
+    size = 0
+    async for chunk in drive.iter_export(document_id, mime_type):
+        size += len(chunk)
+    return size
+
+
+async def run(document_id: str, runs: int, config_path: str = None) -> List[List[Any]]:
+    """Time every read path and return one table row per path."""
+    auth = GoogleAuth(Config.load(config_path))
+    docs, drive = DocsService(auth), DriveService(auth)
+
+    paths = {
+        "structured-full": lambda: fetch_structured(docs, document_id),
+        "structured": lambda: fetch_structured(docs, document_id, TEXT_RUN_FIELDS),
+        **{
+            name: (lambda mime_type=mime_type: fetch_export(drive, document_id, mime_type))
+            for name, mime_type in EXPORT_MIME_TYPES.items()
+        },
+    }
+
+    rows = []
+    for name, fetch in paths.items():
+        await fetch()  # warm up connections and discovery
+        timings: List[float] = []
+        size = 0
+        for _ in range(runs):
+            started = time.perf_counter()
+            size = await fetch()
+            timings.append((time.perf_counter() - started) * 1000)
+        rows.append([name, size, round(statistics.median(timings), 1), round(max(timings), 1)])
+    return rows
+
+
+def main() -> None:
+    """Parse arguments and print the comparison table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("document_id", help="ID of a (preferably large) Google Doc")
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs per path")
+    parser.add_argument("--config", help="Path to configuration file")
+    args = parser.parse_args()
+
+    rows = asyncio.run(run(args.document_id, args.runs, args.config))
+    baseline = rows[0][1] or 1
+    table = [row[:2] + [f"{row[1] / baseline:.1%}"] + row[2:] for row in rows]
+    headers = ["Path", "Bytes", "Of full", "Median ms", "Max ms"]
+    print(tabulate(table, headers=headers, tablefmt="grid"))
+
+
+if __name__ == "__main__":
+    main()
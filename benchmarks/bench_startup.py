@@ -0,0 +1,87 @@
+"""Measure time from process launch to the first ``initialize`` response in stdio mode.
+
+Spawns the server repeatedly and sends an MCP ``initialize`` request over stdin:
+
+    python benchmarks/bench_startup.py [--runs 10] [--config config.json]
+
+No Google credentials are needed; the handshake does not touch the APIs.
+Set ``MCP_PROFILE_STARTUP=1`` to also see the launcher's phase breakdown.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import List, Optional
+
+from tabulate import tabulate
+
+
+INITIALIZE = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2024-11-05",
+        "capabilities": {},
+        "clientInfo": {"name": "bench-startup", "version": "0.1.0"},
+    },
+}
+
+
+def time_to_initialize(config_path: Optional[str] = None) -> float:
+    """Launch the stdio server once and return milliseconds until it answers ``initialize``."""
+    command = [sys.executable, "-m", "mcp_google_suite.launcher", "run", "--mode", "stdio"]
+    if config_path:
+        command += ["--config", config_path]
+
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        command,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=None if os.environ.get("MCP_PROFILE_STARTUP") else subprocess.DEVNULL,
+        text=True,
+    )
+    try:
+        process.stdin.write(json.dumps(INITIALIZE) + "\n")
+        process.stdin.flush()
+        line = process.stdout.readline()
+        elapsed = (time.perf_counter() - started) * 1000
+    finally:
+        process.kill()
+        process.wait()
+
+    response = json.loads(line)
+    if "result" not in response:
+        raise RuntimeError(f"initialize failed: {response}")
+    return elapsed
+
+
+def main() -> None:
+    """Parse arguments and print the start-up latency summary."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="Number of launches to time")
+    parser.add_argument("--config", help="Path to configuration file")
+    args = parser.parse_args()
+
+    time_to_initialize(args.config)  # warm the filesystem and bytecode caches
+    timings: List[float] = [time_to_initialize(args.config) for _ in range(args.runs)]
+
+    table = [
+        [
+            args.runs,
+            round(min(timings), 1),
+            round(statistics.median(timings), 1),
+            round(max(timings), 1),
+        ]
+    ]
+    headers = ["Runs", "Min ms", "Median ms", "Max ms"]
+    print(tabulate(table, headers=headers, tablefmt="grid"))
+
+
+if __name__ == "__main__":
+    main()
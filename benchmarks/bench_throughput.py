@@ -0,0 +1,534 @@
+"""Measure tool call throughput, latency and server memory against the local fake Google APIs.
+
+Starts the fake backend and the server as subprocesses, then drives each
+transport with a closed loop of concurrent clients:
+
+    python benchmarks/bench_throughput.py [--transports invoke,sse,ws,stdio]
+        [--concurrency 1,8,32] [--duration 10] [--scenario read|write|sheets|mixed]
+        [--latency 0.02] [--output results.json] [--compare baseline.json]
+
+No Google credentials are needed. Client-side Google quotas are disabled
+unless ``--rate-limit`` is given, so the numbers measure the server rather
+than the quota. ``--output`` saves the results as JSON and ``--compare``
+reports throughput drops or p99 rises beyond ``--threshold`` against an
+earlier run, exiting with status 1 if any are found.
+
+The ``ws`` transport needs the ``websockets`` package and is skipped without
+it. stdio clients share one session, so its concurrency measures queueing in
+a single session rather than parallel work.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+import httpx
+from tabulate import tabulate
+
+from mcp_google_suite.fake import write_fake_credentials
+
+
+TRANSPORTS = ("invoke", "sse", "ws", "stdio")
+SCENARIOS = ("read", "write", "sheets", "mixed")
+PROTOCOL_VERSION = "2024-11-05"
+CLIENT_INFO = {"name": "bench-throughput", "version": "0.1.0"}
+# Share of reads that fetch document content, and of sheet calls that read values
+CONTENT_READ_SHARE = 0.5
+SHEETS_READ_SHARE = 0.7
+
+Call = Callable[[str, Dict[str, Any]], Awaitable[bool]]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def memory_mb(pid: Optional[int]) -> Tuple[Optional[float], Optional[float]]:
+    """Return the current and peak resident set size of a process, on Linux."""
+    if pid is None:
+        return None, None
+    values = {}
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in ("VmRSS", "VmHWM"):
+                    values[key] = round(int(value.split()[0]) / 1024, 1)
+    except OSError:
+        return None, None
+    return values.get("VmRSS"), values.get("VmHWM")
+
+
+def child_server_pid() -> Optional[int]:
+    """Find the stdio server spawned by this process, on Linux."""
+    try:
+        for tid in os.listdir("/proc/self/task"):
+            with open(f"/proc/self/task/{tid}/children") as f:
+                for pid in f.read().split():
+                    with open(f"/proc/{pid}/cmdline", "rb") as cmd:
+                        if b"--mode\0stdio" in cmd.read():
+                            return int(pid)
+    except OSError:
+        pass
+    return None
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def workload(scenario: str, seeded: Dict[str, List[str]]) -> Callable[[random.Random], Tuple]:
+    """Return a function that picks the next ``(tool_name, arguments)`` for a scenario."""
+    documents, spreadsheets = seeded["documents"], seeded["spreadsheets"]
+
+    def read(rng: random.Random) -> Tuple[str, Dict[str, Any]]:
+        document_id = rng.choice(documents)
+        if rng.random() < CONTENT_READ_SHARE:
+            return "docs_get_content", {"document_id": document_id, "format": "text"}
+        return "drive_get_file_metadata", {"file_id": document_id}
+
+    def write(rng: random.Random) -> Tuple[str, Dict[str, Any]]:
+        request = {"insertText": {"location": {"index": 1}, "text": "bench "}}
+        return "docs_batch_update", {"document_id": rng.choice(documents), "requests": [request]}
+
+    def sheets(rng: random.Random) -> Tuple[str, Dict[str, Any]]:
+        spreadsheet_id = rng.choice(spreadsheets)
+        row = rng.randint(1, 50)
+        if rng.random() < SHEETS_READ_SHARE:
+            return "sheets_get_values", {
+                "spreadsheet_id": spreadsheet_id,
+                "range": f"Sheet1!A{row}:E{row + 20}",
+            }
+        return "sheets_update_values", {
+            "spreadsheet_id": spreadsheet_id,
+            "range": f"Sheet1!A{row}",
+            "values": [[row, "bench"]],
+        }
+
+    def mixed(rng: random.Random) -> Tuple[str, Dict[str, Any]]:
+        return rng.choices([read, write, sheets], weights=[6, 2, 2])[0](rng)
+
+    return {"read": read, "write": write, "sheets": sheets, "mixed": mixed}[scenario]
+
+
+@asynccontextmanager
+async def invoke_clients(base_url: str, concurrency: int) -> AsyncIterator[List[Call]]:
+    """HTTP ``/invoke-tool`` calls over one pooled client."""
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+
+        async def call(name: str, arguments: Dict[str, Any]) -> bool:
+            response = await client.post(
+                "/invoke-tool", json={"tool_name": name, "params": arguments}
+            )
+            return response.status_code == httpx.codes.OK
+
+        yield [call] * concurrency
+
+
+@asynccontextmanager
+async def session_calls(session: Any) -> AsyncIterator[Call]:
+    await session.initialize()
+
+    async def call(name: str, arguments: Dict[str, Any]) -> bool:
+        result = await session.call_tool(name, arguments)
+        return not getattr(result, "isError", False)
+
+    yield call
+
+
+@asynccontextmanager
+async def sse_clients(base_url: str, concurrency: int) -> AsyncIterator[List[Call]]:
+    """One MCP session over SSE per client."""
+    from contextlib import AsyncExitStack
+
+    from mcp.client.session import ClientSession
+    from mcp.client.sse import sse_client
+
+    async with AsyncExitStack() as stack:
+        calls = []
+        for _ in range(concurrency):
+            streams = await stack.enter_async_context(sse_client(f"{base_url}/sse", timeout=30))
+            session = await stack.enter_async_context(ClientSession(*streams))
+            calls.append(await stack.enter_async_context(session_calls(session)))
+        yield calls
+
+
+@asynccontextmanager
+async def ws_clients(base_url: str, concurrency: int) -> AsyncIterator[List[Call]]:
+    """One MCP session per client over raw JSON-RPC WebSocket messages."""
+    from contextlib import AsyncExitStack
+
+    import websockets
+
+    url = base_url.replace("http://", "ws://", 1) + "/ws"
+
+    async def request(ws: Any, ids: Any, method: str, params: Dict[str, Any]) -> Dict:
+        request_id = next(ids)
+        message = {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+        await ws.send(json.dumps(message))
+        while True:
+            reply = json.loads(await ws.recv())
+            if reply.get("id") == request_id:
+                return reply
+
+    async with AsyncExitStack() as stack:
+        calls = []
+        for _ in range(concurrency):
+            ws = await stack.enter_async_context(websockets.connect(url, subprotocols=["mcp"]))
+            ids = itertools.count(1)
+            await request(
+                ws,
+                ids,
+                "initialize",
+                {
+                    "protocolVersion": PROTOCOL_VERSION,
+                    "capabilities": {},
+                    "clientInfo": CLIENT_INFO,
+                },
+            )
+            await ws.send(json.dumps({"jsonrpc": "2.0", "method": "notifications/initialized"}))
+
+            async def call(
+                name: str, arguments: Dict[str, Any], ws: Any = ws, ids: Any = ids
+            ) -> bool:
+                reply = await request(ws, ids, "tools/call", {"name": name, "arguments": arguments})
+                return "result" in reply and not reply["result"].get("isError", False)
+
+            calls.append(call)
+        yield calls
+
+
+@asynccontextmanager
+async def stdio_clients(config_path: str, concurrency: int) -> AsyncIterator[List[Call]]:
+    """All clients share one stdio session with a server subprocess."""
+    from mcp.client.session import ClientSession
+    from mcp.client.stdio import StdioServerParameters, stdio_client
+
+    params = StdioServerParameters(
+        command=sys.executable,
+        args=["-m", "mcp_google_suite.launcher", "run", "--mode", "stdio", "--config", config_path],
+        env=dict(os.environ),
+    )
+    async with stdio_client(params) as streams, ClientSession(*streams) as session:
+        async with session_calls(session) as call:
+            yield [call] * concurrency
+
+
+async def drive_load(
+    calls: List[Call], next_call: Callable, duration: float, seed: int
+) -> Tuple[List[float], int]:
+    """Run every client in a closed loop for ``duration`` seconds."""
+    latencies: List[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def client(call: Call, rng: random.Random) -> None:
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            name, arguments = next_call(rng)
+            started = time.perf_counter()
+            try:
+                ok = await call(name, arguments)
+            except Exception:
+                ok = False
+            latencies.append((time.perf_counter() - started) * 1000)
+            if not ok:
+                errors += 1
+
+    await asyncio.gather(
+        *(client(call, random.Random(seed + index)) for index, call in enumerate(calls))
+    )
+    return latencies, errors
+
+
+def open_clients(
+    transport: str, concurrency: int, base_url: str, config_path: str
+) -> AsyncContextManager[List[Call]]:
+    """Return the clients of one transport, opened when entered."""
+    if transport == "invoke":
+        return invoke_clients(base_url, concurrency)
+    if transport == "sse":
+        return sse_clients(base_url, concurrency)
+    if transport == "ws":
+        return ws_clients(base_url, concurrency)
+    return stdio_clients(config_path, concurrency)
+
+
+async def run_case(
+    transport: str,
+    concurrency: int,
+    clients: AsyncContextManager[List[Call]],
+    args: argparse.Namespace,
+    next_call: Callable,
+) -> Dict[str, Any]:
+    """Open the clients for one transport, warm up, and measure."""
+    async with clients as calls:
+        if args.warmup > 0:
+            await drive_load(calls, next_call, args.warmup, args.seed)
+        started = time.perf_counter()
+        latencies, errors = await drive_load(calls, next_call, args.duration, args.seed)
+        elapsed = time.perf_counter() - started
+        pid = child_server_pid() if transport == "stdio" else args.server_pid
+        rss, peak = memory_mb(pid)
+
+    return {
+        "transport": transport,
+        "scenario": args.scenario,
+        "concurrency": concurrency,
+        "calls": len(latencies),
+        "errors": errors,
+        "throughput": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50), 2),
+        "p99_ms": round(percentile(latencies, 0.99), 2),
+        "rss_mb": rss,
+        "peak_rss_mb": peak,
+    }
+
+
+def start_fake(args: argparse.Namespace) -> Tuple[subprocess.Popen, Dict[str, Any], str]:
+    """Start the fake backend and return it with its seeded IDs and base URL."""
+    port = free_port()
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "mcp_google_suite.fake",
+            "--port",
+            str(port),
+            "--latency",
+            str(args.latency),
+            "--jitter",
+            str(args.jitter),
+            "--error-rate",
+            str(args.error_rate),
+            "--documents",
+            str(args.documents),
+            "--paragraphs",
+            str(args.paragraphs),
+            "--spreadsheets",
+            str(args.spreadsheets),
+            "--rows",
+            str(args.rows),
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    seeded = json.loads(process.stdout.readline())
+    base_url = f"http://127.0.0.1:{port}"
+    wait_for(f"{base_url}/_fake/stats")
+    return process, seeded, base_url
+
+
+def start_server(config_path: str) -> Tuple[subprocess.Popen, str]:
+    """Start the server in web mode (which serves invoke, SSE and WS) and return its URL."""
+    port = free_port()
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "mcp_google_suite.launcher",
+            "run",
+            "--mode",
+            "sse",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--config",
+            config_path,
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    wait_for(f"{base_url}/health")
+    return process, base_url
+
+
+def wait_for(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if httpx.get(url, timeout=1).status_code == httpx.codes.OK:
+                return
+        except httpx.HTTPError:
+            pass
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"{url} did not come up within {timeout} seconds")
+        time.sleep(0.1)
+
+
+def compare(results: List[Dict], baseline_path: str, threshold: float) -> List[List[Any]]:
+    """Return one row per case found in both runs; the last column flags regressions."""
+    with open(baseline_path) as f:
+        baseline = {
+            (row["transport"], row["scenario"], row["concurrency"]): row
+            for row in json.load(f)["results"]
+        }
+    rows = []
+    for row in results:
+        before = baseline.get((row["transport"], row["scenario"], row["concurrency"]))
+        if before is None:
+            continue
+        throughput = row["throughput"] / before["throughput"] - 1 if before["throughput"] else 0
+        p99 = row["p99_ms"] / before["p99_ms"] - 1 if before["p99_ms"] else 0
+        regressed = throughput < -threshold or p99 > threshold
+        rows.append(
+            [
+                row["transport"],
+                row["concurrency"],
+                f"{throughput:+.1%}",
+                f"{p99:+.1%}",
+                "REGRESSION" if regressed else "ok",
+            ]
+        )
+    return rows
+
+
+def parse_args() -> Tuple[argparse.Namespace, List[str]]:
+    """Parse the command line; also return the transports that can run here."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transports", default="invoke,sse,ws,stdio", help="Comma separated")
+    parser.add_argument("--concurrency", default="1,8,32", help="Comma separated client counts")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds measured per case")
+    parser.add_argument("--warmup", type=float, default=1.0, help="Unmeasured seconds per case")
+    parser.add_argument("--scenario", choices=SCENARIOS, default="mixed", help="Tool call mix")
+    parser.add_argument("--latency", type=float, default=0.02, help="Fake API latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.005, help="Fake API latency jitter")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fake API failure rate")
+    parser.add_argument("--documents", type=int, default=20, help="Documents to seed")
+    parser.add_argument("--paragraphs", type=int, default=50, help="Paragraphs per document")
+    parser.add_argument("--spreadsheets", type=int, default=5, help="Spreadsheets to seed")
+    parser.add_argument("--rows", type=int, default=200, help="Rows per spreadsheet")
+    parser.add_argument(
+        "--rate-limit", action="store_true", help="Keep the client-side Google quotas"
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the call mix")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--compare", help="Compare against results saved with --output")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Regression tolerance")
+    args = parser.parse_args()
+
+    transports = [name for name in args.transports.split(",") if name]
+    unknown = set(transports) - set(TRANSPORTS)
+    if unknown:
+        parser.error(f"Unknown transports: {', '.join(sorted(unknown))}")
+    if "ws" in transports:
+        try:
+            import websockets  # noqa: F401
+        except ImportError:
+            print("Skipping ws: install the 'websockets' package to benchmark it", file=sys.stderr)
+            transports.remove("ws")
+    return args, transports
+
+
+def write_config(workdir: str, seeded: Dict[str, Any], rate_limit: bool) -> str:
+    """Write the server configuration for a run and return its path."""
+    credentials_path = os.path.join(workdir, "credentials.json")
+    write_fake_credentials(credentials_path)
+    config_path = os.path.join(workdir, "config.json")
+    with open(config_path, "w") as f:
+        json.dump(
+            {
+                "credentials": {"server_credentials": credentials_path},
+                "google_api": {"discovery_url": seeded["discovery_url"]},
+                "rate_limit": {"enabled": rate_limit},
+                # stdio servers dump metrics on exit; keep them off the console
+                "metrics": {"dump_path": os.path.join(workdir, "metrics.prom")},
+            },
+            f,
+        )
+    return config_path
+
+
+def main() -> None:
+    """Parse arguments, run every transport and concurrency, and report."""
+    args, transports = parse_args()
+    levels = [int(level) for level in args.concurrency.split(",")]
+
+    workdir = tempfile.mkdtemp(prefix="bench-throughput-")
+    fake, seeded, fake_url = start_fake(args)
+    server = None
+    try:
+        config_path = write_config(workdir, seeded, args.rate_limit)
+        server, base_url = start_server(config_path)
+        args.server_pid = server.pid
+        next_call = workload(args.scenario, seeded)
+
+        results = []
+        for transport in transports:
+            for concurrency in levels:
+                clients = open_clients(transport, concurrency, base_url, config_path)
+                case = run_case(transport, concurrency, clients, args, next_call)
+                results.append(asyncio.run(case))
+        backend = httpx.get(f"{fake_url}/_fake/stats").json()
+    finally:
+        for process in (server, fake):
+            if process is not None:
+                process.terminate()
+                try:
+                    process.wait(timeout=10)
+                except subprocess.TimeoutExpired:  # uvicorn waits for open SSE streams
+                    process.kill()
+                    process.wait()
+
+    headers = ["Transport", "Clients", "Calls", "Errors", "Calls/s", "p50 ms", "p99 ms"]
+    headers += ["RSS MB", "Peak MB"]
+    table = [
+        [
+            row["transport"],
+            row["concurrency"],
+            row["calls"],
+            row["errors"],
+            row["throughput"],
+            row["p50_ms"],
+            row["p99_ms"],
+            row["rss_mb"],
+            row["peak_rss_mb"],
+        ]
+        for row in results
+    ]
+    print(tabulate(table, headers=headers, tablefmt="grid"))
+    print(f"Fake backend served {sum(backend['requests'].values())} requests")
+
+    if args.output:
+        meta = {key: value for key, value in vars(args).items() if key != "server_pid"}
+        with open(args.output, "w") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+
+    if args.compare:
+        rows = compare(results, args.compare, args.threshold)
+        headers = ["Transport", "Clients", "Calls/s", "p99", "Status"]
+        print(tabulate(rows, headers=headers, tablefmt="grid"))
+        if any(row[-1] == "REGRESSION" for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
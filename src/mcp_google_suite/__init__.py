@@ -1,7 +1,20 @@
 """MCP server for Google Workspace operations."""
 
-from mcp_google_suite.server import GoogleWorkspaceMCPServer
+from typing import TYPE_CHECKING, Any
+
+
+if TYPE_CHECKING:
+    from mcp_google_suite.server import GoogleWorkspaceMCPServer
 
 
 __version__ = "0.1.0"
 __all__ = ["GoogleWorkspaceMCPServer"]
+
+
+def __getattr__(name: str) -> Any:
+    # Deferred so that importing a submodule (e.g. the launcher) stays cheap
+    if name == "GoogleWorkspaceMCPServer":
+        from mcp_google_suite.server import GoogleWorkspaceMCPServer
+
+        return GoogleWorkspaceMCPServer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
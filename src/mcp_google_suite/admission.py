@@ -0,0 +1,168 @@
+"""Admission control: global and per-tool concurrency limits with bounded queues."""
+
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+from mcp_google_suite.config import AdmissionConfig
+
+
+GLOBAL_SCOPE = "*"
+# JSON-RPC reserves -32000..-32099 for implementation-defined server errors
+OVERLOADED_ERROR_CODE = -32000
+
+
+class OverloadedError(Exception):
+    """Raised when a call cannot be admitted; ``retry_after`` is a hint in seconds."""
+
+    def __init__(self, scope: str, reason: str, retry_after: int):
+        target = "server" if scope == GLOBAL_SCOPE else f"tool {scope}"
+        super().__init__(f"Too many concurrent calls to {target} ({reason})")
+        self.scope = scope
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class Gate:
+    """A concurrency limit with a bounded FIFO wait queue.
+
+    Hold times are tracked as an exponential moving average so rejections can
+    suggest when a slot is likely to free up.
+    """
+
+    def __init__(self, scope: str, max_concurrency: int, max_queue: int):
+        self.scope = scope
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max(0, max_queue)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.active = 0
+        self.queued = 0
+        self.max_queued = 0
+        self.admitted = 0
+        self.rejected = {"queue_full": 0, "timeout": 0}
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self._avg_hold = 0.0
+
+    def retry_after(self) -> int:
+        """Estimate whole seconds until a newly queued call would be admitted."""
+        backlog = (self.queued + 1) / self.max_concurrency
+        return max(1, math.ceil(backlog * self._avg_hold))
+
+    async def acquire(self, timeout: float) -> None:
+        """Wait up to ``timeout`` seconds for a slot, or raise ``OverloadedError``."""
+        if not self._semaphore.locked():
+            await self._semaphore.acquire()  # a free slot is taken without suspending
+            self.admitted += 1
+            self.active += 1
+            return
+
+        if self.queued >= self.max_queue:
+            self.rejected["queue_full"] += 1
+            raise OverloadedError(self.scope, "queue full", self.retry_after())
+
+        started = time.perf_counter()
+        self.queued += 1
+        self.max_queued = max(self.max_queued, self.queued)
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), max(timeout, 0.0))
+        except asyncio.TimeoutError:
+            self.rejected["timeout"] += 1
+            raise OverloadedError(self.scope, "queue timeout", self.retry_after()) from None
+        finally:
+            self.queued -= 1
+
+        waited = time.perf_counter() - started
+        self.wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        self.admitted += 1
+        self.active += 1
+
+    def release(self, held: Optional[float] = None) -> None:
+        """Free a slot, folding the ``held`` seconds into the average hold time."""
+        self.active -= 1
+        if held is not None:
+            self._avg_hold = held if not self._avg_hold else 0.8 * self._avg_hold + 0.2 * held
+        self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth, wait time and rejection counters."""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected),
+            "wait_seconds": round(self.wait_seconds, 6),
+            "max_wait_seconds": round(self.max_wait_seconds, 6),
+            "avg_wait_seconds": (
+                round(self.wait_seconds / self.admitted, 6) if self.admitted else 0.0
+            ),
+        }
+
+
+class AdmissionController:
+    """Admits tool calls through a per-tool gate and then the global gate.
+
+    Waiting on the tool gate first keeps a burst of one slow tool from
+    occupying global slots that other tools could use.
+    """
+
+    def __init__(self, config: Optional[AdmissionConfig] = None):
+        self.config = config or AdmissionConfig()
+        self.enabled = self.config.enabled
+        self.global_gate = Gate(GLOBAL_SCOPE, self.config.max_concurrency, self.config.max_queue)
+        self._tool_gates: Dict[str, Gate] = {}
+
+    def gate(self, tool_name: str) -> Gate:
+        """Return the gate for a tool, creating it from configuration on first use."""
+        gate = self._tool_gates.get(tool_name)
+        if gate is None:
+            limits = self.config.tools.get(tool_name)
+            gate = Gate(
+                tool_name,
+                limits.max_concurrency if limits else self.config.tool_max_concurrency,
+                limits.max_queue if limits else self.config.tool_max_queue,
+            )
+            self._tool_gates[tool_name] = gate
+        return gate
+
+    @asynccontextmanager
+    async def admit(self, tool_name: str) -> AsyncIterator[None]:
+        """Hold a tool slot and a global slot for the duration of the block.
+
+        Raises ``OverloadedError`` when a queue is full or the queue timeout, shared by
+        both gates, runs out.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        deadline = time.perf_counter() + self.config.queue_timeout_seconds
+        tool_gate = self.gate(tool_name)
+        await tool_gate.acquire(self.config.queue_timeout_seconds)
+        try:
+            await self.global_gate.acquire(deadline - time.perf_counter())
+        except BaseException:
+            tool_gate.release()
+            raise
+
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            held = time.perf_counter() - started
+            self.global_gate.release(held)
+            tool_gate.release(held)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return gate statistics for the global limit and every tool seen so far."""
+        return {
+            "enabled": self.enabled,
+            "global": self.global_gate.stats(),
+            "tools": {name: gate.stats() for name, gate in self._tool_gates.items()},
+        }
@@ -2,15 +2,17 @@
 
 import asyncio
 import os
-from typing import Optional
-
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
+from typing import TYPE_CHECKING, Any, Callable, Optional
 
+from mcp_google_suite import tracing
+from mcp_google_suite.auth.shared_tokens import SharedTokenCache
 from mcp_google_suite.config import Config
 
 
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
+
+
 SCOPES = [
     "https://www.googleapis.com/auth/drive",
     "https://www.googleapis.com/auth/documents",
@@ -24,8 +26,11 @@ class GoogleAuth:
     def __init__(self, config: Optional[Config] = None, config_path: Optional[str] = None):
         """Initialize authentication with optional config or config_path."""
         self.config = config or Config.load(config_path)
-        self.creds: Optional[Credentials] = None
+        self.creds: Optional["Credentials"] = None
         self._creds_lock = asyncio.Lock()
+        self.refresh_count = 0
+        shared_dir = self.config.credentials.shared_token_dir
+        self.shared_tokens = SharedTokenCache(shared_dir) if shared_dir else None
         # Ensure credentials directory exists
         self.config.ensure_credentials_dir()
 
@@ -47,14 +52,15 @@ class GoogleAuth:
             )
         print(f"Authenticating and saving credentials to {server_creds_path}")
 
+        from google_auth_oauthlib.flow import InstalledAppFlow
+
         # Run the flow in a thread since it's blocking
         flow = await asyncio.to_thread(
             InstalledAppFlow.from_client_secrets_file, oauth_creds_path, SCOPES
         )
         self.creds = await asyncio.to_thread(flow.run_local_server, port=0)
 
-        # Save the credentials
-        # await asyncio.to_thread(self._save_credentials)  # NOTE: Disabled for Cloud Run compatibility
+        # Saving the credentials with _save_credentials is disabled for Cloud Run compatibility
 
         print("\nAuthentication successful!")
         print(f"Credentials saved to: {server_creds_path}")
@@ -65,15 +71,19 @@ class GoogleAuth:
             with open(self.config.credentials.expanded_server_credentials, "w") as f:
                 f.write(self.creds.to_json())
 
-    async def get_credentials(self) -> Credentials:
+    async def get_credentials(self) -> "Credentials":
         """Get and refresh Google OAuth2 credentials asynchronously."""
+        # google-auth pulls in requests and crypto backends; load them on first use
+        from google.auth.transport.requests import Request
+        from google.oauth2.credentials import Credentials
+
         async with self._creds_lock:
             if self.creds and self.creds.valid:
                 return self.creds
 
             if self.creds and self.creds.expired and self.creds.refresh_token:
-                await asyncio.to_thread(self.creds.refresh, Request())
-                # await asyncio.to_thread(self._save_credentials)  # NOTE: Disabled for Cloud Run compatibility
+                await self._refresh(Request)
+                # Not saved back: disabled for Cloud Run compatibility
                 return self.creds
 
             # Try to load saved credentials
@@ -87,8 +97,8 @@ class GoogleAuth:
                     return self.creds
 
                 if self.creds.expired and self.creds.refresh_token:
-                    await asyncio.to_thread(self.creds.refresh, Request())
-                    # await asyncio.to_thread(self._save_credentials)  # NOTE: Disabled for Cloud Run compatibility
+                    await self._refresh(Request)
+                    # Not saved back: disabled for Cloud Run compatibility
                     return self.creds
 
             raise FileNotFoundError(
@@ -96,6 +106,15 @@ class GoogleAuth:
                 "Please run authentication first: python -m mcp_google_suite auth"
             )
 
+    async def _refresh(self, request_factory: Callable[[], Any]) -> None:
+        """Refresh expired credentials, through the shared token cache when configured."""
+        with tracing.span("auth.refresh", shared=self.shared_tokens is not None):
+            if self.shared_tokens is None:
+                await asyncio.to_thread(self.creds.refresh, request_factory())
+                self.refresh_count += 1
+            elif await asyncio.to_thread(self.shared_tokens.refresh, self.creds, request_factory):
+                self.refresh_count += 1
+
     async def is_authorized(self) -> bool:
         """Check if we have valid credentials asynchronously."""
         try:
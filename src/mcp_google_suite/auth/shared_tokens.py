@@ -0,0 +1,95 @@
+"""Access tokens shared between worker processes of one server instance."""
+
+import hashlib
+import json
+import os
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Iterator, Optional
+
+from mcp_google_suite.localdirs import private_directory
+
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+
+class SharedTokenCache:
+    """Coordinates OAuth token refreshes across processes through a local directory.
+
+    The first worker to find its token expired takes an exclusive file lock,
+    refreshes, and publishes the new access token; workers waiting on the lock
+    then adopt that token instead of refreshing again. Without ``fcntl`` the
+    lock is skipped and the cache only saves refreshes that do not overlap.
+    The directory must be private to the current user.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = private_directory(directory)
+
+    def refresh(self, creds: Any, request_factory: Callable[[], Any]) -> bool:
+        """Bring ``creds`` up to date, returning True if this process refreshed them.
+
+        Blocking; call it from a worker thread.
+        """
+        path = self._token_path(creds)
+        with self._locked(path + ".lock"):
+            self._adopt(creds, path)
+            if creds.valid:
+                return False
+
+            creds.refresh(request_factory())
+            self._publish(creds, path)
+            return True
+
+    @staticmethod
+    def _identity(creds: Any) -> str:
+        identity = f"{creds.client_id or ''}:{creds.refresh_token or ''}"
+        return hashlib.sha256(identity.encode("utf-8")).hexdigest()[:16]
+
+    def _token_path(self, creds: Any) -> str:
+        return os.path.join(self.directory, f"{self._identity(creds)}.json")
+
+    @contextmanager
+    def _locked(self, path: str) -> Iterator[None]:
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)  # closing the descriptor releases the lock
+
+    @staticmethod
+    def _adopt(creds: Any, path: str) -> None:
+        """Copy a token published by another worker onto ``creds``."""
+        shared = _read_json(path)
+        if not shared or not shared.get("token"):
+            return
+        expiry = datetime.fromisoformat(shared["expiry"]) if shared.get("expiry") else None
+        if creds.expiry is None or (expiry is not None and expiry > creds.expiry):
+            creds.token = shared["token"]
+            creds.expiry = expiry
+
+    @staticmethod
+    def _publish(creds: Any, path: str) -> None:
+        """Atomically write the refreshed access token for other workers."""
+        payload = {
+            "token": creds.token,
+            "expiry": creds.expiry.isoformat() if creds.expiry else None,
+        }
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, path)
+
+
+def _read_json(path: str) -> Optional[dict]:
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
@@ -1,28 +1,74 @@
 import asyncio
-from typing import Any, Dict, Optional
+import threading
+import time
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
-from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 
+from mcp_google_suite import tracing
 from mcp_google_suite.auth.google_auth import GoogleAuth
+from mcp_google_suite.cache import ResponseCache
+from mcp_google_suite.metrics import ServerMetrics
+from mcp_google_suite.ratelimit import READ, WRITE, RateLimiter, is_idempotent
+
+
+# Google batch endpoints accept at most 100 sub-requests per call
+BATCH_LIMIT = 100
+DEFAULT_BATCH_CONCURRENCY = 4
+# Status of a conditional read whose cached copy is still current
+NOT_MODIFIED = 304
 
 
 class BaseGoogleService:
     """Base class for Google Workspace services."""
 
-    def __init__(self, service_name: str, version: str, auth: Optional[GoogleAuth] = None):
+    def __init__(  # noqa: PLR0913 - one argument per shared server component
+        self,
+        service_name: str,
+        version: str,
+        auth: Optional[GoogleAuth] = None,
+        cache: Optional[ResponseCache] = None,
+        limiter: Optional[RateLimiter] = None,
+        metrics: Optional[ServerMetrics] = None,
+    ):
         self.service_name = service_name
         self.version = version
         self.auth = auth or GoogleAuth()
+        self.cache = cache
+        self.limiter = limiter
+        self.metrics = metrics
         self._service = None
         self._service_lock = asyncio.Lock()
+        self._credentials = None
+        self._local = threading.local()
 
     async def get_service(self) -> Any:
         """Get the Google service client asynchronously."""
         if not self._service:
             async with self._service_lock:
                 if not self._service:  # Double check pattern
+                    # Imported on first use: discovery dominates start-up time otherwise
+                    from googleapiclient.discovery import build
+
                     credentials = await self.auth.get_credentials()
-                    self._service = build(self.service_name, self.version, credentials=credentials)
+                    self._credentials = credentials
+                    discovery_url = self.auth.config.google_api.discovery_url
+                    if discovery_url:
+                        # Fetching the document is blocking I/O, unlike the bundled copies
+                        self._service = await asyncio.to_thread(
+                            build,
+                            self.service_name,
+                            self.version,
+                            credentials=credentials,
+                            discoveryServiceUrl=discovery_url,
+                            static_discovery=False,
+                            cache_discovery=False,
+                        )
+                    else:
+                        self._service = build(
+                            self.service_name, self.version, credentials=credentials
+                        )
         return self._service
 
     @property
@@ -35,6 +81,230 @@ class BaseGoogleService:
             raise RuntimeError("Service not initialized. Call get_service() first")
         return self._service
 
+    @property
+    def credential_key(self) -> str:
+        """Identify the credential whose quota this service's calls count against."""
+        return self.auth.config.credentials.expanded_server_credentials
+
+    async def _send(self, request: Any, safe: Optional[bool] = None) -> Any:
+        """Execute a request in a worker thread under the client-side quota.
+
+        Throttled and transient failures are retried only when the request is
+        idempotent or the caller marks it ``safe`` to repeat.
+        """
+        if self.metrics is not None:
+            send = self._measured(request)
+        else:
+            send = partial(self._in_thread, request)
+
+        if self.limiter is None:
+            return await send()
+
+        kind = READ if request.method.upper() == "GET" else WRITE
+        retry = is_idempotent(request) if safe is None else safe
+        return await self.limiter.call(self.service_name, self.credential_key, kind, send, retry)
+
+    async def _in_thread(self, request: Any) -> Any:
+        """Run ``request.execute`` in a worker thread, traced when a trace is active.
+
+        The ``google.request`` span gets an ``executor.wait`` child covering the
+        time the call waited for a free worker thread.
+        """
+        method = getattr(request, "methodId", None) or request.method
+        with tracing.span("google.request", service=self.service_name, method=method) as span:
+            if span is None:
+                return await asyncio.to_thread(self._execute, request)
+
+            postproc = request.postproc
+
+            def annotate(resp: Any, content: bytes) -> Any:
+                span.set("http.status_code", resp.status)
+                span.set("response_bytes", len(content or b""))
+                return postproc(resp, content)
+
+            def run() -> Any:
+                span.record("executor.wait", submitted)
+                request.postproc = annotate
+                try:
+                    return self._execute(request)
+                finally:
+                    request.postproc = postproc
+
+            submitted = time.time_ns()
+            try:
+                return await asyncio.to_thread(run)
+            except HttpError as error:
+                span.set("http.status_code", error.resp.status)
+                raise
+
+    def _execute(self, request: Any) -> Any:
+        """Run ``request`` on the calling worker thread's own HTTP connection.
+
+        httplib2 connections are not thread-safe, and every request built from
+        one client shares that client's connection.
+        """
+        if self._credentials is None:
+            return request.execute()
+        http = getattr(self._local, "http", None)
+        if http is None:
+            from google_auth_httplib2 import AuthorizedHttp
+            from googleapiclient.http import build_http
+
+            http = self._local.http = AuthorizedHttp(self._credentials, http=build_http())
+        return request.execute(http=http)
+
+    def _measured(self, request: Any) -> Callable[[], Awaitable[Any]]:
+        """Wrap a request so every attempt records latency, status and bytes."""
+        method = getattr(request, "methodId", None) or request.method
+        sent = len(request.body or "")
+        response: Dict[str, Any] = {"status": "error", "size": 0}
+        postproc = request.postproc
+
+        def measure(resp: Any, content: bytes) -> Any:
+            response["status"] = resp.status
+            response["size"] = len(content or b"")
+            return postproc(resp, content)
+
+        request.postproc = measure
+
+        async def send() -> Any:
+            started = time.perf_counter()
+            try:
+                return await self._in_thread(request)
+            except HttpError as error:
+                response["status"] = error.resp.status
+                raise
+            finally:
+                self.metrics.upstream(
+                    self.service_name,
+                    method,
+                    response["status"],
+                    time.perf_counter() - started,
+                    sent,
+                    response["size"],
+                )
+                response.update(status="error", size=0)
+
+        return send
+
+    async def execute(self, request: Any, cached: bool = False, safe: Optional[bool] = None) -> Any:
+        """Execute an API request in a worker thread.
+
+        With ``cached`` set and a response cache attached, a previously seen ETag is
+        sent as ``If-None-Match`` and a ``304 Not Modified`` is answered from the cache.
+        ``safe`` overrides whether a failed request may be retried.
+        """
+        if not cached or self.cache is None:
+            return await self._send(request, safe)
+
+        key = f"{request.method} {request.uri}"
+        entry = self.cache.get(key)
+        if entry is not None:
+            request.headers["If-None-Match"] = entry.etag
+
+        captured: Dict[str, Any] = {}
+        postproc = request.postproc
+
+        def capture(resp: Any, content: bytes) -> Any:
+            captured["etag"] = resp.get("etag")
+            captured["size"] = len(content or b"")
+            return postproc(resp, content)
+
+        request.postproc = capture
+        try:
+            body = await self._send(request, safe)
+        except HttpError as error:
+            if entry is not None and error.resp.status == NOT_MODIFIED:
+                self.cache.record_not_modified()
+                return entry.body
+            raise
+
+        if captured.get("etag"):
+            self.cache.put(key, captured["etag"], body, captured["size"])
+        return body
+
+    async def execute_batch(
+        self,
+        requests: Dict[str, Any],
+        max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Execute keyed API requests through the Google batch endpoint.
+
+        Requests are split into multipart batches of at most BATCH_LIMIT entries and
+        up to ``max_concurrency`` batches are in flight at once. Every key maps to
+        either ``{"success": True, "response": ...}`` or a formatted error.
+        """
+        if not requests:
+            return {}
+
+        from google_auth_httplib2 import AuthorizedHttp
+        from googleapiclient.http import build_http
+
+        service = await self.get_service()
+        credentials = await self.auth.get_credentials()
+        items = list(requests.items())
+        chunks = [items[i : i + BATCH_LIMIT] for i in range(0, len(items), BATCH_LIMIT)]
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        def run_chunk(chunk: List[Tuple[str, Any]]) -> Dict[str, Dict[str, Any]]:
+            outcome: Dict[str, Dict[str, Any]] = {}
+
+            def callback(request_id: str, response: Any, exception: Exception) -> None:
+                if exception is not None:
+                    outcome[request_id] = {"success": False, **self.handle_error(exception)}
+                else:
+                    outcome[request_id] = {"success": True, "response": response}
+
+            batch = service.new_batch_http_request(callback=callback)
+            for request_id, request in chunk:
+                batch.add(request, request_id=request_id)
+
+            try:
+                # httplib2 connections are not thread-safe, so each batch gets its own
+                batch.execute(http=AuthorizedHttp(credentials, http=build_http()))
+            except HttpError as error:
+                failure = {"success": False, **self.handle_error(error)}
+                for request_id, _request in chunk:
+                    outcome.setdefault(request_id, failure)
+            return outcome
+
+        async def run_bounded(chunk: List[Tuple[str, Any]]) -> Dict[str, Dict[str, Any]]:
+            async with semaphore:
+                if self.limiter is not None:
+                    # Google counts every request inside a batch against the quota
+                    reads = sum(1 for _id, request in chunk if request.method.upper() == "GET")
+                    for kind, count in ((READ, reads), (WRITE, len(chunk) - reads)):
+                        if count:
+                            await self.limiter.acquire(
+                                self.service_name, self.credential_key, kind, count
+                            )
+                started = time.perf_counter()
+                with tracing.span(
+                    "google.batch", service=self.service_name, requests=len(chunk)
+                ) as span:
+                    submitted = time.time_ns()
+
+                    def run_traced() -> Dict[str, Dict[str, Any]]:
+                        if span is not None:
+                            span.record("executor.wait", submitted)
+                        return run_chunk(chunk)
+
+                    outcome = await asyncio.to_thread(run_traced)
+                if self.metrics is not None:
+                    failed = any(not result["success"] for result in outcome.values())
+                    self.metrics.upstream(
+                        self.service_name,
+                        "batch",
+                        "partial" if failed else 200,
+                        time.perf_counter() - started,
+                    )
+                return outcome
+
+        results: Dict[str, Dict[str, Any]] = {}
+        for outcome in await asyncio.gather(*(run_bounded(chunk) for chunk in chunks)):
+            results.update(outcome)
+        return results
+
     def handle_error(self, error: Exception) -> Dict[str, Any]:
         """Handle and format service errors."""
         error_details = {"error": str(error), "type": error.__class__.__name__}
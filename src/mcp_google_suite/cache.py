@@ -0,0 +1,88 @@
+"""ETag-validated response cache shared by the Google service clients."""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from mcp_google_suite.config import CacheConfig
+
+
+@dataclass
+class CacheEntry:
+    """A cached response body and the ETag it was served with."""
+
+    etag: str
+    body: Any
+    size: int
+
+
+class ResponseCache:
+    """Size-bounded LRU cache of response bodies keyed by request URI.
+
+    Entries are only ever served after the server confirms them with a
+    ``304 Not Modified``, so staleness is bounded by the upstream ETag.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, enabled: bool = True):
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._total_bytes = 0
+        self.lookups = 0
+        self.revalidations = 0
+        self.not_modified = 0
+        self.stores = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_config(cls, config: CacheConfig) -> "ResponseCache":
+        """Create a cache from configuration settings."""
+        return cls(max_bytes=config.max_bytes, enabled=config.enabled)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Return the entry for a key, marking it most recently used."""
+        if not self.enabled:
+            return None
+        self.lookups += 1
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.revalidations += 1
+        return entry
+
+    def put(self, key: str, etag: str, body: Any, size: int) -> None:
+        """Store a response, evicting least recently used entries over the byte budget."""
+        if not self.enabled or size > self.max_bytes:
+            return
+        self.invalidate(key)
+        self._entries[key] = CacheEntry(etag=etag, body=body, size=size)
+        self._total_bytes += size
+        self.stores += 1
+        while self._total_bytes > self.max_bytes:
+            _key, evicted = self._entries.popitem(last=False)
+            self._total_bytes -= evicted.size
+            self.evictions += 1
+
+    def invalidate(self, key: str) -> None:
+        """Drop a cached entry if present."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry.size
+
+    def record_not_modified(self) -> None:
+        """Count a 304 response served from the cache."""
+        self.not_modified += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache counters and the 304 hit ratio."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "lookups": self.lookups,
+            "revalidations": self.revalidations,
+            "not_modified": self.not_modified,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "hit_ratio": self.not_modified / self.lookups if self.lookups else 0.0,
+        }
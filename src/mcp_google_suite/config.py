@@ -2,7 +2,7 @@
 
 import json
 import os
-from typing import Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -10,9 +10,13 @@ from pydantic import BaseModel, Field
 # Default paths
 DEFAULT_GOOGLE_DIR = os.path.expanduser("~/.google")
 # Use environment variable for server credentials path if available
-DEFAULT_SERVER_CREDS = os.getenv("SERVER_CREDENTIALS_PATH", os.path.join(DEFAULT_GOOGLE_DIR, "server-creds.json"))
+DEFAULT_SERVER_CREDS = os.getenv(
+    "SERVER_CREDENTIALS_PATH", os.path.join(DEFAULT_GOOGLE_DIR, "server-creds.json")
+)
 # Use environment variable for OAuth credentials path if available
-DEFAULT_OAUTH_CREDS = os.getenv("OAUTH_CREDENTIALS_PATH", os.path.join(DEFAULT_GOOGLE_DIR, "oauth.keys.json"))
+DEFAULT_OAUTH_CREDS = os.getenv(
+    "OAUTH_CREDENTIALS_PATH", os.path.join(DEFAULT_GOOGLE_DIR, "oauth.keys.json")
+)
 
 
 class CredentialsConfig(BaseModel):
@@ -24,6 +28,10 @@ class CredentialsConfig(BaseModel):
     oauth_credentials: str = Field(
         default=DEFAULT_OAUTH_CREDS, description="Path to the OAuth credentials JSON file"
     )
+    shared_token_dir: Optional[str] = Field(
+        default=None,
+        description="Directory where worker processes share refreshed access tokens",
+    )
 
     def ensure_credentials_dir(self) -> None:
         """Ensure the credentials directory exists."""
@@ -41,10 +49,245 @@ class CredentialsConfig(BaseModel):
         return os.path.expanduser(self.oauth_credentials)
 
 
+class CacheConfig(BaseModel):
+    """Conditional request (ETag) cache settings."""
+
+    enabled: bool = Field(default=True, description="Revalidate cached responses with ETags")
+    max_bytes: int = Field(
+        default=32 * 1024 * 1024, description="Maximum size of cached response bodies in bytes"
+    )
+
+
+class DriveConfig(BaseModel):
+    """Google Drive client settings."""
+
+    path_ttl_seconds: float = Field(
+        default=300.0, description="How long resolved path-to-ID mappings stay cached"
+    )
+
+
+class DocsConfig(BaseModel):
+    """Google Docs client settings."""
+
+    index_cache_entries: int = Field(
+        default=64, description="Document structure indexes kept, one per document"
+    )
+    fan_out_concurrency: int = Field(
+        default=4, description="Documents updated at once by docs_batch_update_many"
+    )
+    fan_out_max_documents: int = Field(
+        default=500, description="Most documents one docs_batch_update_many call may update"
+    )
+
+
+class SerializationConfig(BaseModel):
+    """Tool result serialization settings."""
+
+    backend: str = Field(
+        default="auto", description="JSON backend: auto (orjson when installed), json or orjson"
+    )
+    indent: Optional[int] = Field(default=None, description="Indent width; None for compact")
+    stream_threshold_bytes: int = Field(
+        default=1024 * 1024, description="HTTP results larger than this are sent in chunks"
+    )
+    chunk_size: int = Field(default=64 * 1024, description="Chunk size for streamed results")
+
+
+class ToolLimitConfig(BaseModel):
+    """Concurrency limit for a single tool."""
+
+    max_concurrency: int = Field(description="Calls of this tool that may run at once")
+    max_queue: int = Field(default=64, description="Calls that may wait for a slot")
+
+
+class AdmissionConfig(BaseModel):
+    """Admission control for tool calls over HTTP and MCP sessions."""
+
+    enabled: bool = Field(default=True, description="Apply concurrency limits to tool calls")
+    max_concurrency: int = Field(default=64, description="Tool calls that may run at once")
+    max_queue: int = Field(default=256, description="Tool calls that may wait for a slot")
+    queue_timeout_seconds: float = Field(
+        default=10.0, description="How long a call may wait before it is rejected"
+    )
+    tool_max_concurrency: int = Field(
+        default=16, description="Default per-tool limit on concurrent calls"
+    )
+    tool_max_queue: int = Field(default=64, description="Default per-tool wait queue size")
+    tools: Dict[str, ToolLimitConfig] = Field(
+        default_factory=dict, description="Per-tool overrides keyed by tool name"
+    )
+
+
+class QuotaConfig(BaseModel):
+    """Per-minute request quota of one Google API for a single credential."""
+
+    read_per_minute: int = Field(description="Read requests allowed per minute")
+    write_per_minute: int = Field(description="Write requests allowed per minute")
+
+
+def _default_quotas() -> Dict[str, QuotaConfig]:
+    # Published per-user quotas; Drive recommends keeping writes to ~3 per second
+    return {
+        "drive": QuotaConfig(read_per_minute=12000, write_per_minute=180),
+        "docs": QuotaConfig(read_per_minute=300, write_per_minute=60),
+        "sheets": QuotaConfig(read_per_minute=60, write_per_minute=60),
+    }
+
+
+class RateLimitConfig(BaseModel):
+    """Client-side rate limiting and retries for Google API calls."""
+
+    enabled: bool = Field(default=True, description="Throttle and retry Google API calls")
+    quotas: Dict[str, QuotaConfig] = Field(
+        default_factory=_default_quotas, description="Quotas keyed by API name (drive, docs, ...)"
+    )
+    burst_seconds: float = Field(
+        default=10.0, description="Seconds of quota that may be spent in a single burst"
+    )
+    max_wait_seconds: float = Field(
+        default=30.0, description="Longest a call may wait for quota or a retry before failing"
+    )
+    max_retries: int = Field(default=4, description="Retries for throttled or transient errors")
+    backoff_base_seconds: float = Field(default=0.5, description="First retry backoff ceiling")
+    backoff_max_seconds: float = Field(default=32.0, description="Largest retry backoff ceiling")
+
+
+class IdempotencyConfig(BaseModel):
+    """Replay store for write calls made with an idempotency key."""
+
+    enabled: bool = Field(default=True, description="Honor idempotency keys on write tools")
+    ttl_seconds: float = Field(default=24 * 3600, description="How long results are replayed")
+    max_entries: int = Field(default=1000, description="Maximum number of recorded results")
+    directory: Optional[str] = Field(
+        default=None, description="Keep records on local disk here instead of only in memory"
+    )
+    wait_seconds: float = Field(
+        default=300.0, description="How long to wait for the same call in another worker"
+    )
+
+
+class PaginationConfig(BaseModel):
+    """Size budget for tool results and the store holding what did not fit."""
+
+    enabled: bool = Field(default=True, description="Split oversized document and sheet reads")
+    max_result_chars: int = Field(
+        default=100_000, description="Default budget per result; the rest is kept for fetch_more"
+    )
+    ttl_seconds: float = Field(
+        default=600.0, description="How long a continuation token can be resolved"
+    )
+    max_entries: int = Field(default=100, description="Maximum number of spilled results")
+    max_bytes: int = Field(
+        default=64 * 1024 * 1024, description="Maximum size of spilled results kept in memory"
+    )
+    directory: Optional[str] = Field(
+        default=None, description="Keep spilled results on local disk here instead of in memory"
+    )
+
+
+class MetricsConfig(BaseModel):
+    """Metrics collection settings."""
+
+    enabled: bool = Field(default=True, description="Collect tool and upstream API metrics")
+    dump_path: Optional[str] = Field(
+        default=None,
+        description=(
+            "File stdio mode writes metrics to on SIGUSR1 and exit; without it metrics "
+            "go to stderr on SIGUSR1 only"
+        ),
+    )
+
+
+class TracingConfig(BaseModel):
+    """Per-call tracing settings."""
+
+    enabled: bool = Field(default=False, description="Record spans for tool calls")
+    sample_rate: float = Field(
+        default=1.0, description="Fraction of calls without an incoming traceparent to trace"
+    )
+    file_path: Optional[str] = Field(
+        default=None,
+        description="JSON lines file spans are appended to (default: a file in the temp dir)",
+    )
+    otlp_endpoint: Optional[str] = Field(
+        default=None,
+        description="OTLP/HTTP traces endpoint, e.g. http://localhost:4318/v1/traces",
+    )
+    service_name: str = Field(default="mcp-google-suite", description="Reported service name")
+
+
+class ProfilingConfig(BaseModel):
+    """Profiling settings for live instances."""
+
+    sample_rate: float = Field(
+        default=0.0, description="Fraction of tool calls to profile (0 disables)"
+    )
+    interval_seconds: float = Field(default=0.005, description="Stack sampling interval")
+    directory: Optional[str] = Field(
+        default=None, description="Directory profiles are written to (default: in the temp dir)"
+    )
+    max_profiles: int = Field(default=200, description="Profile files kept in the directory")
+    debug_endpoints: bool = Field(
+        default=False, description="Serve /debug/profile for on-demand process profiles"
+    )
+
+
+def _default_redact_keys() -> List[str]:
+    return ["token", "secret", "password", "authorization", "credential", "api_key"]
+
+
+class LoggingConfig(BaseModel):
+    """Log output, written to stderr from a background thread."""
+
+    level: str = Field(default="INFO", description="Root log level (INFO logs tool calls)")
+    format: str = Field(default="text", description="Line format: text or json")
+    queue_size: int = Field(
+        default=10000, description="Records buffered for the writer; more are dropped"
+    )
+    max_argument_chars: int = Field(
+        default=512, description="Longest tool argument summary written to a log line"
+    )
+    redact_keys: List[str] = Field(
+        default_factory=_default_redact_keys,
+        description="Argument names containing any of these are logged as [redacted]",
+    )
+    tool_sample_rate: float = Field(
+        default=1.0, description="Fraction of successful tool calls logged at INFO"
+    )
+    tool_sample_rates: Dict[str, float] = Field(
+        default_factory=dict, description="Per-tool overrides of tool_sample_rate"
+    )
+
+
+class GoogleApiConfig(BaseModel):
+    """Where Google API clients are built from."""
+
+    discovery_url: Optional[str] = Field(
+        default=None,
+        description=(
+            "Discovery document URL template with {api} and {apiVersion}, e.g. a local fake "
+            "backend; default: the discovery documents bundled with the client library"
+        ),
+    )
+
+
 class Config(BaseModel):
     """Main configuration settings."""
 
     credentials: CredentialsConfig = Field(default_factory=CredentialsConfig)
+    cache: CacheConfig = Field(default_factory=CacheConfig)
+    drive: DriveConfig = Field(default_factory=DriveConfig)
+    docs: DocsConfig = Field(default_factory=DocsConfig)
+    serialization: SerializationConfig = Field(default_factory=SerializationConfig)
+    admission: AdmissionConfig = Field(default_factory=AdmissionConfig)
+    rate_limit: RateLimitConfig = Field(default_factory=RateLimitConfig)
+    idempotency: IdempotencyConfig = Field(default_factory=IdempotencyConfig)
+    pagination: PaginationConfig = Field(default_factory=PaginationConfig)
+    metrics: MetricsConfig = Field(default_factory=MetricsConfig)
+    tracing: TracingConfig = Field(default_factory=TracingConfig)
+    profiling: ProfilingConfig = Field(default_factory=ProfilingConfig)
+    google_api: GoogleApiConfig = Field(default_factory=GoogleApiConfig)
+    logging: LoggingConfig = Field(default_factory=LoggingConfig)
 
     @classmethod
     def load(cls, config_path: Optional[str] = None) -> "Config":
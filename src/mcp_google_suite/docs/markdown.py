@@ -0,0 +1,297 @@
+"""Compile Markdown into Docs ``batchUpdate`` requests.
+
+Supported: ATX headings, paragraphs, bulleted and numbered lists (nested by
+indentation), fenced code blocks, block quotes, and inline bold, italic,
+strikethrough, code and links. Everything else is inserted as text.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from mcp_google_suite.docs.structure import utf16_len
+
+
+CODE_FONT = "Courier New"
+BULLET_PRESETS = {
+    "bullet": "BULLET_DISC_CIRCLE_SQUARE",
+    "numbered": "NUMBERED_DECIMAL_ALPHA_ROMAN",
+}
+# Text style fields cleared on inserted text so that it does not inherit the
+# style of the text it is inserted after
+RESET_FIELDS = "bold,italic,strikethrough,underline,link,weightedFontFamily"
+MAX_NESTING_LEVEL = 8
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)(?:\s+#+)?\s*$")
+_LIST_ITEM = re.compile(r"^(\s*)([-*+]|\d+[.)])\s+(.*)$")
+_RULE = re.compile(r"^\s*([-*_])(\s*\1){2,}\s*$")
+_QUOTE = re.compile(r"^\s*>\s?(.*)$")
+_FENCE = re.compile(r"^\s*(```|~~~)")
+_INLINE = re.compile(
+    r"\\(?P<escaped>[\\`*_{}\[\]()#+\-.!~>])"
+    r"|(?P<ticks>`+)(?P<code>.+?)(?P=ticks)"
+    r"|\[(?P<label>[^\]]+)\]\((?P<url>[^)\s]+)(?:\s+\"[^\"]*\")?\)"
+    r"|(?P<both>\*\*\*|(?<!\w)___)(?P<both_text>.+?)(?P=both)"
+    r"|(?P<bold>\*\*|(?<!\w)__)(?P<bold_text>.+?)(?P=bold)(?!\*)"
+    r"|(?P<italic>\*|(?<!\w)_)(?P<italic_text>[^\s*_](?:.*?[^\s])?)(?P=italic)(?!\w)"
+    r"|~~(?P<strike>.+?)~~"
+)
+
+Segment = Tuple[str, Dict[str, Any]]
+
+
+@dataclass
+class Paragraph:
+    """A paragraph to insert: its named style, list membership and styled text."""
+
+    style: str = "NORMAL_TEXT"
+    segments: List[Segment] = field(default_factory=list)
+    list_kind: Optional[str] = None
+    level: int = 0
+
+
+def parse_inline(text: str, style: Optional[Dict[str, Any]] = None) -> List[Segment]:
+    """Split ``text`` into runs of plain text and their inline styles."""
+    style = style or {}
+    segments: List[Segment] = []
+    position = 0
+    for match in _INLINE.finditer(text):
+        if match.start() > position:
+            segments.append((text[position : match.start()], style))
+        groups = match.groupdict()
+        if groups["escaped"] is not None:
+            segments.append((groups["escaped"], style))
+        elif groups["code"] is not None:
+            segments.append((groups["code"], {**style, "code": True}))
+        elif groups["label"] is not None:
+            segments.extend(parse_inline(groups["label"], {**style, "link": groups["url"]}))
+        elif groups["both_text"] is not None:
+            segments.extend(
+                parse_inline(groups["both_text"], {**style, "bold": True, "italic": True})
+            )
+        elif groups["bold_text"] is not None:
+            segments.extend(parse_inline(groups["bold_text"], {**style, "bold": True}))
+        elif groups["italic_text"] is not None:
+            segments.extend(parse_inline(groups["italic_text"], {**style, "italic": True}))
+        else:
+            segments.extend(parse_inline(groups["strike"], {**style, "strikethrough": True}))
+        position = match.end()
+    if position < len(text):
+        segments.append((text[position:], style))
+    return [segment for segment in segments if segment[0]]
+
+
+def parse_blocks(markdown: str) -> List[Paragraph]:
+    """Split Markdown into paragraphs; consecutive text lines form one paragraph."""
+    paragraphs: List[Paragraph] = []
+    pending: Optional[Paragraph] = None
+    lines: List[str] = []
+    fence: Optional[str] = None
+
+    def flush() -> None:
+        nonlocal pending, lines
+        if pending is not None:
+            pending.segments = parse_inline(" ".join(line.strip() for line in lines))
+            paragraphs.append(pending)
+        pending, lines = None, []
+
+    for line in markdown.replace("\r\n", "\n").split("\n"):
+        opened = _FENCE.match(line)
+        if fence is not None:
+            if opened and opened.group(1) == fence:
+                fence = None
+            else:
+                segments = [(line, {"code": True})] if line else []
+                paragraphs.append(Paragraph(segments=segments))
+            continue
+        if opened:
+            flush()
+            fence = opened.group(1)
+            continue
+        if not line.strip():
+            flush()
+            continue
+        if _RULE.match(line):
+            flush()
+            continue
+
+        heading = _HEADING.match(line)
+        if heading:
+            flush()
+            level = len(heading.group(1))
+            paragraphs.append(
+                Paragraph(style=f"HEADING_{level}", segments=parse_inline(heading.group(2)))
+            )
+            continue
+
+        item = _LIST_ITEM.match(line)
+        if item:
+            flush()
+            indent = len(item.group(1).expandtabs(4))
+            kind = "bullet" if item.group(2) in "-*+" else "numbered"
+            pending = Paragraph(list_kind=kind, level=min(indent // 2, MAX_NESTING_LEVEL))
+            lines = [item.group(3)]
+            continue
+
+        quote = _QUOTE.match(line)
+        if pending is None:
+            pending = Paragraph()
+        lines.append(quote.group(1) if quote else line)
+    flush()
+    return paragraphs
+
+
+def _text_style(name: str, value: Any) -> Tuple[str, Any]:
+    if name == "code":
+        return "weightedFontFamily", {"fontFamily": CODE_FONT}
+    if name == "link":
+        return "link", {"url": value}
+    return name, value
+
+
+def compile_markdown(
+    markdown: str,
+    index: int,
+    new_paragraph: bool = False,
+    clear_bullets: bool = False,
+) -> List[Dict[str, Any]]:
+    """Compile Markdown into requests inserting it, formatted, at ``index``.
+
+    ``index`` must be at the end of a paragraph; the last inserted paragraph
+    takes over that paragraph's newline. With ``new_paragraph`` the text
+    starts a paragraph of its own after the existing text there, and with
+    ``clear_bullets`` list bullets inherited from that paragraph are removed.
+
+    Style ranges that touch (or are only separated by a paragraph break) are
+    merged, so each style costs one request per contiguous run. Indexes are
+    in UTF-16 code units. Bullets are created last and from the end, since
+    Docs removes the tabs that set their nesting level.
+    """
+    paragraphs = parse_blocks(markdown)
+    if not paragraphs:
+        return []
+
+    layout = _Layout(index + 1 if new_paragraph else index)
+    for paragraph in paragraphs:
+        layout.add(paragraph)
+    body_start, cursor, ranges = layout.start, layout.cursor, layout.ranges
+    text = ("\n" if new_paragraph else "") + "".join(layout.parts)
+
+    requests: List[Dict[str, Any]] = [{"insertText": {"location": {"index": index}, "text": text}}]
+    whole = {"startIndex": body_start, "endIndex": cursor + 1}
+    if clear_bullets:
+        requests.append({"deleteParagraphBullets": {"range": whole}})
+    if cursor > body_start:
+        requests.append(
+            {
+                "updateTextStyle": {
+                    "range": {"startIndex": body_start, "endIndex": cursor},
+                    "textStyle": {},
+                    "fields": RESET_FIELDS,
+                }
+            }
+        )
+
+    if any(paragraph.style == "NORMAL_TEXT" for paragraph in paragraphs):
+        requests.append(_paragraph_style(whole["startIndex"], whole["endIndex"], "NORMAL_TEXT"))
+    for start, end, style in _runs(ranges, lambda paragraph: paragraph.style):
+        if style != "NORMAL_TEXT":
+            requests.append(_paragraph_style(start, end, style))
+
+    requests.extend(_text_style_requests(layout.spans, layout.breaks()))
+
+    lists = [run for run in _runs(ranges, lambda paragraph: paragraph.list_kind) if run[2]]
+    for start, end, kind in reversed(lists):
+        requests.append(
+            {
+                "createParagraphBullets": {
+                    "range": {"startIndex": start, "endIndex": end},
+                    "bulletPreset": BULLET_PRESETS[kind],
+                }
+            }
+        )
+    return requests
+
+
+class _Layout:
+    """Lays paragraphs out as inserted text, tracking their UTF-16 indexes."""
+
+    def __init__(self, start: int):
+        self.start = self.cursor = start
+        self.parts: List[str] = []
+        self.ranges: List[Tuple[int, int, Paragraph]] = []
+        self.spans: Dict[str, List[Tuple[int, int, Any]]] = {}
+
+    def add(self, paragraph: Paragraph) -> None:
+        if self.ranges:
+            self._append("\n")
+        start = self.cursor
+        if paragraph.list_kind and paragraph.level:
+            self._append("\t" * paragraph.level)
+        for text, style in paragraph.segments:
+            length = utf16_len(text)
+            for name, value in style.items():
+                self.spans.setdefault(name, []).append((self.cursor, self.cursor + length, value))
+            self._append(text)
+        self.ranges.append((start, self.cursor + 1, paragraph))
+
+    def breaks(self) -> Set[int]:
+        """Return the indexes of the paragraph breaks between laid out paragraphs."""
+        return {end - 1 for _start, end, _paragraph in self.ranges}
+
+    def _append(self, text: str) -> None:
+        self.parts.append(text)
+        self.cursor += utf16_len(text)
+
+
+def _text_style_requests(spans, breaks) -> List[Dict[str, Any]]:
+    """Merge style spans and group the properties that share a range into one request."""
+    styled: Dict[Tuple[int, int], Dict[str, Any]] = {}
+    for name, found in spans.items():
+        for start, end, value in _merge_spans(found, breaks):
+            key, style_value = _text_style(name, value)
+            styled.setdefault((start, end), {})[key] = style_value
+    return [
+        {
+            "updateTextStyle": {
+                "range": {"startIndex": start, "endIndex": end},
+                "textStyle": text_style,
+                "fields": ",".join(text_style),
+            }
+        }
+        for (start, end), text_style in sorted(styled.items())
+    ]
+
+
+def _paragraph_style(start: int, end: int, style: str) -> Dict[str, Any]:
+    return {
+        "updateParagraphStyle": {
+            "range": {"startIndex": start, "endIndex": end},
+            "paragraphStyle": {"namedStyleType": style},
+            "fields": "namedStyleType",
+        }
+    }
+
+
+def _runs(ranges, key) -> List[Tuple[int, int, Any]]:
+    """Merge consecutive paragraphs with the same ``key`` into index ranges."""
+    runs: List[Tuple[int, int, Any]] = []
+    for start, end, paragraph in ranges:
+        value = key(paragraph)
+        if runs and runs[-1][2] == value:
+            runs[-1] = (runs[-1][0], end, value)
+        else:
+            runs.append((start, end, value))
+    return runs
+
+
+def _merge_spans(spans, breaks) -> List[Tuple[int, int, Any]]:
+    merged: List[Tuple[int, int, Any]] = []
+    for start, end, value in sorted(spans, key=lambda span: span[0]):
+        if merged and merged[-1][2] == value:
+            last_start, last_end, _value = merged[-1]
+            if start == last_end or (start == last_end + 1 and last_end in breaks):
+                merged[-1] = (last_start, end, value)
+                continue
+        merged.append((start, end, value))
+    return merged
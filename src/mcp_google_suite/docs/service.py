@@ -1,22 +1,71 @@
 import asyncio
-from typing import Any, Dict, Optional
+import re
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
 
 from googleapiclient.errors import HttpError
 
-from mcp_google_suite.base_service import BaseGoogleService
+from mcp_google_suite.base_service import DEFAULT_BATCH_CONCURRENCY, BaseGoogleService
+from mcp_google_suite.docs.markdown import compile_markdown
+from mcp_google_suite.docs.structure import INDEX_FIELDS, DocumentIndex, build_index
+from mcp_google_suite.fields import FieldsArgument, requested_names, resolve_fields, top_level_name
+from mcp_google_suite.ratelimit import RateLimitedError
+
+
+# Partial response selecting only the text runs of top-level paragraphs
+TEXT_RUN_FIELDS = "body(content(paragraph(elements(textRun(content)))))"
+
+# What an append needs to know about the end of the document
+APPEND_FIELDS = "revisionId,body(content(startIndex,endIndex,paragraph(bullet(listId))))"
+
+# Content formats served by Drive export instead of the Docs API
+EXPORT_MIME_TYPES = {"text": "text/plain", "markdown": "text/markdown"}
+CONTENT_FORMATS = ("text", "markdown", "structured")
+
+# ``{{name}}`` placeholders, written without spaces inside the braces so that
+# the literal text matched by replaceAllText and by ``substitute`` is the same
+PLACEHOLDER_NAME = re.compile(r"[^{}\s]+")
+PLACEHOLDER = re.compile(r"\{\{(" + PLACEHOLDER_NAME.pattern + r")\}\}")
+
+
+def invalid_placeholder_names(names: Iterable[str]) -> List[str]:
+    """Return the names that cannot appear in a ``{{name}}`` placeholder."""
+    return [name for name in names if not PLACEHOLDER_NAME.fullmatch(name)]
+
+
+def substitute(value: Any, values: Dict[str, Any]) -> Any:
+    """Return a copy of ``value`` with ``{{name}}`` placeholders in its strings filled in.
+
+    Placeholders without a value are left as they are.
+    """
+    if isinstance(value, str):
+
+        def fill(match: "re.Match[str]") -> str:
+            name = match.group(1)
+            return str(values[name]) if name in values else match.group(0)
+
+        return PLACEHOLDER.sub(fill, value)
+    if isinstance(value, dict):
+        return {key: substitute(item, values) for key, item in value.items()}
+    if isinstance(value, list):
+        return [substitute(item, values) for item in value]
+    return value
 
 
 class DocsService(BaseGoogleService):
     """Google Docs service implementation."""
 
-    def __init__(self, auth=None):
-        super().__init__("docs", "v1", auth)
+    def __init__(self, auth=None, cache=None, limiter=None, metrics=None, index_entries=64):
+        super().__init__("docs", "v1", auth, cache, limiter, metrics)
+        self.index_entries = index_entries
+        self._indexes: "OrderedDict[str, DocumentIndex]" = OrderedDict()
+        self.index_counters = {"hits": 0, "builds": 0}
 
     async def create_document(self, title: str, content: Optional[str] = None) -> Dict[str, Any]:
         """Create a new Google Doc with optional initial content."""
         try:
             service = await self.get_service()
-            doc = await asyncio.to_thread(service.documents().create(body={"title": title}).execute)
+            doc = await self.execute(service.documents().create(body={"title": title}))
 
             if content:
                 await self.update_document_content(doc["documentId"], content)
@@ -25,27 +74,73 @@ class DocsService(BaseGoogleService):
         except HttpError as error:
             return {"success": False, **self.handle_error(error)}
 
-    async def get_document(self, document_id: str) -> Dict[str, Any]:
-        """Get the contents of a Google Doc."""
+    async def get_document(
+        self, document_id: str, fields: FieldsArgument = None, raw_fields: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get the contents of a Google Doc.
+
+        ``fields`` is validated against the document allowlist; ``raw_fields`` is a
+        trusted internal mask appended as-is. With neither, the full document is returned.
+        """
+        masks = [resolve_fields("docs.document", fields)] if fields else []
+        selected = requested_names(masks[0]) if masks else []
+        if raw_fields and "*" not in selected and top_level_name(raw_fields) not in selected:
+            masks.append(raw_fields)
         try:
             service = await self.get_service()
-            document = await asyncio.to_thread(
-                service.documents().get(documentId=document_id).execute
-            )
+            request_args = {"documentId": document_id}
+            if masks:
+                request_args["fields"] = ", ".join(masks)
+            document = await self.execute(service.documents().get(**request_args), cached=True)
             return {"success": True, "document": document}
         except HttpError as error:
             return {"success": False, **self.handle_error(error)}
 
+    async def get_index(self, document_id: str) -> Dict[str, Any]:
+        """Get the structural index of a Google Doc, rebuilt only when it changes.
+
+        A cached index is reused after a ``fields=revisionId`` request confirms
+        the document is still at the same revision. Documents whose revision is
+        not visible (read-only access) are indexed on every call.
+        """
+        try:
+            service = await self.get_service()
+            cached = self._indexes.get(document_id)
+            if cached is not None:
+                current = await self.execute(
+                    service.documents().get(documentId=document_id, fields="revisionId")
+                )
+                if current.get("revisionId") == cached.revision_id:
+                    self._indexes.move_to_end(document_id)
+                    self.index_counters["hits"] += 1
+                    return {"success": True, "index": cached}
+
+            document = await self.execute(
+                service.documents().get(documentId=document_id, fields=INDEX_FIELDS)
+            )
+            index = build_index(document)
+            self.index_counters["builds"] += 1
+            self._indexes.pop(document_id, None)
+            if index.revision_id:
+                self._indexes[document_id] = index
+                while len(self._indexes) > self.index_entries:
+                    self._indexes.popitem(last=False)
+            return {"success": True, "index": index}
+        except HttpError as error:
+            return {"success": False, **self.handle_error(error)}
+
+    def index_stats(self) -> Dict[str, Any]:
+        """Return the number of cached indexes and hit/build counters."""
+        return {"entries": len(self._indexes), **self.index_counters}
+
     async def update_document_content(self, document_id: str, content: str) -> Dict[str, Any]:
         """Update the content of a Google Doc."""
         try:
             service = await self.get_service()
             requests = [{"insertText": {"location": {"index": 1}, "text": content}}]
 
-            result = await asyncio.to_thread(
-                service.documents()
-                .batchUpdate(documentId=document_id, body={"requests": requests})
-                .execute
+            result = await self.execute(
+                service.documents().batchUpdate(documentId=document_id, body={"requests": requests})
             )
 
             return {"success": True, "result": result}
@@ -55,7 +150,7 @@ class DocsService(BaseGoogleService):
     async def append_content(self, document_id: str, content: str) -> Dict[str, Any]:
         """Append content to the end of a Google Doc."""
         try:
-            document = await self.get_document(document_id)
+            document = await self.get_document(document_id, raw_fields="body(content(endIndex))")
             if not document["success"]:
                 return document
 
@@ -64,10 +159,8 @@ class DocsService(BaseGoogleService):
 
             requests = [{"insertText": {"location": {"index": end_index - 1}, "text": content}}]
 
-            result = await asyncio.to_thread(
-                service.documents()
-                .batchUpdate(documentId=document_id, body={"requests": requests})
-                .execute
+            result = await self.execute(
+                service.documents().batchUpdate(documentId=document_id, body={"requests": requests})
             )
 
             return {"success": True, "result": result}
@@ -75,36 +168,38 @@ class DocsService(BaseGoogleService):
             return {"success": False, **self.handle_error(error)}
 
     async def append_formatted_text(self, document_id: str, text_content: str) -> Dict[str, Any]:
-        """Append formatted text to the end of a Google Doc without destroying existing formatting."""
+        """Append Markdown-formatted text to the end of a Google Doc in one batchUpdate.
+
+        The Markdown is compiled into insert and style requests against the end
+        index read just before. The write requires the revision that was read,
+        so a concurrent edit makes it fail instead of formatting the wrong
+        range, and it can be retried safely.
+        """
         try:
             service = await self.get_service()
-            
-            # Get document to find the end index
-            document = await asyncio.to_thread(
-                service.documents().get(documentId=document_id, fields="body").execute
+            document = await self.execute(
+                service.documents().get(documentId=document_id, fields=APPEND_FIELDS)
             )
-            
-            # Find the end index of the document body
-            end_index = document["body"]["content"][-1]["endIndex"]
-            
-            # Prepare requests for batch update
-            requests = [
-                {
-                    "insertText": {
-                        "location": {"index": end_index - 1},
-                        "text": text_content
-                    }
-                }
-            ]
-            
-            # Execute batch update
-            result = await asyncio.to_thread(
-                service.documents()
-                .batchUpdate(documentId=document_id, body={"requests": requests})
-                .execute
+            last = document["body"]["content"][-1]
+            requests = compile_markdown(
+                text_content,
+                last["endIndex"] - 1,
+                new_paragraph=last["endIndex"] - last.get("startIndex", 0) > 1,
+                clear_bullets="bullet" in last.get("paragraph", {}),
             )
+            if not requests:
+                return {"success": True, "result": {}, "requests": 0}
 
-            return {"success": True, "result": result}
+            body: Dict[str, Any] = {"requests": requests}
+            revision_id = document.get("revisionId")
+            if revision_id:
+                body["writeControl"] = {"requiredRevisionId": revision_id}
+            result = await self.execute(
+                service.documents().batchUpdate(documentId=document_id, body=body),
+                safe=bool(revision_id),
+            )
+
+            return {"success": True, "result": result, "requests": len(requests)}
         except HttpError as error:
             return {"success": False, **self.handle_error(error)}
 
@@ -112,16 +207,111 @@ class DocsService(BaseGoogleService):
         """Execute batch update requests on a Google Doc."""
         try:
             service = await self.get_service()
-            
+
             # Execute batch update with provided requests
             requests_body = {"requests": requests}
-            print(f"[DIAGNOSTICS] Calling Google API batchUpdate with body: {requests_body}")
-            result = await asyncio.to_thread(
-                service.documents()
-                .batchUpdate(documentId=document_id, body=requests_body)
-                .execute
+            result = await self.execute(
+                service.documents().batchUpdate(documentId=document_id, body=requests_body)
             )
 
             return {"success": True, "result": result}
         except HttpError as error:
             return {"success": False, **self.handle_error(error)}
+
+    async def fill_placeholders(
+        self, document_id: str, values: Dict[str, Any], match_case: bool = True
+    ) -> Dict[str, Any]:
+        """Replace every ``{{name}}`` placeholder in a Google Doc in one batchUpdate.
+
+        Returns the number of occurrences replaced per placeholder.
+        """
+        names = list(values)
+        if not names:
+            return {"success": True, "replacements": {}}
+        requests = [
+            {
+                "replaceAllText": {
+                    "containsText": {"text": f"{{{{{name}}}}}", "matchCase": match_case},
+                    "replaceText": str(values[name]),
+                }
+            }
+            for name in names
+        ]
+        try:
+            service = await self.get_service()
+            # Repeating the update finds no placeholders left to replace
+            result = await self.execute(
+                service.documents().batchUpdate(
+                    documentId=document_id, body={"requests": requests}
+                ),
+                safe=True,
+            )
+        except HttpError as error:
+            return {"success": False, **self.handle_error(error)}
+
+        replies = result.get("replies", [])
+        replacements = {
+            name: (reply.get("replaceAllText") or {}).get("occurrencesChanged", 0)
+            for name, reply in zip(names, replies, strict=True)
+        }
+        return {"success": True, "replacements": replacements}
+
+    async def batch_update_many(
+        self,
+        document_ids: List[str],
+        requests: list,
+        substitutions: Optional[Dict[str, Dict[str, Any]]] = None,
+        max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    ) -> Dict[str, Any]:
+        """Apply the same batch update requests to many Google Docs.
+
+        ``substitutions`` maps a document ID to the values of the ``{{name}}``
+        placeholders in its copy of the requests. Up to ``max_concurrency``
+        documents are updated at once, each write taking its own quota slot. A
+        document's update is pinned to the revision read just before it, so it
+        is retried on throttling without risk of being applied twice. One
+        document failing does not stop the others.
+        """
+        document_ids = list(dict.fromkeys(document_ids))
+        substitutions = substitutions or {}
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def update(document_id: str) -> Dict[str, Any]:
+            async with semaphore:
+                values = substitutions.get(document_id)
+                document_requests = substitute(requests, values) if values else requests
+                return await self._update_at_revision(document_id, document_requests)
+
+        outcomes = await asyncio.gather(*(update(document_id) for document_id in document_ids))
+        results = [
+            {"document_id": document_id, **outcome}
+            for document_id, outcome in zip(document_ids, outcomes, strict=True)
+        ]
+        failed = sum(1 for result in results if not result["success"])
+        return {
+            "success": failed == 0,
+            "succeeded": len(results) - failed,
+            "failed": failed,
+            "results": results,
+        }
+
+    async def _update_at_revision(self, document_id: str, requests: list) -> Dict[str, Any]:
+        """Run one batchUpdate pinned to the document's current revision."""
+        try:
+            service = await self.get_service()
+            current = await self.execute(
+                service.documents().get(documentId=document_id, fields="revisionId")
+            )
+            body: Dict[str, Any] = {"requests": requests}
+            revision_id = current.get("revisionId")
+            if revision_id:
+                body["writeControl"] = {"requiredRevisionId": revision_id}
+            result = await self.execute(
+                service.documents().batchUpdate(documentId=document_id, body=body),
+                safe=bool(revision_id),
+            )
+            return {"success": True, "replies": result.get("replies", [])}
+        except RateLimitedError as error:
+            return {"success": False, **self.handle_error(error), "retry_after": error.retry_after}
+        except HttpError as error:
+            return {"success": False, **self.handle_error(error)}
@@ -0,0 +1,308 @@
+"""Structural index of a Google Doc: headings, paragraphs and tables with their indexes."""
+
+import bisect
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Partial response with just what the index needs, including element start
+# indexes so that text offsets can be mapped back to document indexes
+INDEX_FIELDS = (
+    "documentId,revisionId,title,"
+    "body(content(startIndex,endIndex,"
+    "paragraph(paragraphStyle(namedStyleType,headingId),elements(startIndex,textRun(content))),"
+    "table(rows,columns,tableRows(tableCells(content("
+    "paragraph(elements(startIndex,textRun(content)))))))))"
+)
+
+# Heading level of each named paragraph style; the section of a heading runs
+# until the next heading of the same or a higher (smaller) level
+HEADING_LEVELS = {"TITLE": 0, **{f"HEADING_{level}": level for level in range(1, 7)}}
+
+CONTEXT_CHARS = 40
+
+
+def utf16_len(text: str) -> int:
+    """Length in UTF-16 code units, the unit of Docs indexes."""
+    if text.isascii():
+        return len(text)
+    return len(text.encode("utf-16-le")) // 2
+
+
+@dataclass
+class Block:
+    """A top-level structural element of the document body."""
+
+    kind: str
+    start: int
+    end: int
+    text: str
+    style: str = "NORMAL_TEXT"
+    level: Optional[int] = None
+    heading_id: Optional[str] = None
+    rows: int = 0
+    columns: int = 0
+
+    @property
+    def title(self) -> str:
+        return self.text.rstrip("\n")
+
+    def describe(self) -> Dict[str, Any]:
+        described = {
+            "type": self.kind,
+            "start_index": self.start,
+            "end_index": self.end,
+            "style": self.style,
+        }
+        if self.kind == "table":
+            described.update(rows=self.rows, columns=self.columns)
+        return described
+
+
+@dataclass
+class TextSpan:
+    """The text of one paragraph, in the body or a table cell, mapped to indexes.
+
+    ``runs`` holds the text offset, document index and content of each text
+    run; inline objects without text take up indexes but no text, so the
+    mapping goes run by run.
+    """
+
+    block: int
+    text: str
+    runs: List[Tuple[int, int, str]] = field(default_factory=list)
+
+    def index_of(self, offset: int) -> int:
+        """Document index of the character at ``offset`` in ``text``."""
+        starts = [run[0] for run in self.runs]
+        run_offset, run_index, content = self.runs[bisect.bisect_right(starts, offset) - 1]
+        return run_index + utf16_len(content[: offset - run_offset])
+
+
+def _span(block: int, paragraph: Dict[str, Any]) -> TextSpan:
+    span = TextSpan(block, "")
+    parts = []
+    offset = 0
+    for element in paragraph.get("elements", []):
+        content = element.get("textRun", {}).get("content")
+        if not content or "startIndex" not in element:
+            continue
+        span.runs.append((offset, element["startIndex"], content))
+        parts.append(content)
+        offset += len(content)
+    span.text = "".join(parts)
+    return span
+
+
+@dataclass
+class DocumentIndex:
+    """Headings, paragraphs and tables of one revision of a document."""
+
+    document_id: str
+    revision_id: Optional[str]
+    title: str
+    blocks: List[Block]
+    spans: List[TextSpan]
+
+    @property
+    def end_index(self) -> int:
+        return self.blocks[-1].end if self.blocks else 1
+
+    @property
+    def headings(self) -> List[int]:
+        return [number for number, block in enumerate(self.blocks) if block.kind == "heading"]
+
+    @property
+    def size(self) -> int:
+        """Approximate number of characters held, for bounding caches."""
+        return sum(len(block.text) for block in self.blocks)
+
+    def _section_end(self, number: int, nested: bool = True) -> int:
+        level = self.blocks[number].level
+        for block in self.blocks[number + 1 :]:
+            if block.kind == "heading" and (not nested or block.level <= level):
+                return block.start
+        return self.end_index
+
+    def _heading(self, ordinal: int, number: int) -> Dict[str, Any]:
+        block = self.blocks[number]
+        return {
+            "number": ordinal,
+            "level": block.level,
+            "style": block.style,
+            "text": block.title,
+            "heading_id": block.heading_id,
+            "start_index": block.start,
+            "end_index": self._section_end(number),
+        }
+
+    def _section_title(self, number: int) -> Optional[str]:
+        for block in reversed(self.blocks[: number + 1]):
+            if block.kind == "heading":
+                return block.title
+        return None
+
+    def outline(self, max_level: Optional[int] = None) -> Dict[str, Any]:
+        """Headings with the index range of their sections, and the tables."""
+        headings = [
+            self._heading(ordinal, number)
+            for ordinal, number in enumerate(self.headings)
+            if max_level is None or self.blocks[number].level <= max_level
+        ]
+        tables = [
+            {**block.describe(), "section": self._section_title(number)}
+            for number, block in enumerate(self.blocks)
+            if block.kind == "table"
+        ]
+        return {
+            "document_id": self.document_id,
+            "revision_id": self.revision_id,
+            "title": self.title,
+            "end_index": self.end_index,
+            "paragraphs": sum(1 for block in self.blocks if block.kind == "paragraph"),
+            "headings": headings,
+            "tables": tables,
+        }
+
+    def find_heading(
+        self,
+        heading: Optional[str] = None,
+        heading_id: Optional[str] = None,
+        number: Optional[int] = None,
+    ) -> int:
+        """Block number of a heading given by ID, outline number or text.
+
+        Text matches ignore case; the first exact match wins, otherwise a partial
+        match must be unique.
+        """
+        headings = self.headings
+        if heading_id is not None:
+            for candidate in headings:
+                if self.blocks[candidate].heading_id == heading_id:
+                    return candidate
+            raise ValueError(f"No heading with heading_id {heading_id!r}")
+        if number is not None:
+            if not 0 <= number < len(headings):
+                raise ValueError(f"number must be between 0 and {len(headings) - 1}")
+            return headings[number]
+        if not heading:
+            raise ValueError("heading, heading_id or number is required")
+
+        wanted = heading.strip().lower()
+        exact = [n for n in headings if self.blocks[n].title.strip().lower() == wanted]
+        partial = [n for n in headings if wanted in self.blocks[n].title.lower()]
+        if exact:
+            return exact[0]
+        if len(partial) == 1:
+            return partial[0]
+        if not partial:
+            raise ValueError(f"No heading matches {heading!r}")
+        titles = ", ".join(repr(self.blocks[n].title) for n in partial[:10])
+        raise ValueError(f"{heading!r} matches several headings: {titles}")
+
+    def section(self, number: int, include_subsections: bool = True) -> Dict[str, Any]:
+        """The heading at block ``number`` and the blocks up to the end of its section."""
+        end = self._section_end(number, nested=include_subsections)
+        blocks = [block for block in self.blocks[number:] if block.start < end and block.end <= end]
+        return {
+            "document_id": self.document_id,
+            "revision_id": self.revision_id,
+            "heading": self._heading(self.headings.index(number), number),
+            "start_index": self.blocks[number].start,
+            "end_index": end,
+            "content": "".join(block.text for block in blocks),
+            "blocks": [block.describe() for block in blocks],
+        }
+
+    def find(self, query: str, match_case: bool = False, limit: int = 50) -> Dict[str, Any]:
+        """Occurrences of ``query`` with their exact index ranges and enclosing section."""
+        needle = query if match_case else query.lower()
+        matches = []
+        total = 0
+        for span in self.spans:
+            haystack = span.text if match_case else span.text.lower()
+            position = haystack.find(needle)
+            while position != -1:
+                total += 1
+                if len(matches) < limit:
+                    end = position + len(query)
+                    last = span.index_of(end - 1) + utf16_len(span.text[end - 1])
+                    matches.append(
+                        {
+                            "start_index": span.index_of(position),
+                            "end_index": last,
+                            "text": span.text[position:end],
+                            "context": span.text[
+                                max(0, position - CONTEXT_CHARS) : end + CONTEXT_CHARS
+                            ].strip(),
+                            "block": self.blocks[span.block].kind,
+                            "section": self._section_title(span.block),
+                        }
+                    )
+                position = haystack.find(needle, position + max(1, len(needle)))
+        return {
+            "document_id": self.document_id,
+            "revision_id": self.revision_id,
+            "query": query,
+            "total": total,
+            "matches": matches,
+        }
+
+
+def build_index(document: Dict[str, Any]) -> DocumentIndex:
+    """Index a ``documents.get`` response fetched with at least ``INDEX_FIELDS``."""
+    blocks: List[Block] = []
+    spans: List[TextSpan] = []
+    for element in document.get("body", {}).get("content", []):
+        start, end = element.get("startIndex", 0), element.get("endIndex", 0)
+        number = len(blocks)
+        if "paragraph" in element:
+            paragraph = element["paragraph"]
+            span = _span(number, paragraph)
+            style = paragraph.get("paragraphStyle", {})
+            named = style.get("namedStyleType", "NORMAL_TEXT")
+            level = HEADING_LEVELS.get(named)
+            spans.append(span)
+            blocks.append(
+                Block(
+                    "heading" if level is not None else "paragraph",
+                    start,
+                    end,
+                    span.text,
+                    named,
+                    level,
+                    style.get("headingId"),
+                )
+            )
+        elif "table" in element:
+            table = element["table"]
+            lines = []
+            for row in table.get("tableRows", []):
+                cells = []
+                for cell in row.get("tableCells", []):
+                    cell_spans = [
+                        _span(number, item["paragraph"])
+                        for item in cell.get("content", [])
+                        if "paragraph" in item
+                    ]
+                    spans.extend(cell_spans)
+                    cells.append("".join(span.text for span in cell_spans).strip())
+                lines.append("\t".join(cells) + "\n")
+            blocks.append(
+                Block(
+                    "table",
+                    start,
+                    end,
+                    "".join(lines),
+                    "TABLE",
+                    rows=table.get("rows", len(lines)),
+                    columns=table.get("columns", 0),
+                )
+            )
+    return DocumentIndex(
+        document.get("documentId", ""),
+        document.get("revisionId"),
+        document.get("title", ""),
+        blocks,
+        spans,
+    )
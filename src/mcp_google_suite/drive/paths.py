@@ -0,0 +1,109 @@
+"""In-memory trie of Drive folder paths to file IDs."""
+
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+ROOT_ID = "root"
+
+
+def split_path(path: str) -> List[str]:
+    """Split a slash-separated Drive path into its non-empty segments."""
+    return [segment for segment in path.strip().strip("/").split("/") if segment]
+
+
+@dataclass(eq=False)
+class PathNode:
+    """A resolved path segment."""
+
+    name: str
+    file_id: str
+    mime_type: str = FOLDER_MIME_TYPE
+    expires_at: float = float("inf")
+    parent: Optional["PathNode"] = None
+    children: Dict[str, "PathNode"] = field(default_factory=dict)
+
+
+class PathTrie:
+    """Name-to-ID mappings for Drive paths with per-entry TTL.
+
+    Entries are added as lookups resolve them and dropped when they expire or
+    when the file they point to is moved, trashed or replaced.
+    """
+
+    def __init__(self, ttl: float = 300.0, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self._clock = clock
+        self.root = PathNode(name="", file_id=ROOT_ID)
+        self._index: Dict[str, List[PathNode]] = {ROOT_ID: [self.root]}
+        self.hits = 0
+        self.misses = 0
+
+    def walk(self, segments: List[str], start: Optional[PathNode] = None) -> List[PathNode]:
+        """Return the cached nodes for the longest live prefix of ``segments``."""
+        node, resolved = start or self.root, []
+        now = self._clock()
+        for segment in segments:
+            child = node.children.get(segment)
+            if child is not None and child.expires_at <= now:
+                self._detach(child)
+                child = None
+            if child is None:
+                break
+            resolved.append(child)
+            node = child
+        return resolved
+
+    def insert(self, parent: PathNode, name: str, file_id: str, mime_type: str) -> PathNode:
+        """Record ``name`` under ``parent`` and return the new node."""
+        existing = parent.children.get(name)
+        if existing is not None:
+            self._detach(existing)
+        node = PathNode(
+            name=name,
+            file_id=file_id,
+            mime_type=mime_type,
+            expires_at=self._clock() + self.ttl,
+            parent=parent,
+        )
+        parent.children[name] = node
+        self._index.setdefault(file_id, []).append(node)
+        return node
+
+    def add_child(self, parent_id: str, name: str, file_id: str, mime_type: str) -> None:
+        """Record a new file under every cached location of ``parent_id``."""
+        for parent in list(self._index.get(parent_id, [])):
+            self.insert(parent, name, file_id, mime_type)
+
+    def invalidate(self, file_id: str) -> None:
+        """Forget every cached path that resolves to ``file_id`` or passes through it."""
+        for node in list(self._index.get(file_id, [])):
+            if node is not self.root:
+                self._detach(node)
+
+    def clear(self) -> None:
+        """Drop all cached paths."""
+        self.root.children.clear()
+        self._index = {ROOT_ID: [self.root]}
+
+    def _detach(self, node: PathNode) -> None:
+        """Remove a node and its subtree from the trie and the ID index."""
+        if node.parent is not None and node.parent.children.get(node.name) is node:
+            del node.parent.children[node.name]
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            nodes = self._index.get(current.file_id, [])
+            if current in nodes:
+                nodes.remove(current)
+                if not nodes:
+                    del self._index[current.file_id]
+            stack.extend(current.children.values())
+            current.children = {}
+
+    def stats(self) -> Dict[str, int]:
+        """Return trie size and lookup counters."""
+        entries = sum(len(nodes) for nodes in self._index.values()) - 1
+        return {"entries": entries, "hits": self.hits, "misses": self.misses}
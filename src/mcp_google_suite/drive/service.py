@@ -1,83 +1,471 @@
-from typing import Any, Dict, Optional
+import asyncio
+import codecs
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from googleapiclient.errors import HttpError
 
-from mcp_google_suite.base_service import BaseGoogleService
+from mcp_google_suite import tracing
+from mcp_google_suite.base_service import DEFAULT_BATCH_CONCURRENCY, BaseGoogleService
+from mcp_google_suite.drive.paths import FOLDER_MIME_TYPE, ROOT_ID, PathNode, PathTrie, split_path
+from mcp_google_suite.fields import FieldsArgument, resolve_fields
+from mcp_google_suite.ratelimit import READ
+
+
+METADATA_FIELDS = "id, name, mimeType, webViewLink, parents, createdTime, modifiedTime"
+DOCUMENT_MIME_TYPE = "application/vnd.google-apps.document"
+LIST_PAGE_SIZE = 1000
+EXPORT_CHUNK_SIZE = 64 * 1024
+# Export responses from this status up carry an error instead of the file
+EXPORT_ERROR_STATUS = 300
+# Connect and per-read timeouts of an export; the API clients wait 60 s per request
+EXPORT_TIMEOUT_SECONDS = (10.0, 60.0)
 
 
 class DriveService(BaseGoogleService):
     """Google Drive service implementation."""
 
-    def __init__(self, auth=None):
-        super().__init__("drive", "v3", auth)
+    def __init__(self, auth=None, cache=None, path_ttl: float = 300.0, limiter=None, metrics=None):
+        super().__init__("drive", "v3", auth, cache, limiter, metrics)
+        self.paths = PathTrie(ttl=path_ttl)
 
-    def search_files(self, query: str, page_size: int = 10) -> Dict[str, Any]:
+    async def search_files(
+        self, query: str, page_size: int = 10, fields: FieldsArgument = None
+    ) -> Dict[str, Any]:
         """Search for files in Google Drive."""
+        file_fields = resolve_fields("drive.file", fields)
         try:
-            results = (
-                self.service.files()
-                .list(q=query, pageSize=page_size, fields="files(id, name, mimeType, webViewLink)")
-                .execute()
+            service = await self.get_service()
+            results = await self.execute(
+                service.files().list(q=query, pageSize=page_size, fields=f"files({file_fields})")
             )
 
             return {"success": True, "files": results.get("files", [])}
         except HttpError as error:
             return {"success": False, **self.handle_error(error)}
 
-    def create_folder(self, name: str, parent_id: Optional[str] = None) -> Dict[str, Any]:
+    async def list_folder(
+        self, folder_id: str, mime_type: Optional[str] = None, limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """List the files directly inside a folder, following result pages.
+
+        Listing stops after ``limit`` files; ``truncated`` tells whether more
+        were left.
+        """
+        query = f"'{self._escape(folder_id)}' in parents and trashed = false"
+        if mime_type:
+            query += f" and mimeType = '{self._escape(mime_type)}'"
+        files: List[Dict[str, Any]] = []
+        page_token = None
+        try:
+            service = await self.get_service()
+            while True:
+                page = await self.execute(
+                    service.files().list(
+                        q=query,
+                        pageSize=LIST_PAGE_SIZE,
+                        pageToken=page_token,
+                        fields="nextPageToken, files(id, name, mimeType)",
+                    )
+                )
+                files.extend(page.get("files", []))
+                page_token = page.get("nextPageToken")
+                if not page_token or (limit is not None and len(files) >= limit):
+                    break
+        except HttpError as error:
+            return {"success": False, **self.handle_error(error)}
+
+        truncated = bool(page_token) or (limit is not None and len(files) > limit)
+        return {"success": True, "files": files[:limit], "truncated": truncated}
+
+    async def create_folder(self, name: str, parent_id: Optional[str] = None) -> Dict[str, Any]:
         """Create a new folder in Google Drive."""
         try:
-            file_metadata = {"name": name, "mimeType": "application/vnd.google-apps.folder"}
+            service = await self.get_service()
+            file_metadata = {"name": name, "mimeType": FOLDER_MIME_TYPE}
 
             if parent_id:
                 file_metadata["parents"] = [parent_id]
 
-            folder = (
-                self.service.files()
-                .create(body=file_metadata, fields="id, name, webViewLink")
-                .execute()
+            folder = await self.execute(
+                service.files().create(body=file_metadata, fields="id, name, webViewLink")
             )
 
+            self.paths.add_child(parent_id or ROOT_ID, name, folder["id"], FOLDER_MIME_TYPE)
             return {"success": True, "folder": folder}
         except HttpError as error:
             return {"success": False, **self.handle_error(error)}
 
-    def move_file(self, file_id: str, new_parent_id: str) -> Dict[str, Any]:
+    async def move_file(self, file_id: str, new_parent_id: str) -> Dict[str, Any]:
         """Move a file to a different folder."""
         try:
+            service = await self.get_service()
+
             # Get the file's current parents
-            file = self.service.files().get(fileId=file_id, fields="parents").execute()
+            file = await self.execute(service.files().get(fileId=file_id, fields="parents"))
 
             previous_parents = ",".join(file.get("parents", []))
+            self.paths.invalidate(file_id)
 
             # Move the file
-            file = (
-                self.service.files()
-                .update(
+            file = await self.execute(
+                service.files().update(
                     fileId=file_id,
                     addParents=new_parent_id,
                     removeParents=previous_parents,
                     fields="id, name, parents, webViewLink",
                 )
-                .execute()
             )
 
             return {"success": True, "file": file}
         except HttpError as error:
             return {"success": False, **self.handle_error(error)}
 
-    def get_file_metadata(self, file_id: str) -> Dict[str, Any]:
+    async def get_file_metadata(
+        self, file_id: str, fields: FieldsArgument = None
+    ) -> Dict[str, Any]:
         """Get metadata for a specific file."""
+        file_fields = resolve_fields("drive.file", fields, default=METADATA_FIELDS)
         try:
-            file = (
-                self.service.files()
-                .get(
-                    fileId=file_id,
-                    fields="id, name, mimeType, webViewLink, parents, createdTime, modifiedTime",
+            service = await self.get_service()
+            file = await self.execute(
+                service.files().get(fileId=file_id, fields=file_fields), cached=True
+            )
+
+            return {"success": True, "file": file}
+        except HttpError as error:
+            return {"success": False, **self.handle_error(error)}
+
+    async def iter_export(
+        self, file_id: str, mime_type: str, chunk_size: int = EXPORT_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        """Stream a Google Workspace file exported to ``mime_type`` in chunks.
+
+        Opening the export runs under the client-side quota and is retried on
+        throttling or transient errors like other reads; once chunks are
+        flowing, a stalled read fails after the read timeout.
+        """
+        import httplib2
+        from google.auth.transport.requests import AuthorizedSession
+
+        service = await self.get_service()
+        credentials = await self.auth.get_credentials()
+        uri = service.files().export(fileId=file_id, mimeType=mime_type).uri
+
+        session = AuthorizedSession(credentials)
+        started, status, received = time.perf_counter(), "error", 0
+        started_ns = time.time_ns()
+
+        async def open_export() -> Any:
+            nonlocal status
+            response = await asyncio.to_thread(
+                session.get, uri, stream=True, timeout=EXPORT_TIMEOUT_SECONDS
+            )
+            status = response.status_code
+            if status >= EXPORT_ERROR_STATUS:
+                content = response.content
+                response.close()
+                resp = httplib2.Response({**response.headers, "status": status})
+                resp.reason = response.reason
+                raise HttpError(resp, content, uri=uri)
+            return response
+
+        try:
+            if self.limiter is None:
+                response = await open_export()
+            else:
+                response = await self.limiter.call(
+                    self.service_name, self.credential_key, READ, open_export, retry=True
                 )
-                .execute()
+            try:
+                chunks = response.iter_content(chunk_size)
+                while True:
+                    chunk = await asyncio.to_thread(next, chunks, None)
+                    if chunk is None:
+                        break
+                    received += len(chunk)
+                    yield chunk
+            finally:
+                response.close()
+        finally:
+            session.close()
+            # Recorded once the stream ends: a span cannot stay current across yields
+            tracing.record(
+                "google.request",
+                started_ns,
+                service=self.service_name,
+                method="drive.files.export",
+                **{"http.status_code": status, "response_bytes": received},
             )
+            if self.metrics is not None:
+                self.metrics.upstream(
+                    self.service_name,
+                    "drive.files.export",
+                    status,
+                    time.perf_counter() - started,
+                    received=received,
+                )
+
+    async def export_text(self, file_id: str, mime_type: str = "text/plain") -> Dict[str, Any]:
+        """Export a Google Workspace file as text, decoding the stream incrementally.
+
+        The decoded chunks are joined into one string: a tool result is a single
+        JSON value that the response cache, the result pager and the serializer
+        all work on whole. Callers that can consume the export as it arrives
+        should iterate ``iter_export`` instead.
+        """
+        decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        parts, size = [], 0
+        try:
+            async for chunk in self.iter_export(file_id, mime_type):
+                size += len(chunk)
+                parts.append(decoder.decode(chunk))
+            parts.append(decoder.decode(b"", final=True))
+            return {"success": True, "content": "".join(parts), "bytes": size}
+        except HttpError as error:
+            return {"success": False, **self.handle_error(error)}
+
+    async def move_files(
+        self,
+        file_ids: List[str],
+        new_parent_id: str,
+        max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    ) -> Dict[str, Any]:
+        """Move many files to a folder using batched parent lookups and updates."""
+        service = await self.get_service()
+        file_ids = list(dict.fromkeys(file_ids))
+
+        parents = await self.execute_batch(
+            {
+                file_id: service.files().get(fileId=file_id, fields="parents")
+                for file_id in file_ids
+            },
+            max_concurrency=max_concurrency,
+        )
 
+        updates = {}
+        for file_id, lookup in parents.items():
+            if not lookup["success"]:
+                continue
+            previous_parents = [
+                parent
+                for parent in lookup["response"].get("parents", [])
+                if parent != new_parent_id
+            ]
+            updates[file_id] = service.files().update(
+                fileId=file_id,
+                addParents=new_parent_id,
+                removeParents=",".join(previous_parents),
+                fields="id, name, parents, webViewLink",
+            )
+
+        for file_id in updates:
+            self.paths.invalidate(file_id)
+        moved = await self.execute_batch(updates, max_concurrency=max_concurrency)
+        return self._bulk_report(file_ids, {**parents, **moved})
+
+    async def copy_file(
+        self, file_id: str, name: Optional[str] = None, parent_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Copy a file, optionally renamed and into a target folder."""
+        body: Dict[str, Any] = {}
+        if name:
+            body["name"] = name
+        if parent_id:
+            body["parents"] = [parent_id]
+        try:
+            service = await self.get_service()
+            file = await self.execute(
+                service.files().copy(
+                    fileId=file_id, body=body, fields="id, name, parents, webViewLink"
+                )
+            )
             return {"success": True, "file": file}
         except HttpError as error:
             return {"success": False, **self.handle_error(error)}
+
+    async def copy_files(
+        self,
+        file_ids: List[str],
+        parent_id: Optional[str] = None,
+        max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    ) -> Dict[str, Any]:
+        """Copy many files, optionally into a target folder, in batched requests."""
+        service = await self.get_service()
+        file_ids = list(dict.fromkeys(file_ids))
+        body = {"parents": [parent_id]} if parent_id else {}
+
+        copies = await self.execute_batch(
+            {
+                file_id: service.files().copy(
+                    fileId=file_id, body=body, fields="id, name, parents, webViewLink"
+                )
+                for file_id in file_ids
+            },
+            max_concurrency=max_concurrency,
+        )
+        return self._bulk_report(file_ids, copies)
+
+    async def trash_files(
+        self, file_ids: List[str], max_concurrency: int = DEFAULT_BATCH_CONCURRENCY
+    ) -> Dict[str, Any]:
+        """Move many files to the trash in batched requests."""
+        service = await self.get_service()
+        file_ids = list(dict.fromkeys(file_ids))
+        for file_id in file_ids:
+            self.paths.invalidate(file_id)
+
+        trashed = await self.execute_batch(
+            {
+                file_id: service.files().update(
+                    fileId=file_id, body={"trashed": True}, fields="id, name, trashed"
+                )
+                for file_id in file_ids
+            },
+            max_concurrency=max_concurrency,
+        )
+        return self._bulk_report(file_ids, trashed)
+
+    async def resolve_path(self, path: str) -> Dict[str, Any]:
+        """Resolve a slash-separated path such as ``Reports/2026/Q3`` to a file ID."""
+        return (await self.resolve_paths([path]))[path]
+
+    async def resolve_paths(
+        self, paths: List[str], max_concurrency: int = DEFAULT_BATCH_CONCURRENCY
+    ) -> Dict[str, Dict[str, Any]]:
+        """Resolve many paths, answering from the path trie where possible.
+
+        Unresolved segments are looked up level by level; all lookups needed at
+        one level, across every path, go out as a single batch request.
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        pending: Dict[str, Tuple[List[str], PathNode, int]] = {
+            path: (split_path(path), self.paths.root, 0) for path in dict.fromkeys(paths)
+        }
+        first_pass = True
+
+        while pending:
+            lookups = self._walk_pending(pending, results, count=first_pass)
+            first_pass = False
+
+            if not lookups:
+                break
+
+            service = await self.get_service()
+            keys = list(lookups)
+            outcomes = await self.execute_batch(
+                {
+                    str(position): service.files().list(
+                        q=(
+                            f"'{parent.file_id}' in parents and name = '{self._escape(name)}' "
+                            "and trashed = false"
+                        ),
+                        fields="files(id, name, mimeType)",
+                        pageSize=10,
+                    )
+                    for position, (parent, name) in enumerate(keys)
+                },
+                max_concurrency=max_concurrency,
+            )
+
+            for position, key in enumerate(keys):
+                self._descend(key, outcomes[str(position)], lookups[key], pending, results)
+
+        return {path: results[path] for path in dict.fromkeys(paths)}
+
+    def _walk_pending(
+        self,
+        pending: Dict[str, Tuple[List[str], PathNode, int]],
+        results: Dict[str, Dict[str, Any]],
+        count: bool,
+    ) -> Dict[Tuple[PathNode, str], List[str]]:
+        """Advance pending paths through the trie and group the lookups still needed.
+
+        Paths that resolve or fail move from ``pending`` to ``results``. With
+        ``count``, each path is counted as a trie hit or miss.
+        """
+        lookups: Dict[Tuple[PathNode, str], List[str]] = {}
+        for path, (segments, start, walked) in list(pending.items()):
+            nodes = self.paths.walk(segments[walked:], start=start)
+            depth = walked + len(nodes)
+            node = nodes[-1] if nodes else start
+            if count:
+                if depth == len(segments):
+                    self.paths.hits += 1
+                else:
+                    self.paths.misses += 1
+
+            if depth == len(segments):
+                results[path] = self._path_result(path, node)
+                del pending[path]
+            elif node.mime_type != FOLDER_MIME_TYPE:
+                results[path] = self._path_error(path, f"'{node.name}' is not a folder")
+                del pending[path]
+            else:
+                pending[path] = (segments, node, depth)
+                lookups.setdefault((node, segments[depth]), []).append(path)
+        return lookups
+
+    def _descend(
+        self,
+        key: Tuple[PathNode, str],
+        outcome: Dict[str, Any],
+        waiting: List[str],
+        pending: Dict[str, Tuple[List[str], PathNode, int]],
+        results: Dict[str, Dict[str, Any]],
+    ) -> None:
+        """Move the paths waiting on one lookup to the child it found, or fail them."""
+        parent, name = key
+        files = outcome["response"].get("files", []) if outcome["success"] else []
+        if not files:
+            for path in waiting:
+                if outcome["success"]:
+                    results[path] = self._path_error(
+                        path, f"no item named '{name}' in '{parent.name or ROOT_ID}'"
+                    )
+                else:
+                    results[path] = {**outcome, "path": path}
+                del pending[path]
+            return
+
+        # Prefer folders so intermediate segments can be descended into
+        match = next((f for f in files if f["mimeType"] == FOLDER_MIME_TYPE), files[0])
+        child = self.paths.insert(parent, name, match["id"], match["mimeType"])
+        for path in waiting:
+            segments, _node, depth = pending[path]
+            pending[path] = (segments, child, depth + 1)
+
+    @staticmethod
+    def _escape(name: str) -> str:
+        """Escape a file name for use inside a Drive query string literal."""
+        return name.replace("\\", "\\\\").replace("'", "\\'")
+
+    @staticmethod
+    def _path_result(path: str, node: PathNode) -> Dict[str, Any]:
+        """Format a resolved path."""
+        return {"success": True, "path": path, "id": node.file_id, "mimeType": node.mime_type}
+
+    @staticmethod
+    def _path_error(path: str, reason: str) -> Dict[str, Any]:
+        """Format a path that could not be resolved."""
+        return {"success": False, "path": path, "error": f"Path not found: {reason}"}
+
+    @staticmethod
+    def _bulk_report(file_ids: List[str], outcomes: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Build per-item results, in input order, for a bulk operation."""
+        results = []
+        for file_id in file_ids:
+            outcome = outcomes[file_id]
+            if outcome["success"]:
+                results.append({"file_id": file_id, "success": True, "file": outcome["response"]})
+            else:
+                item = {key: value for key, value in outcome.items() if key != "success"}
+                results.append({"file_id": file_id, "success": False, **item})
+
+        failed = sum(1 for result in results if not result["success"])
+        return {
+            "success": failed == 0,
+            "succeeded": len(results) - failed,
+            "failed": failed,
+            "results": results,
+        }
@@ -0,0 +1,20 @@
+"""Local fake of the Drive v3, Docs v1 and Sheets v4 APIs for offline tests and benchmarks."""
+
+from mcp_google_suite.fake.app import (
+    FakeGoogle,
+    FakeSettings,
+    create_fake_app,
+    discovery_url,
+    write_fake_credentials,
+)
+from mcp_google_suite.fake.runner import serve_in_thread
+
+
+__all__ = [
+    "FakeGoogle",
+    "FakeSettings",
+    "create_fake_app",
+    "discovery_url",
+    "serve_in_thread",
+    "write_fake_credentials",
+]
@@ -0,0 +1,46 @@
+"""Run the fake Google backend: ``python -m mcp_google_suite.fake --port 8765``."""
+
+import argparse
+import json
+
+from mcp_google_suite.fake.app import FakeGoogle, FakeSettings, create_fake_app, discovery_url
+
+
+def main() -> None:
+    """Parse arguments, optionally seed documents and serve the fake APIs."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1", help="Host to bind to")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added per request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of failures")
+    parser.add_argument("--error-status", type=int, default=503, help="Status of failures")
+    parser.add_argument("--documents", type=int, default=0, help="Documents to seed")
+    parser.add_argument("--paragraphs", type=int, default=50, help="Paragraphs per document")
+    parser.add_argument("--spreadsheets", type=int, default=0, help="Spreadsheets to seed")
+    parser.add_argument("--rows", type=int, default=100, help="Rows per spreadsheet")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    fake = FakeGoogle(
+        FakeSettings(
+            latency_seconds=args.latency,
+            jitter_seconds=args.jitter,
+            error_rate=args.error_rate,
+            error_status=args.error_status,
+        )
+    )
+    seeded = fake.seed(
+        documents=args.documents,
+        paragraphs=args.paragraphs,
+        spreadsheets=args.spreadsheets,
+        rows=args.rows,
+    )
+    base_url = f"http://{args.host}:{args.port}"
+    print(json.dumps({"discovery_url": discovery_url(base_url), **seeded}), flush=True)
+    uvicorn.run(create_fake_app(fake), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,557 @@
+"""Starlette app serving a stateful fake of the Google APIs used by this project.
+
+Point the server at it with ``google_api.discovery_url``; the discovery
+documents it serves send every API, batch and export request back to it.
+"""
+
+import asyncio
+import json
+import random
+import re
+import time
+import uuid
+from collections import Counter
+from email.parser import BytesParser
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from pydantic import BaseModel, Field
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from mcp_google_suite.fake.models import (
+    DOCUMENT_MIME_TYPE,
+    FOLDER_MIME_TYPE,
+    SPREADSHEET_MIME_TYPE,
+    ApiError,
+    DriveQuery,
+    FakeDocument,
+    FakeSpreadsheet,
+    apply_fields,
+    new_id,
+    parse_fields,
+    timestamp,
+)
+
+
+DISCOVERY_PATH = "/discovery/{api}/{apiVersion}/rest"
+FILE_DEFAULT_FIELDS = "kind,id,name,mimeType"
+LIST_DEFAULT_FIELDS = f"kind,incompleteSearch,nextPageToken,files({FILE_DEFAULT_FIELDS})"
+
+# Status, headers and JSON body (or raw text) of one API response
+Result = Tuple[int, Dict[str, str], Any]
+# Batch part responses from this status up are reported as errors
+ERROR_STATUS = 400
+
+
+class FakeSettings(BaseModel):
+    """Latency and error injection, adjustable at runtime through ``/_fake/settings``."""
+
+    latency_seconds: float = Field(default=0.0, description="Added to every API request")
+    jitter_seconds: float = Field(default=0.0, description="Uniform random extra latency")
+    error_rate: float = Field(default=0.0, description="Fraction of API requests that fail")
+    error_status: int = Field(default=503, description="Status of injected failures")
+    retry_after_seconds: Optional[int] = Field(
+        default=None, description="Retry-After header sent with injected failures"
+    )
+
+
+class FakeGoogle:
+    """State and request routing of the fake Drive, Docs and Sheets APIs."""
+
+    def __init__(self, settings: Optional[FakeSettings] = None):
+        self.settings = settings or FakeSettings()
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.documents: Dict[str, FakeDocument] = {}
+        self.spreadsheets: Dict[str, FakeSpreadsheet] = {}
+        self.requests: "Counter[str]" = Counter()
+        self.injected_errors = 0
+        self.files["root"] = {
+            "kind": "drive#file",
+            "id": "root",
+            "name": "My Drive",
+            "mimeType": FOLDER_MIME_TYPE,
+            "parents": [],
+            "trashed": False,
+        }
+        # (HTTP method, path pattern, API method ID, handler)
+        routes: List[Tuple[str, str, str, Callable[..., Result]]] = [
+            ("GET", r"/drive/v3/files", "drive.files.list", self.files_list),
+            ("POST", r"/drive/v3/files", "drive.files.create", self.files_create),
+            ("GET", r"/drive/v3/files/([^/]+)/export", "drive.files.export", self.files_export),
+            ("POST", r"/drive/v3/files/([^/]+)/copy", "drive.files.copy", self.files_copy),
+            ("GET", r"/drive/v3/files/([^/]+)", "drive.files.get", self.files_get),
+            ("PATCH", r"/drive/v3/files/([^/]+)", "drive.files.update", self.files_update),
+            ("DELETE", r"/drive/v3/files/([^/]+)", "drive.files.delete", self.files_delete),
+            ("POST", r"/v1/documents", "docs.documents.create", self.documents_create),
+            ("GET", r"/v1/documents/([^/:]+)", "docs.documents.get", self.documents_get),
+            (
+                "POST",
+                r"/v1/documents/([^/:]+):batchUpdate",
+                "docs.documents.batchUpdate",
+                self.documents_batch_update,
+            ),
+            ("POST", r"/v4/spreadsheets", "sheets.spreadsheets.create", self.spreadsheets_create),
+            ("GET", r"/v4/spreadsheets/([^/:]+)", "sheets.spreadsheets.get", self.spreadsheets_get),
+            (
+                "GET",
+                r"/v4/spreadsheets/([^/:]+)/values/([^/]+)",
+                "sheets.spreadsheets.values.get",
+                self.values_get,
+            ),
+            (
+                "PUT",
+                r"/v4/spreadsheets/([^/:]+)/values/([^/]+)",
+                "sheets.spreadsheets.values.update",
+                self.values_update,
+            ),
+        ]
+        self._routes = [
+            (method, re.compile(pattern), name, handler)
+            for method, pattern, name, handler in routes
+        ]
+
+    # Routing
+
+    def dispatch(
+        self,
+        method: str,
+        path: str,
+        query: Dict[str, List[str]],
+        body: bytes,
+        headers: Dict[str, str],
+    ) -> Result:
+        """Route one API request (also used for each part of a batch request)."""
+        for route_method, pattern, name, handler in self._routes:
+            match = pattern.fullmatch(path)
+            if match and route_method == method:
+                self.requests[name] += 1
+                params = {key: values[-1] for key, values in query.items()}
+                payload = json.loads(body) if body.strip() else {}
+                try:
+                    status, response_headers, result = handler(
+                        *(unquote(group) for group in match.groups()),
+                        params=params,
+                        body=payload,
+                    )
+                except ApiError as error:
+                    return error.code, {}, error.body()
+                etag = response_headers.get("ETag")
+                if etag and method == "GET" and headers.get("if-none-match") == etag:
+                    return 304, {"ETag": etag}, None
+                if isinstance(result, dict) and "fields" in params:
+                    result = apply_fields(result, parse_fields(params["fields"]))
+                return status, response_headers, result
+        return 404, {}, ApiError(404, f"No fake route for {method} {path}").body()
+
+    def injected_failure(self) -> Optional[Result]:
+        settings = self.settings
+        if settings.error_rate and random.random() < settings.error_rate:
+            self.injected_errors += 1
+            headers = {}
+            if settings.retry_after_seconds is not None:
+                headers["Retry-After"] = str(settings.retry_after_seconds)
+            error = ApiError(settings.error_status, "Injected failure from the fake backend")
+            return settings.error_status, headers, error.body()
+        return None
+
+    async def delay(self) -> None:
+        settings = self.settings
+        seconds = settings.latency_seconds + random.uniform(0, settings.jitter_seconds)
+        if seconds > 0:
+            await asyncio.sleep(seconds)
+
+    # Drive
+
+    def _file(self, file_id: str) -> Dict[str, Any]:
+        file = self.files.get(file_id)
+        if file is None:
+            raise ApiError(404, f"File not found: {file_id}.")
+        return file
+
+    def _add_file(
+        self, name: str, mime_type: str, parents: Optional[List[str]] = None, **extra: Any
+    ) -> Dict[str, Any]:
+        file_id = new_id()
+        now = timestamp()
+        file = {
+            "kind": "drive#file",
+            "id": file_id,
+            "name": name,
+            "mimeType": mime_type,
+            "parents": list(parents or ["root"]),
+            "trashed": False,
+            "createdTime": now,
+            "modifiedTime": now,
+            "version": "1",
+            "webViewLink": f"https://drive.google.com/file/d/{file_id}/view",
+            **extra,
+        }
+        self.files[file_id] = file
+        return file
+
+    def _touch(self, file_id: str) -> None:
+        file = self.files.get(file_id)
+        if file is not None:
+            file["modifiedTime"] = timestamp()
+            file["version"] = str(int(file.get("version", "1")) + 1)
+
+    def _etag(self, file: Dict[str, Any]) -> Dict[str, str]:
+        return {"ETag": f'"{file["id"]}/{file.get("version", "1")}"'}
+
+    def _file_text(self, file: Dict[str, Any]) -> str:
+        document = self.documents.get(file["id"])
+        return document.text if document is not None else ""
+
+    def files_list(self, params: Dict[str, str], body: Any) -> Result:
+        query = DriveQuery(params.get("q", ""))
+        matched = [
+            file
+            for file in self.files.values()
+            if file["id"] != "root" and query.matches(file, self._file_text(file))
+        ]
+        offset = int(params.get("pageToken") or 0)
+        size = min(int(params.get("pageSize") or 100), 1000)
+        result: Dict[str, Any] = {
+            "kind": "drive#fileList",
+            "incompleteSearch": False,
+            "files": matched[offset : offset + size],
+        }
+        if offset + size < len(matched):
+            result["nextPageToken"] = str(offset + size)
+        params.setdefault("fields", LIST_DEFAULT_FIELDS)
+        return 200, {}, result
+
+    def files_get(self, file_id: str, params: Dict[str, str], body: Any) -> Result:
+        file = self._file(file_id)
+        params.setdefault("fields", FILE_DEFAULT_FIELDS)
+        return 200, self._etag(file), file
+
+    def files_create(self, params: Dict[str, str], body: Dict[str, Any]) -> Result:
+        mime_type = body.get("mimeType", "application/octet-stream")
+        name = body.get("name", "Untitled")
+        file = self._add_file(name, mime_type, body.get("parents"))
+        if mime_type == DOCUMENT_MIME_TYPE:
+            self.documents[file["id"]] = FakeDocument(file["id"], name)
+        elif mime_type == SPREADSHEET_MIME_TYPE:
+            self.spreadsheets[file["id"]] = FakeSpreadsheet(file["id"], name, [])
+        params.setdefault("fields", FILE_DEFAULT_FIELDS)
+        return 200, {}, file
+
+    def files_update(self, file_id: str, params: Dict[str, str], body: Dict[str, Any]) -> Result:
+        file = self._file(file_id)
+        parents = list(file.get("parents", []))
+        for parent in filter(None, params.get("removeParents", "").split(",")):
+            if parent in parents:
+                parents.remove(parent)
+        for parent in filter(None, params.get("addParents", "").split(",")):
+            self._file(parent)
+            if parent not in parents:
+                parents.append(parent)
+        file["parents"] = parents
+        for key in ("name", "description", "trashed", "starred"):
+            if key in body:
+                file[key] = body[key]
+        if "name" in body:
+            for store in (self.documents, self.spreadsheets):
+                if file_id in store:
+                    store[file_id].title = body["name"]
+        self._touch(file_id)
+        params.setdefault("fields", FILE_DEFAULT_FIELDS)
+        return 200, {}, file
+
+    def files_copy(self, file_id: str, params: Dict[str, str], body: Dict[str, Any]) -> Result:
+        source = self._file(file_id)
+        name = body.get("name") or f"Copy of {source['name']}"
+        file = self._add_file(name, source["mimeType"], body.get("parents") or source["parents"])
+        if file_id in self.documents:
+            self.documents[file["id"]] = self.documents[file_id].copy(file["id"], name)
+        if file_id in self.spreadsheets:
+            self.spreadsheets[file["id"]] = self.spreadsheets[file_id].copy(file["id"], name)
+        params.setdefault("fields", FILE_DEFAULT_FIELDS)
+        return 200, {}, file
+
+    def files_delete(self, file_id: str, params: Dict[str, str], body: Any) -> Result:
+        self._file(file_id)
+        del self.files[file_id]
+        self.documents.pop(file_id, None)
+        self.spreadsheets.pop(file_id, None)
+        return 204, {}, None
+
+    def files_export(self, file_id: str, params: Dict[str, str], body: Any) -> Result:
+        self._file(file_id)
+        mime_type = params.get("mimeType", "")
+        source = self.documents.get(file_id) or self.spreadsheets.get(file_id)
+        if source is None:
+            raise ApiError(403, "Export only supports Docs Editors files.")
+        return 200, {"Content-Type": f"{mime_type}; charset=utf-8"}, source.export(mime_type)
+
+    # Docs
+
+    def _document(self, document_id: str) -> FakeDocument:
+        document = self.documents.get(document_id)
+        if document is None:
+            raise ApiError(404, f"Requested entity was not found: {document_id}")
+        return document
+
+    def documents_create(self, params: Dict[str, str], body: Dict[str, Any]) -> Result:
+        title = body.get("title", "Untitled document")
+        file = self._add_file(title, DOCUMENT_MIME_TYPE)
+        document = self.documents[file["id"]] = FakeDocument(file["id"], title)
+        return 200, {}, document.to_json()
+
+    def documents_get(self, document_id: str, params: Dict[str, str], body: Any) -> Result:
+        document = self._document(document_id)
+        return 200, {"ETag": f'"{document.revision_id}"'}, document.to_json()
+
+    def documents_batch_update(
+        self, document_id: str, params: Dict[str, str], body: Dict[str, Any]
+    ) -> Result:
+        document = self._document(document_id)
+        required = body.get("writeControl", {}).get("requiredRevisionId")
+        if required and required != document.revision_id:
+            raise ApiError(400, "The required revision ID does not match the latest revision.")
+        replies = document.batch_update(body.get("requests", []))
+        self._touch(document_id)
+        return (
+            200,
+            {},
+            {
+                "documentId": document_id,
+                "replies": replies,
+                "writeControl": {"requiredRevisionId": document.revision_id},
+            },
+        )
+
+    # Sheets
+
+    def _spreadsheet(self, spreadsheet_id: str) -> FakeSpreadsheet:
+        spreadsheet = self.spreadsheets.get(spreadsheet_id)
+        if spreadsheet is None:
+            raise ApiError(404, f"Requested entity was not found: {spreadsheet_id}")
+        return spreadsheet
+
+    def spreadsheets_create(self, params: Dict[str, str], body: Dict[str, Any]) -> Result:
+        title = body.get("properties", {}).get("title", "Untitled spreadsheet")
+        sheet_titles = [sheet["properties"]["title"] for sheet in body.get("sheets", [])]
+        file = self._add_file(title, SPREADSHEET_MIME_TYPE)
+        spreadsheet = FakeSpreadsheet(file["id"], title, sheet_titles)
+        self.spreadsheets[file["id"]] = spreadsheet
+        return 200, {}, spreadsheet.to_json()
+
+    def spreadsheets_get(self, spreadsheet_id: str, params: Dict[str, str], body: Any) -> Result:
+        return 200, {}, self._spreadsheet(spreadsheet_id).to_json()
+
+    def values_get(
+        self, spreadsheet_id: str, range_name: str, params: Dict[str, str], body: Any
+    ) -> Result:
+        spreadsheet = self._spreadsheet(spreadsheet_id)
+        etag = {"ETag": f'"{spreadsheet_id}/{spreadsheet.revision}"'}
+        return 200, etag, spreadsheet.get_values(range_name)
+
+    def values_update(
+        self, spreadsheet_id: str, range_name: str, params: Dict[str, str], body: Dict[str, Any]
+    ) -> Result:
+        if params.get("valueInputOption") not in ("RAW", "USER_ENTERED"):
+            raise ApiError(400, "valueInputOption is required")
+        spreadsheet = self._spreadsheet(spreadsheet_id)
+        result = spreadsheet.update_values(
+            range_name, body.get("values", []), body.get("majorDimension", "ROWS")
+        )
+        self._touch(spreadsheet_id)
+        return 200, {}, result
+
+    # Seeding
+
+    def seed(  # noqa: PLR0913 - one argument per seeded dimension
+        self,
+        documents: int = 0,
+        paragraphs: int = 50,
+        spreadsheets: int = 0,
+        rows: int = 100,
+        columns: int = 10,
+        folder: Optional[str] = None,
+    ) -> Dict[str, List[str]]:
+        """Create documents with headed sections and filled spreadsheets for benchmarks."""
+        parent = [folder] if folder else None
+        created: Dict[str, List[str]] = {"documents": [], "spreadsheets": []}
+        for number in range(documents):
+            file = self._add_file(f"Document {number + 1}", DOCUMENT_MIME_TYPE, parent)
+            document = FakeDocument(file["id"], file["name"])
+            lines = []
+            for paragraph in range(paragraphs):
+                if paragraph % 10 == 0:
+                    lines.append(f"Section {paragraph // 10 + 1}")
+                else:
+                    lines.append(f"Paragraph {paragraph} of document {number + 1}. " * 4)
+            document.insert(0, "\n".join(lines))
+            for paragraph in range(0, paragraphs, 10):
+                document.paragraphs[paragraph]["paragraphStyle"]["namedStyleType"] = "HEADING_1"
+            self.documents[file["id"]] = document
+            created["documents"].append(file["id"])
+        for number in range(spreadsheets):
+            file = self._add_file(f"Spreadsheet {number + 1}", SPREADSHEET_MIME_TYPE, parent)
+            spreadsheet = FakeSpreadsheet(file["id"], file["name"], [])
+            spreadsheet.update_values(
+                "A1",
+                [[f"R{row}C{column}" for column in range(columns)] for row in range(rows)],
+            )
+            self.spreadsheets[file["id"]] = spreadsheet
+            created["spreadsheets"].append(file["id"])
+        return created
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "files": len(self.files) - 1,
+            "documents": len(self.documents),
+            "spreadsheets": len(self.spreadsheets),
+            "requests": dict(self.requests),
+            "injected_errors": self.injected_errors,
+        }
+
+
+def _response(result: Result) -> Response:
+    status, headers, body = result
+    if body is None:
+        return Response(status_code=status, headers=headers)
+    if isinstance(body, str):
+        media_type = headers.pop("Content-Type", "text/plain; charset=utf-8")
+        return Response(body, status_code=status, headers=headers, media_type=media_type)
+    return JSONResponse(body, status_code=status, headers=headers)
+
+
+def _parse_part(inner: str) -> Tuple[str, str, Dict[str, str], str]:
+    """Split one batch part into its method, target, lower-cased headers and body."""
+    separator = "\r\n\r\n" if "\r\n\r\n" in inner else "\n\n"
+    head, _, body = inner.partition(separator)
+    request_line, *header_lines = head.splitlines()
+    method, target, _version = request_line.split(" ", 2)
+    headers = {}
+    for line in header_lines:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return method, target, headers, body
+
+
+def _encode_part(content_id: str, result: Result) -> str:
+    status, headers, body = result
+    lines = [f"HTTP/1.1 {status} {'OK' if status < ERROR_STATUS else 'Error'}"]
+    lines += [f"{key}: {value}" for key, value in headers.items()]
+    payload = ""
+    if body is not None:
+        lines.append("Content-Type: application/json; charset=UTF-8")
+        payload = json.dumps(body)
+    # The client folds long Content-ID headers; unfold before echoing the ID back
+    response_id = re.sub(r"\r?\n", "", content_id).replace("<", "<response-", 1)
+    return (
+        f"Content-Type: application/http\r\nContent-ID: {response_id}\r\n\r\n"
+        + "\r\n".join(lines)
+        + "\r\n\r\n"
+        + payload
+    )
+
+
+def create_fake_app(fake: Optional[FakeGoogle] = None) -> Starlette:
+    """Create the Starlette app of a fake Google backend."""
+    fake = fake or FakeGoogle()
+    discovery_cache: Dict[Tuple[str, str, str], str] = {}
+
+    async def discovery(request: Request) -> Response:
+        from googleapiclient import discovery_cache as static_documents
+
+        api, version = request.path_params["api"], request.path_params["version"]
+        root = str(request.base_url)
+        key = (api, version, root)
+        if key not in discovery_cache:
+            content = static_documents.get_static_doc(api, version)
+            if content is None:
+                return JSONResponse(ApiError(404, f"Unknown API {api} {version}").body(), 404)
+            document = json.loads(content)
+            document["rootUrl"] = root
+            document["baseUrl"] = root + document.get("servicePath", "")
+            document.pop("mtlsRootUrl", None)
+            discovery_cache[key] = json.dumps(document)
+        return Response(discovery_cache[key], media_type="application/json")
+
+    async def batch(request: Request) -> Response:
+        await fake.delay()
+        failure = fake.injected_failure()
+        if failure is not None:
+            return _response(failure)
+        content_type = request.headers.get("content-type", "")
+        raw = await request.body()
+        message = BytesParser().parsebytes(f"Content-Type: {content_type}\r\n\r\n".encode() + raw)
+        boundary = f"batch_{uuid.uuid4().hex}"
+        parts = []
+        for part in message.get_payload():
+            method, target, headers, body = _parse_part(part.get_payload(decode=False))
+            url = urlsplit(target)
+            result = fake.dispatch(
+                method, url.path, parse_qs(url.query), body.encode("utf-8"), headers
+            )
+            parts.append(_encode_part(part["Content-ID"], result))
+        payload = "".join(f"--{boundary}\r\n{part}\r\n" for part in parts) + f"--{boundary}--"
+        return Response(payload, media_type=f"multipart/mixed; boundary={boundary}")
+
+    async def api(request: Request) -> Response:
+        await fake.delay()
+        failure = fake.injected_failure()
+        if failure is not None:
+            return _response(failure)
+        headers = {key.lower(): value for key, value in request.headers.items()}
+        result = fake.dispatch(
+            request.method,
+            request.url.path,
+            parse_qs(request.url.query),
+            await request.body(),
+            headers,
+        )
+        return _response(result)
+
+    async def settings(request: Request) -> Response:
+        if request.method == "POST":
+            fake.settings = FakeSettings(**{**fake.settings.model_dump(), **await request.json()})
+        return JSONResponse(fake.settings.model_dump())
+
+    async def seed(request: Request) -> Response:
+        return JSONResponse(fake.seed(**await request.json()))
+
+    async def stats(request: Request) -> Response:
+        return JSONResponse(fake.stats())
+
+    methods = ["GET", "POST", "PUT", "PATCH", "DELETE"]
+    routes = [
+        Route("/discovery/{api}/{version}/rest", endpoint=discovery),
+        Route("/_fake/settings", endpoint=settings, methods=["GET", "POST"]),
+        Route("/_fake/seed", endpoint=seed, methods=["POST"]),
+        Route("/_fake/stats", endpoint=stats),
+        Route("/batch/drive/v3", endpoint=batch, methods=["POST"]),
+        Route("/{path:path}", endpoint=api, methods=methods),
+    ]
+    app = Starlette(routes=routes)
+    app.state.fake = fake
+    return app
+
+
+def discovery_url(base_url: str) -> str:
+    """The ``google_api.discovery_url`` setting for a fake running at ``base_url``."""
+    return base_url.rstrip("/") + DISCOVERY_PATH
+
+
+def write_fake_credentials(path: str) -> None:
+    """Write a long-lived authorized-user token that the fake accepts."""
+    expiry = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() + 10 * 365 * 86400))
+    with open(path, "w") as f:
+        json.dump(
+            {
+                "token": "fake-access-token",
+                "refresh_token": "fake-refresh-token",
+                "client_id": "fake-client.apps.googleusercontent.com",
+                "client_secret": "fake-secret",
+                "token_uri": "https://oauth2.googleapis.com/token",
+                "expiry": expiry,
+            },
+            f,
+        )
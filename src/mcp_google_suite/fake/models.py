@@ -0,0 +1,650 @@
+"""In-memory state of the fake Drive v3, Docs v1 and Sheets v4 APIs."""
+
+import copy
+import csv
+import io
+import re
+import time
+import uuid
+from typing import Any, ClassVar, Dict, List, Optional, Tuple
+
+
+DOCUMENT_MIME_TYPE = "application/vnd.google-apps.document"
+SPREADSHEET_MIME_TYPE = "application/vnd.google-apps.spreadsheet"
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+# Characters above the Basic Multilingual Plane take two UTF-16 code units
+BMP_MAX = 0xFFFF
+
+
+class ApiError(Exception):
+    """An error answered in the Google API error format."""
+
+    STATUSES: ClassVar[Dict[int, Tuple[str, str]]] = {
+        400: ("INVALID_ARGUMENT", "badRequest"),
+        403: ("PERMISSION_DENIED", "forbidden"),
+        404: ("NOT_FOUND", "notFound"),
+        429: ("RESOURCE_EXHAUSTED", "rateLimitExceeded"),
+        500: ("INTERNAL", "backendError"),
+        503: ("UNAVAILABLE", "backendError"),
+    }
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+    def body(self) -> Dict[str, Any]:
+        status, reason = self.STATUSES.get(self.code, ("UNKNOWN", "unknown"))
+        return {
+            "error": {
+                "code": self.code,
+                "message": self.message,
+                "status": status,
+                "errors": [{"message": self.message, "domain": "global", "reason": reason}],
+            }
+        }
+
+
+def new_id() -> str:
+    return uuid.uuid4().hex + uuid.uuid4().hex[:12]
+
+
+def timestamp() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime())
+
+
+# Partial responses
+
+
+def parse_fields(fields: str) -> Dict[str, Any]:
+    """Parse a ``fields`` mask like ``files(id,name),nextPageToken`` into a tree.
+
+    Each key maps to a subtree, or to None when the whole value is selected.
+    """
+    tree: Dict[str, Any] = {}
+    position = _parse_field_list(fields.replace(" ", ""), 0, tree)
+    if position != len(fields.replace(" ", "")):
+        raise ApiError(400, f"Invalid field selection {fields}")
+    return tree
+
+
+def _parse_field_list(text: str, position: int, tree: Dict[str, Any]) -> int:
+    while position < len(text):
+        match = re.match(r"[A-Za-z0-9_*]+(/[A-Za-z0-9_*]+)*", text[position:])
+        if not match:
+            raise ApiError(400, f"Invalid field selection {text}")
+        node = tree
+        names = match.group(0).split("/")
+        for name in names[:-1]:
+            node = node.setdefault(name, {}) or {}
+        position += match.end()
+        if position < len(text) and text[position] == "(":
+            subtree = node.get(names[-1]) or {}
+            position = _parse_field_list(text, position + 1, subtree)
+            if position >= len(text) or text[position] != ")":
+                raise ApiError(400, f"Invalid field selection {text}")
+            node[names[-1]] = subtree
+            position += 1
+        else:
+            node[names[-1]] = None
+        if position < len(text) and text[position] == ",":
+            position += 1
+        elif position < len(text) and text[position] == ")":
+            return position
+    return position
+
+
+def apply_fields(value: Any, tree: Optional[Dict[str, Any]]) -> Any:
+    """Keep only the parts of ``value`` selected by a parsed ``fields`` mask."""
+    if tree is None or "*" in tree:
+        return value
+    if isinstance(value, list):
+        return [apply_fields(item, tree) for item in value]
+    if not isinstance(value, dict):
+        return value
+    return {key: apply_fields(value[key], subtree) for key, subtree in tree.items() if key in value}
+
+
+# Docs
+
+
+def utf16_len(text: str) -> int:
+    """Length in UTF-16 code units, the unit of Docs indexes."""
+    if text.isascii():
+        return len(text)
+    return len(text.encode("utf-16-le")) // 2
+
+
+class FakeDocument:
+    """A document body as text plus per-character text styles and per-paragraph styles.
+
+    Indexes in requests and responses are UTF-16 offsets starting at 1, after
+    the section break, as in the Docs API. Tables and other structural
+    elements besides paragraphs are not modelled.
+    """
+
+    # batchUpdate request kinds and the methods applying them
+    REQUEST_METHODS: ClassVar[Dict[str, str]] = {
+        "insertText": "_request_insert_text",
+        "deleteContentRange": "_request_delete_content_range",
+        "replaceAllText": "_request_replace_all_text",
+        "updateTextStyle": "_request_update_text_style",
+        "updateParagraphStyle": "_request_update_paragraph_style",
+        "createParagraphBullets": "_request_create_paragraph_bullets",
+        "deleteParagraphBullets": "_request_delete_paragraph_bullets",
+    }
+
+    def __init__(self, document_id: str, title: str):
+        self.document_id = document_id
+        self.title = title
+        self.revision = 1
+        self.text = "\n"
+        self.char_styles: List[Dict[str, Any]] = [{}]
+        self.paragraphs: List[Dict[str, Any]] = [_paragraph()]
+        self.lists: Dict[str, Any] = {}
+
+    @property
+    def revision_id(self) -> str:
+        return f"rev-{self.document_id[:8]}-{self.revision}"
+
+    @property
+    def end_index(self) -> int:
+        return 1 + utf16_len(self.text)
+
+    def copy(self, document_id: str, title: str) -> "FakeDocument":
+        duplicate = copy.deepcopy(self)
+        duplicate.document_id, duplicate.title, duplicate.revision = document_id, title, 1
+        return duplicate
+
+    # Index conversion
+
+    def _position(self, index: int) -> int:
+        """Python string position of a Docs index."""
+        if index < 1 or index > self.end_index:
+            raise ApiError(
+                400, f"Index {index} must be within the body bounds [1, {self.end_index})"
+            )
+        if self.text.isascii():
+            return index - 1
+        units = 0
+        for position, char in enumerate(self.text):
+            if units >= index - 1:
+                return position
+            units += 2 if ord(char) > BMP_MAX else 1
+        return len(self.text)
+
+    def _range(self, value: Dict[str, Any]) -> Tuple[int, int]:
+        start, end = value.get("startIndex"), value.get("endIndex")
+        if start is None or end is None or start >= end:
+            raise ApiError(400, "Invalid range: startIndex must be less than endIndex")
+        return self._position(start), self._position(end)
+
+    def _paragraph_at(self, position: int) -> int:
+        return self.text.count("\n", 0, position)
+
+    # Primitive edits
+
+    def insert(self, position: int, text: str) -> None:
+        if not text:
+            return
+        if position >= len(self.text):
+            raise ApiError(
+                400, "The insertion index must be inside the bounds of an existing paragraph"
+            )
+        inherited = self.char_styles[position - 1] if position > 0 else {}
+        paragraph = self._paragraph_at(position)
+        self.text = self.text[:position] + text + self.text[position:]
+        self.char_styles[position:position] = [inherited] * len(text)
+        splits = text.count("\n")
+        if splits:
+            template = self.paragraphs[paragraph]
+            self.paragraphs[paragraph + 1 : paragraph + 1] = [
+                copy.deepcopy(template) for _ in range(splits)
+            ]
+
+    def delete(self, start: int, end: int) -> None:
+        if end >= len(self.text):
+            raise ApiError(400, "The range cannot include the newline at the end of the segment")
+        merged = self.text.count("\n", start, end)
+        paragraph = self._paragraph_at(start)
+        self.text = self.text[:start] + self.text[end:]
+        del self.char_styles[start:end]
+        del self.paragraphs[paragraph + 1 : paragraph + 1 + merged]
+
+    def _paragraph_span(self, start: int, end: int) -> range:
+        return range(self._paragraph_at(start), self._paragraph_at(max(start, end - 1)) + 1)
+
+    # Requests
+
+    def batch_update(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Apply ``documents.batchUpdate`` requests atomically and return their replies."""
+        snapshot = (self.text, list(self.char_styles), copy.deepcopy(self.paragraphs))
+        try:
+            replies = [self._apply(request) for request in requests]
+        except ApiError:
+            self.text, self.char_styles, self.paragraphs = snapshot
+            raise
+        self.revision += 1
+        return replies
+
+    def _apply(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        if len(request) != 1:
+            raise ApiError(400, "Each request must set exactly one kind of request")
+        ((kind, body),) = request.items()
+        method = self.REQUEST_METHODS.get(kind)
+        if method is None:
+            raise ApiError(400, f"Request kind {kind} is not supported by the fake Docs API")
+        return getattr(self, method)(body)
+
+    def _request_insert_text(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        if "endOfSegmentLocation" in body:
+            position = len(self.text) - 1
+        else:
+            position = self._position(body.get("location", {}).get("index", 0))
+        self.insert(position, body.get("text", ""))
+        return {}
+
+    def _request_delete_content_range(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        self.delete(*self._range(body.get("range", {})))
+        return {}
+
+    def _request_replace_all_text(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        contains = body.get("containsText", {})
+        needle = contains.get("text")
+        if not needle:
+            raise ApiError(400, "containsText.text must not be empty")
+        flags = 0 if contains.get("matchCase") else re.IGNORECASE
+        matches = list(re.finditer(re.escape(needle), self.text, flags))
+        replacement = body.get("replaceText", "")
+        for match in reversed(matches):
+            start, end = match.span()
+            style = self.char_styles[start]
+            if end >= len(self.text):
+                end = len(self.text) - 1
+            self.delete(start, end)
+            self.insert(start, replacement)
+            self.char_styles[start : start + len(replacement)] = [style] * len(replacement)
+        return {"replaceAllText": {"occurrencesChanged": len(matches)}}
+
+    def _request_update_text_style(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        start, end = self._range(body.get("range", {}))
+        updates = _selected(body.get("textStyle", {}), body.get("fields"))
+        merged: Dict[int, Dict[str, Any]] = {}
+        for position in range(start, end):
+            style = self.char_styles[position]
+            if id(style) not in merged:
+                merged[id(style)] = _merge(style, updates)
+            self.char_styles[position] = merged[id(style)]
+        return {}
+
+    def _request_update_paragraph_style(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        start, end = self._range(body.get("range", {}))
+        updates = _selected(body.get("paragraphStyle", {}), body.get("fields"))
+        for paragraph in self._paragraph_span(start, end):
+            style = self.paragraphs[paragraph]["paragraphStyle"]
+            self.paragraphs[paragraph]["paragraphStyle"] = _merge(style, updates)
+        return {}
+
+    def _request_create_paragraph_bullets(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        start, end = self._range(body.get("range", {}))
+        preset = body.get("bulletPreset", "BULLET_DISC_CIRCLE_SQUARE")
+        list_id = f"kix.{uuid.uuid4().hex[:12]}"
+        glyph = {"glyphType": "DECIMAL"} if preset.startswith("NUMBERED") else {"glyphSymbol": "●"}
+        self.lists[list_id] = {"listProperties": {"nestingLevels": [glyph]}}
+        for paragraph in self._paragraph_span(start, end):
+            self.paragraphs[paragraph]["bullet"] = {"listId": list_id}
+        return {}
+
+    def _request_delete_paragraph_bullets(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        start, end = self._range(body.get("range", {}))
+        for paragraph in self._paragraph_span(start, end):
+            self.paragraphs[paragraph].pop("bullet", None)
+        return {}
+
+    # Representations
+
+    def to_json(self) -> Dict[str, Any]:
+        """Render the document as a ``documents.get`` response."""
+        content: List[Dict[str, Any]] = [
+            {"endIndex": 1, "sectionBreak": {"sectionStyle": {"sectionType": "CONTINUOUS"}}}
+        ]
+        index, position = 1, 0
+        for paragraph in self.paragraphs:
+            end = self.text.index("\n", position) + 1
+            elements, start_index = [], index
+            run_start = position
+            for cursor in range(position + 1, end + 1):
+                if cursor == end or self.char_styles[cursor] is not self.char_styles[run_start]:
+                    run_text = self.text[run_start:cursor]
+                    length = utf16_len(run_text)
+                    elements.append(
+                        {
+                            "startIndex": index,
+                            "endIndex": index + length,
+                            "textRun": {
+                                "content": run_text,
+                                "textStyle": dict(self.char_styles[run_start]),
+                            },
+                        }
+                    )
+                    index += length
+                    run_start = cursor
+            element = {
+                "elements": elements,
+                "paragraphStyle": dict(paragraph["paragraphStyle"]),
+            }
+            if "bullet" in paragraph:
+                element["bullet"] = dict(paragraph["bullet"])
+            content.append({"startIndex": start_index, "endIndex": index, "paragraph": element})
+            position = end
+        return {
+            "documentId": self.document_id,
+            "title": self.title,
+            "revisionId": self.revision_id,
+            "body": {"content": content},
+            "lists": copy.deepcopy(self.lists),
+        }
+
+    def export(self, mime_type: str) -> str:
+        """Render the document as Drive exports it to text or Markdown."""
+        if mime_type == "text/plain":
+            return self.text
+        if mime_type != "text/markdown":
+            raise ApiError(400, f"Export to {mime_type} is not supported by the fake Drive API")
+        lines, position = [], 0
+        for paragraph in self.paragraphs:
+            end = self.text.index("\n", position)
+            line = self.text[position:end]
+            named = paragraph["paragraphStyle"].get("namedStyleType", "")
+            if named.startswith("HEADING_"):
+                line = "#" * int(named.rsplit("_", 1)[1]) + " " + line
+            elif named == "TITLE":
+                line = "# " + line
+            elif "bullet" in paragraph:
+                line = "* " + line
+            lines.append(line)
+            position = end + 1
+        return "\n".join(lines) + "\n"
+
+
+def _paragraph() -> Dict[str, Any]:
+    return {"paragraphStyle": {"namedStyleType": "NORMAL_TEXT", "direction": "LEFT_TO_RIGHT"}}
+
+
+def _selected(style: Dict[str, Any], fields: Optional[str]) -> Dict[str, Any]:
+    if not fields:
+        raise ApiError(400, "fields is required")
+    if fields.strip() == "*":
+        return dict(style)
+    names = [name.strip() for name in fields.split(",")]
+    return {name: style.get(name) for name in names}
+
+
+def _merge(style: Dict[str, Any], updates: Dict[str, Any]) -> Dict[str, Any]:
+    merged = dict(style)
+    for key, value in updates.items():
+        if value is None:
+            merged.pop(key, None)
+        else:
+            merged[key] = value
+    return merged
+
+
+# Sheets
+
+
+def column_number(letters: str) -> int:
+    number = 0
+    for char in letters.upper():
+        number = number * 26 + ord(char) - ord("A") + 1
+    return number
+
+
+def column_letters(number: int) -> str:
+    letters = ""
+    while number:
+        number, remainder = divmod(number - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters
+
+
+A1_CELL = re.compile(r"^([A-Za-z]*)(\d*)$")
+
+
+class FakeSpreadsheet:
+    """A spreadsheet as a grid of string values per sheet."""
+
+    ROW_COUNT, COLUMN_COUNT = 1000, 26
+
+    def __init__(self, spreadsheet_id: str, title: str, sheet_titles: List[str]):
+        self.spreadsheet_id = spreadsheet_id
+        self.title = title
+        self.revision = 1
+        self.sheets: Dict[str, List[List[str]]] = {name: [] for name in sheet_titles or ["Sheet1"]}
+
+    def copy(self, spreadsheet_id: str, title: str) -> "FakeSpreadsheet":
+        duplicate = copy.deepcopy(self)
+        duplicate.spreadsheet_id, duplicate.title, duplicate.revision = spreadsheet_id, title, 1
+        return duplicate
+
+    def _resolve(self, range_name: str) -> Tuple[str, int, int, Optional[int], Optional[int]]:
+        """Split an A1 range into sheet, first row/column and last row/column (1-based)."""
+        sheet, _, cells = range_name.rpartition("!")
+        if not sheet:
+            if range_name.strip("'") in self.sheets:
+                sheet, cells = range_name, ""
+            else:
+                sheet = next(iter(self.sheets))
+        sheet = sheet.strip("'").replace("''", "'")
+        if sheet not in self.sheets:
+            raise ApiError(400, f"Unable to parse range: {range_name}")
+        if not cells:
+            return sheet, 1, 1, None, None
+        first, _, last = cells.partition(":")
+        start, end = A1_CELL.match(first), A1_CELL.match(last or first)
+        if not start or not end or not (first.strip()):
+            raise ApiError(400, f"Unable to parse range: {range_name}")
+        start_col = column_number(start.group(1)) if start.group(1) else 1
+        start_row = int(start.group(2)) if start.group(2) else 1
+        end_col = column_number(end.group(1)) if end.group(1) else None
+        end_row = int(end.group(2)) if end.group(2) else None
+        return sheet, start_row, start_col, end_row, end_col
+
+    def _a1(self, sheet: str, row: int, col: int, end_row: int, end_col: int) -> str:
+        name = f"'{sheet}'" if " " in sheet else sheet
+        return f"{name}!{column_letters(col)}{row}:{column_letters(end_col)}{end_row}"
+
+    def get_values(self, range_name: str) -> Dict[str, Any]:
+        sheet, row, col, end_row, end_col = self._resolve(range_name)
+        grid = self.sheets[sheet]
+        last_row = min(end_row or len(grid), len(grid))
+        values = []
+        for cells in grid[row - 1 : last_row]:
+            selected = cells[col - 1 : end_col] if end_col else cells[col - 1 :]
+            while selected and selected[-1] == "":
+                selected = selected[:-1]
+            values.append(selected)
+        while values and not values[-1]:
+            values.pop()
+        result = {
+            "range": self._a1(
+                sheet,
+                row,
+                col,
+                end_row or max(row, len(grid)),
+                end_col or max(col, max((len(cells) for cells in grid), default=col)),
+            ),
+            "majorDimension": "ROWS",
+        }
+        if values:
+            result["values"] = values
+        return result
+
+    def update_values(
+        self, range_name: str, values: List[List[Any]], major_dimension: str = "ROWS"
+    ) -> Dict[str, Any]:
+        sheet, row, col, _end_row, _end_col = self._resolve(range_name)
+        if major_dimension == "COLUMNS":
+            width = max((len(column) for column in values), default=0)
+            values = [
+                [column[i] if i < len(column) else "" for column in values] for i in range(width)
+            ]
+        grid = self.sheets[sheet]
+        for offset, cells in enumerate(values):
+            while len(grid) < row + offset:
+                grid.append([])
+            target = grid[row + offset - 1]
+            needed = col - 1 + len(cells)
+            if len(target) < needed:
+                target.extend([""] * (needed - len(target)))
+            target[col - 1 : needed] = [_cell(value) for value in cells]
+        self.revision += 1
+        rows = len(values)
+        columns = max((len(cells) for cells in values), default=0)
+        return {
+            "spreadsheetId": self.spreadsheet_id,
+            "updatedRange": self._a1(
+                sheet, row, col, row + max(rows, 1) - 1, col + max(columns, 1) - 1
+            ),
+            "updatedRows": rows,
+            "updatedColumns": columns,
+            "updatedCells": sum(len(cells) for cells in values),
+        }
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "spreadsheetId": self.spreadsheet_id,
+            "properties": {"title": self.title, "locale": "en_US", "timeZone": "Etc/GMT"},
+            "sheets": [
+                {
+                    "properties": {
+                        "sheetId": index,
+                        "title": name,
+                        "index": index,
+                        "sheetType": "GRID",
+                        "gridProperties": {
+                            "rowCount": self.ROW_COUNT,
+                            "columnCount": self.COLUMN_COUNT,
+                        },
+                    }
+                }
+                for index, name in enumerate(self.sheets)
+            ],
+            "spreadsheetUrl": (
+                f"https://docs.google.com/spreadsheets/d/{self.spreadsheet_id}/edit"
+            ),
+        }
+
+    def export(self, mime_type: str) -> str:
+        if mime_type != "text/csv":
+            raise ApiError(400, f"Export to {mime_type} is not supported by the fake Drive API")
+        output = io.StringIO()
+        csv.writer(output, lineterminator="\n").writerows(next(iter(self.sheets.values())))
+        return output.getvalue()
+
+
+def _cell(value: Any) -> str:
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    return "" if value is None else str(value)
+
+
+# Drive
+
+
+QUERY_TOKEN = re.compile(r"'(?:[^'\\]|\\.)*'|\(|\)|!=|=|[^\s()=!']+")
+
+
+def _unquote(token: str) -> str:
+    return re.sub(r"\\(.)", r"\1", token[1:-1])
+
+
+class DriveQuery:
+    """Evaluates the subset of the Drive ``q`` syntax this project sends.
+
+    Supports ``'<id>' in parents``, ``name``/``mimeType``/``fullText`` with
+    ``=``, ``!=`` or ``contains``, and ``trashed``, combined with ``and``/``or``.
+    """
+
+    def __init__(self, query: str):
+        self.tokens = QUERY_TOKEN.findall(query or "")
+        self.position = 0
+        self.tree = self._or() if self.tokens else None
+        if self.position != len(self.tokens):
+            raise ApiError(400, f"Invalid Value: {query}")
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _take(self) -> str:
+        token = self._peek()
+        if token is None:
+            raise ApiError(400, "Invalid Value: unexpected end of query")
+        self.position += 1
+        return token
+
+    def _or(self) -> Any:
+        terms = [self._and()]
+        while (self._peek() or "").lower() == "or":
+            self._take()
+            terms.append(self._and())
+        return ("or", terms)
+
+    def _and(self) -> Any:
+        terms = [self._term()]
+        while (self._peek() or "").lower() == "and":
+            self._take()
+            terms.append(self._term())
+        return ("and", terms)
+
+    def _term(self) -> Any:
+        token = self._take()
+        if token == "(":
+            tree = self._or()
+            if self._take() != ")":
+                raise ApiError(400, "Invalid Value: unbalanced parentheses")
+            return tree
+        if token.lower() == "not":
+            return ("not", self._term())
+        if token.startswith("'"):
+            if self._take().lower() != "in" or self._take() != "parents":
+                raise ApiError(400, "Invalid Value: expected 'in parents'")
+            return ("parent", _unquote(token))
+        operator, value = self._take(), self._take()
+        if token == "trashed" and operator in ("=", "!="):
+            return ("trashed", operator, value.lower() == "true")
+        if (
+            token in ("name", "mimeType", "fullText")
+            and value.startswith("'")
+            and operator in ("=", "!=", "contains")
+        ):
+            return ("field", token, operator, _unquote(value))
+        raise ApiError(400, f"Invalid Value: unsupported query term {token} {operator} {value}")
+
+    def matches(self, file: Dict[str, Any], text: str = "") -> bool:
+        return self.tree is None or self._eval(self.tree, file, text)
+
+    def _eval(self, node: Any, file: Dict[str, Any], text: str) -> bool:
+        kind = node[0]
+        if kind == "or":
+            return any(self._eval(term, file, text) for term in node[1])
+        if kind == "and":
+            return all(self._eval(term, file, text) for term in node[1])
+        if kind == "not":
+            return not self._eval(node[1], file, text)
+        return self._eval_term(node, file, text)
+
+    @staticmethod
+    def _eval_term(node: Any, file: Dict[str, Any], text: str) -> bool:
+        kind = node[0]
+        if kind == "parent":
+            return node[1] in file.get("parents", [])
+        if kind == "trashed":
+            return (file.get("trashed", False) == node[2]) == (node[1] == "=")
+        _kind, name, operator, value = node
+        if name == "fullText":
+            return value.lower() in (file["name"] + " " + text).lower()
+        actual = file.get(name, "")
+        if operator == "contains":
+            return value.lower() in actual.lower()
+        return (actual == value) == (operator == "=")
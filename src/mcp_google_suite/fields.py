@@ -0,0 +1,142 @@
+"""Field mask allowlists and presets for partial Google API responses."""
+
+from typing import Dict, FrozenSet, List, Optional, Union
+
+
+FieldsArgument = Optional[Union[str, List[str]]]
+
+PRESETS = ("minimal", "default", "full")
+
+ALLOWED_FIELDS: Dict[str, FrozenSet[str]] = {
+    "drive.file": frozenset(
+        {
+            "id",
+            "name",
+            "mimeType",
+            "description",
+            "webViewLink",
+            "webContentLink",
+            "iconLink",
+            "thumbnailLink",
+            "parents",
+            "createdTime",
+            "modifiedTime",
+            "modifiedByMeTime",
+            "viewedByMeTime",
+            "size",
+            "md5Checksum",
+            "version",
+            "trashed",
+            "starred",
+            "shared",
+            "owners",
+            "lastModifyingUser",
+            "driveId",
+            "capabilities",
+        }
+    ),
+    "docs.document": frozenset(
+        {
+            "documentId",
+            "title",
+            "revisionId",
+            "suggestionsViewMode",
+            "body",
+            "headers",
+            "footers",
+            "footnotes",
+            "documentStyle",
+            "namedStyles",
+            "namedRanges",
+            "lists",
+            "inlineObjects",
+            "positionedObjects",
+            "tabs",
+        }
+    ),
+    "sheets.values": frozenset({"range", "majorDimension", "values"}),
+}
+
+PRESET_FIELDS: Dict[str, Dict[str, str]] = {
+    "drive.file": {
+        "minimal": "id, name",
+        "default": "id, name, mimeType, webViewLink",
+        "full": (
+            "id, name, mimeType, description, webViewLink, parents, createdTime, "
+            "modifiedTime, size, owners, lastModifyingUser, trashed, starred, shared"
+        ),
+    },
+    "docs.document": {
+        "minimal": "documentId, title",
+        "default": "documentId, title, revisionId",
+        "full": "*",
+    },
+    "sheets.values": {
+        "minimal": "values",
+        "default": "values",
+        "full": "range, majorDimension, values",
+    },
+}
+
+
+def split_fields(mask: str) -> List[str]:
+    """Split a field mask on top-level commas, leaving nested selections intact."""
+    parts, depth, current = [], 0, []
+    for char in mask:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth < 0:
+                raise ValueError(f"Unbalanced parentheses in fields: {mask}")
+        if char == "," and depth == 0:
+            parts.append("".join(current).strip())
+            current = []
+        else:
+            current.append(char)
+    if depth != 0:
+        raise ValueError(f"Unbalanced parentheses in fields: {mask}")
+    parts.append("".join(current).strip())
+    return [part for part in parts if part]
+
+
+def top_level_name(selector: str) -> str:
+    """Return the top-level field a selector such as ``owners(emailAddress)`` targets."""
+    for separator in ("(", "/"):
+        selector = selector.split(separator, 1)[0]
+    return selector.strip()
+
+
+def resolve_fields(resource: str, fields: FieldsArgument, default: Optional[str] = None) -> str:
+    """Resolve a caller-supplied preset or field list into a validated field mask.
+
+    ``fields`` may be a preset name, a comma-separated mask or a list of selectors.
+    Unknown top-level fields raise ``ValueError``. ``default`` overrides the
+    resource's default preset when no fields are requested.
+    """
+    presets = PRESET_FIELDS[resource]
+    if not fields:
+        return default or presets["default"]
+
+    if isinstance(fields, str):
+        if fields in presets:
+            return presets[fields]
+        selectors = split_fields(fields)
+    elif isinstance(fields, list) and all(isinstance(field, str) for field in fields):
+        selectors = [selector for field in fields for selector in split_fields(field)]
+    else:
+        raise ValueError("fields must be a preset name, a comma-separated string or a list")
+
+    allowed = ALLOWED_FIELDS[resource]
+    unknown = sorted({top_level_name(s) for s in selectors} - allowed)
+    if unknown:
+        raise ValueError(
+            f"Unsupported fields for {resource}: {', '.join(unknown)}. "
+            f"Use one of the presets ({', '.join(PRESETS)}) or: {', '.join(sorted(allowed))}"
+        )
+    return ", ".join(selectors)
+
+
+def requested_names(mask: str) -> List[str]:
+    """Return the top-level field names selected by a resolved mask."""
+    return [top_level_name(selector) for selector in split_fields(mask)]
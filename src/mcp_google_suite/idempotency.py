@@ -0,0 +1,256 @@
+"""Idempotency keys for write tools: replay a finished call instead of repeating it."""
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from mcp_google_suite.config import IdempotencyConfig
+from mcp_google_suite.localdirs import private_directory
+from mcp_google_suite.singleflight import call_key
+
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_KEY_ARGUMENT = "idempotency_key"
+IDEMPOTENCY_KEY_SCHEMA = {
+    "type": "string",
+    "description": (
+        "Optional client-chosen key; retrying with the same key returns the "
+        "original result instead of writing again"
+    ),
+}
+# How often a process polls for a call another worker process is running
+PENDING_POLL_SECONDS = 0.1
+
+
+class IdempotencyConflictError(ValueError):
+    """Raised when an idempotency key is reused with different arguments."""
+
+
+@dataclass
+class Record:
+    """A completed call: the argument fingerprint it ran with and its result."""
+
+    fingerprint: str
+    result: Any
+    created: float
+
+
+class IdempotencyStore:
+    """Bounded, TTL'd record of in-flight and completed write calls.
+
+    A repeated key joins the original call while it runs and replays its result
+    afterwards. Only successful results are recorded, so a failed call (one
+    that raised or returned ``"success": False``) can be retried with the
+    same key. With a ``directory`` completed results and
+    in-flight markers are also kept on local disk, which covers restarts and
+    the worker processes of one instance.
+    """
+
+    def __init__(self, config: Optional[IdempotencyConfig] = None):
+        self.config = config or IdempotencyConfig()
+        self.enabled = self.config.enabled
+        self.directory = self.config.directory
+        if self.directory:
+            private_directory(self.directory)
+        self._records: "OrderedDict[str, Record]" = OrderedDict()
+        self._inflight: Dict[str, "asyncio.Future[Any]"] = {}
+        self._fingerprints: Dict[str, str] = {}
+        self.counters = {"executed": 0, "replayed": 0, "joined": 0, "conflicts": 0}
+
+    @classmethod
+    def from_config(cls, config: IdempotencyConfig) -> "IdempotencyStore":
+        """Create a store from configuration settings."""
+        return cls(config)
+
+    async def run(
+        self,
+        tool_name: str,
+        key: str,
+        arguments: Dict[str, Any],
+        call: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Run ``call`` once per ``(tool_name, key)`` within the TTL."""
+        if not self.enabled:
+            return await call()
+
+        record_key = f"{tool_name}:{key}"
+        fingerprint = call_key(tool_name, arguments)
+
+        record = self._load(record_key)
+        if record is not None:
+            self._check(record_key, record.fingerprint, fingerprint)
+            self.counters["replayed"] += 1
+            return record.result
+
+        task = self._inflight.get(record_key)
+        if task is not None:
+            self._check(record_key, self._fingerprints[record_key], fingerprint)
+            self.counters["joined"] += 1
+            return await asyncio.shield(task)
+
+        if self.directory and self._pending_elsewhere(record_key):
+            record = await self._wait_elsewhere(record_key)
+            if record is not None:
+                self._check(record_key, record.fingerprint, fingerprint)
+                self.counters["joined"] += 1
+                return record.result
+
+        return await self._execute(record_key, fingerprint, call)
+
+    async def _execute(
+        self, record_key: str, fingerprint: str, call: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        # The call runs as its own task and records its result even if the
+        # client that started it disconnects, so the client's retry can replay it
+        task = asyncio.ensure_future(call())
+        self._inflight[record_key] = task
+        self._fingerprints[record_key] = fingerprint
+        self._mark_pending(record_key)
+        self.counters["executed"] += 1
+        task.add_done_callback(lambda done: self._settle(record_key, fingerprint, done))
+        return await asyncio.shield(task)
+
+    def _settle(self, record_key: str, fingerprint: str, task: "asyncio.Future[Any]") -> None:
+        self._inflight.pop(record_key, None)
+        self._fingerprints.pop(record_key, None)
+        if task.cancelled() or task.exception() is not None or _failed(task.result()):
+            self._clear_pending(record_key)
+            return
+        self._store(record_key, Record(fingerprint, task.result(), time.time()))
+
+    def _check(self, record_key: str, recorded: str, fingerprint: str) -> None:
+        if recorded != fingerprint:
+            self.counters["conflicts"] += 1
+            raise IdempotencyConflictError(
+                f"Idempotency key {record_key.split(':', 1)[1]!r} was already used "
+                "with different arguments"
+            )
+
+    def _expired(self, record: Record) -> bool:
+        return time.time() - record.created > self.config.ttl_seconds
+
+    def _load(self, record_key: str) -> Optional[Record]:
+        record = self._records.get(record_key)
+        if record is None and self.directory:
+            record = self._read_disk(record_key)
+        if record is None:
+            return None
+        if self._expired(record):
+            self._records.pop(record_key, None)
+            return None
+        self._records[record_key] = record
+        self._records.move_to_end(record_key)
+        self._trim_memory()
+        return record
+
+    def _store(self, record_key: str, record: Record) -> None:
+        self._records[record_key] = record
+        self._records.move_to_end(record_key)
+        self._trim_memory()
+        if self.directory:
+            self._write_disk(record_key, record)
+
+    def _trim_memory(self) -> None:
+        while len(self._records) > self.config.max_entries:
+            self._records.popitem(last=False)
+
+    # Local disk persistence
+
+    def _path(self, record_key: str, suffix: str) -> str:
+        digest = hashlib.sha256(record_key.encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.directory, f"{digest}{suffix}")
+
+    def _read_disk(self, record_key: str) -> Optional[Record]:
+        try:
+            with open(self._path(record_key, ".json"), "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return Record(data["fingerprint"], data["result"], data["created"])
+
+    def _write_disk(self, record_key: str, record: Record) -> None:
+        path = self._path(record_key, ".json")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        payload = {
+            "fingerprint": record.fingerprint,
+            "result": record.result,
+            "created": record.created,
+        }
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump(payload, f, default=str)
+            os.replace(tmp_path, path)
+            self._prune_disk()
+        except OSError as e:
+            # The call already succeeded; only a retry from another process would repeat it
+            logger.warning(f"Could not persist idempotency record: {str(e)}")
+        finally:
+            self._clear_pending(record_key)
+
+    def _prune_disk(self) -> None:
+        """Drop expired results and the oldest ones beyond ``max_entries``."""
+        entries = []
+        now = time.time()
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(".json"):
+                    continue
+                mtime = entry.stat().st_mtime
+                if now - mtime > self.config.ttl_seconds:
+                    _remove(entry.path)
+                else:
+                    entries.append((mtime, entry.path))
+        entries.sort()
+        for _mtime, path in entries[: max(0, len(entries) - self.config.max_entries)]:
+            _remove(path)
+
+    def _mark_pending(self, record_key: str) -> None:
+        if self.directory:
+            with open(self._path(record_key, ".pending"), "w") as f:
+                f.write(str(os.getpid()))
+
+    def _clear_pending(self, record_key: str) -> None:
+        if self.directory:
+            _remove(self._path(record_key, ".pending"))
+
+    def _pending_elsewhere(self, record_key: str) -> bool:
+        try:
+            started = os.stat(self._path(record_key, ".pending")).st_mtime
+        except OSError:
+            return False
+        # A marker older than the wait limit belongs to a process that died mid-call
+        return time.time() - started < self.config.wait_seconds
+
+    async def _wait_elsewhere(self, record_key: str) -> Optional[Record]:
+        """Wait for another process to finish the call; None if it failed or vanished."""
+        while self._pending_elsewhere(record_key):
+            await asyncio.sleep(PENDING_POLL_SECONDS)
+        return self._load(record_key)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return store size and executed/replayed/joined/conflict counters."""
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._records),
+            "inflight": len(self._inflight),
+            **self.counters,
+        }
+
+
+def _failed(result: Any) -> bool:
+    """Return True for results that report a failure instead of raising it."""
+    return isinstance(result, dict) and result.get("success") is False
+
+
+def _remove(path: str) -> None:
+    with contextlib.suppress(OSError):
+        os.remove(path)
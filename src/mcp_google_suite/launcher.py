@@ -10,7 +10,9 @@ Usage:
         mcp-google                    # Run server in stdio mode
         mcp-google run               # Same as above
         mcp-google run --mode ws     # Run in WebSocket mode
+        mcp-google run --mode ws --workers 4  # One worker process per core
         mcp-google auth              # Run authentication flow
+        mcp-google bench replay trace.jsonl --rate 20  # Replay recorded tool calls
 
     With MCP Inspector:
         npx @modelcontextprotocol/inspector uv run mcp-google
@@ -19,6 +21,8 @@ Usage:
         SERVER_MODE: stdio|sse|ws    # Override server transport mode
         HOST: str                    # Host for HTTP/WebSocket server
         PORT: int                    # Port for HTTP/WebSocket server
+        WORKERS: int                 # Worker processes for HTTP/WebSocket server
+        MCP_PROFILE_STARTUP: 1       # Same as --profile-startup
 
 Note:
     When using the MCP Inspector, the server automatically uses stdio mode
@@ -29,17 +33,21 @@ Note:
 import argparse
 import asyncio
 import os
-from typing import Dict, List
+import signal
+import sys
+from typing import TYPE_CHECKING, Dict, List
 
-import mcp.server.stdio
-import uvicorn
-from mcp.server import NotificationOptions
-from mcp.server.models import InitializationOptions
-
-from mcp_google_suite.auth.google_auth import GoogleAuth
 from mcp_google_suite.config import Config
-from mcp_google_suite.server import GoogleWorkspaceMCPServer
-from mcp_google_suite.web_app import create_web_app
+from mcp_google_suite.logs import configure_logging
+from mcp_google_suite.startup import StartupProfile, profiling_requested
+
+
+# Transports, the web stack and the Google clients are imported only by the
+# code paths that need them, keeping stdio start-up fast.
+if TYPE_CHECKING:
+    from mcp.server.models import InitializationOptions
+
+    from mcp_google_suite.server import GoogleWorkspaceMCPServer
 
 
 def parse_env_vars(env_vars: List[str]) -> Dict[str, str]:
@@ -55,8 +63,11 @@ def parse_env_vars(env_vars: List[str]) -> Dict[str, str]:
     return result
 
 
-def create_init_options(server: GoogleWorkspaceMCPServer) -> InitializationOptions:
+def create_init_options(server: "GoogleWorkspaceMCPServer") -> "InitializationOptions":
     """Create initialization options for the server."""
+    from mcp.server import NotificationOptions
+    from mcp.server.models import InitializationOptions
+
     return InitializationOptions(
         server_name="mcp-google-suite",
         server_version="0.1.0",
@@ -67,32 +78,90 @@ def create_init_options(server: GoogleWorkspaceMCPServer) -> InitializationOptio
     )
 
 
-async def run_stdio_server(server: GoogleWorkspaceMCPServer):
-    """Run the server in stdio mode."""
-    async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            create_init_options(server),
-        )
+def dump_metrics(server: "GoogleWorkspaceMCPServer", requested: bool = True):
+    """Write the metrics text to the configured dump file, or stderr.
+
+    Without a dump file, metrics go to stderr only when ``requested`` (on
+    SIGUSR1), not on every exit. stdout carries the stdio transport, so
+    metrics never go there.
+    """
+    path = server.config.metrics.dump_path
+    if server.metrics is None or (not path and not requested):
+        return
+    text = server.metrics.render()
+    if not path:
+        sys.stderr.write(text)
+        sys.stderr.flush()
+        return
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+async def run_stdio_server(server: "GoogleWorkspaceMCPServer"):
+    """Run the server in stdio mode.
+
+    Metrics are dumped on SIGUSR1 (where available), and when the session
+    ends if ``metrics.dump_path`` is set.
+    """
+    import mcp.server.stdio
+
+    if hasattr(signal, "SIGUSR1"):
+        asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, dump_metrics, server)
+    try:
+        async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
+            await server.run(
+                read_stream,
+                write_stream,
+                create_init_options(server),
+            )
+    finally:
+        dump_metrics(server, requested=False)
+        server.tracer.flush()
 
 
 def authenticate(config_path: str = None):
     """Run the authentication flow."""
+    from mcp_google_suite.auth.google_auth import GoogleAuth
+
     config = Config.load(config_path)
     auth = GoogleAuth(config)
     asyncio.run(auth.authenticate())
 
 
+def run_workers(config_path: str, host: str, port: int, workers: int):
+    """Serve HTTP/WebSocket from several processes, each building its own app."""
+    import uvicorn
+
+    from mcp_google_suite.web_app import CONFIG_PATH_ENV, WORKERS_ENV
+
+    # Workers are separate processes; hand them the settings through the environment
+    if config_path:
+        os.environ[CONFIG_PATH_ENV] = os.path.abspath(config_path)
+    os.environ[WORKERS_ENV] = str(workers)
+    uvicorn.run(
+        "mcp_google_suite.web_app:create_app",
+        factory=True,
+        host=host,
+        port=port,
+        workers=workers,
+        log_config=None,
+    )
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(description="MCP Google Workspace Server")
     parser.add_argument(
         "command",
         nargs="?",  # Make command optional
-        choices=["run", "auth"],
+        choices=["run", "auth", "bench"],
         default="run",  # Default to "run" if not provided
-        help="Command to execute (run: start server, auth: authenticate)",
+        help=(
+            "Command to execute (run: start server, auth: authenticate, "
+            "bench: load generators, see 'bench replay --help')"
+        ),
     )
     parser.add_argument(
         "--mode",
@@ -106,7 +175,28 @@ def main():
     parser.add_argument(
         "--port", type=int, default=8000, help="Port for HTTP/WebSocket server (default: 8000)"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for HTTP/WebSocket server (default: 1)",
+    )
     parser.add_argument("--config", help="Path to configuration file")
+    parser.add_argument(
+        "--show-tools", action="store_true", help="Log a table of available tools at startup"
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Print an import and initialization time breakdown to stderr",
+    )
+
+    # bench has subcommands and options of its own
+    if sys.argv[1:2] == ["bench"]:
+        from mcp_google_suite.replay import main as bench_main
+
+        bench_main(sys.argv[2:])
+        return
 
     args = parser.parse_args()
 
@@ -114,27 +204,50 @@ def main():
         authenticate(args.config)
         return
 
-    # Create server instance with config if provided
-    server = GoogleWorkspaceMCPServer(config_path=args.config)
-
     # Override mode from environment if not specified in args
     mode = args.mode or os.environ.get("SERVER_MODE", "stdio")
+    workers = args.workers or int(os.environ.get("WORKERS", "1"))
+    host = args.host or os.environ.get("HOST", "0.0.0.0")
+    port = args.port or int(os.environ.get("PORT", "8000"))
+
+    config = Config.load(args.config)
+    configure_logging(config.logging)
+
+    if workers > 1:
+        if mode == "stdio":
+            parser.error("--workers requires --mode sse or ws")
+        run_workers(args.config, host, port, workers)
+        return
+
+    profile = StartupProfile(enabled=profiling_requested(args.profile_startup))
+    with profile.phase("import server"):
+        from mcp_google_suite.server import GoogleWorkspaceMCPServer
+
+    # Create server instance with config if provided
+    with profile.phase("create server"):
+        server = GoogleWorkspaceMCPServer(config=config, show_tools=args.show_tools)
 
     if mode == "stdio":
+        with profile.phase("import stdio transport"):
+            import mcp.server.stdio  # noqa: F401
+        profile.report()
         # Run in STDIO mode using MCP's transport
         asyncio.run(run_stdio_server(server))
     else:
+        with profile.phase("import web app"):
+            import uvicorn
+
+            from mcp_google_suite.web_app import create_web_app
         # Create web app for SSE/WS modes
-        app = create_web_app(server)
-        host = args.host or os.environ.get("HOST", "0.0.0.0")
-        port = args.port or int(os.environ.get("PORT", "8000"))
-        uvicorn.run(app, host=host, port=port)
+        with profile.phase("create web app"):
+            app = create_web_app(server)
+        profile.report()
+        # log_config=None leaves uvicorn's loggers to the queued root handler
+        uvicorn.run(app, host=host, port=port, log_config=None)
 
 
 def run_server():
     """Backward compatibility wrapper around main()."""
-    import sys
-
     # If no arguments provided, default to 'run'
     if len(sys.argv) == 1:
         sys.argv.append("run")
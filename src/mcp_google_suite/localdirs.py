@@ -0,0 +1,42 @@
+"""Private local directories for state shared by the worker processes of one server."""
+
+import os
+import stat
+import tempfile
+
+
+def _user_suffix() -> str:
+    return str(os.getuid()) if hasattr(os, "getuid") else os.environ.get("USERNAME", "user")
+
+
+# Per-user base directory for the defaults used when several workers run
+DEFAULT_SHARED_DIR = os.path.join(tempfile.gettempdir(), f"mcp-google-suite-{_user_suffix()}")
+
+
+def private_directory(path: str) -> str:
+    """Create ``path`` accessible only to the current user, or check that it is.
+
+    The checks matter for directories in a world-writable location such as the
+    temporary directory, where another local user could create the directory
+    first to read or plant tokens and results. Raises PermissionError when
+    ``path`` is a symlink, is owned by another user or is open to others.
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode):
+        raise PermissionError(f"{path} is not a directory")
+    if hasattr(os, "getuid"):
+        if info.st_uid != os.getuid():
+            raise PermissionError(f"{path} is owned by another user")
+        if stat.S_IMODE(info.st_mode) & 0o077:
+            raise PermissionError(
+                f"{path} is accessible to other users (mode "
+                f"{oct(stat.S_IMODE(info.st_mode))}); restrict it to 0o700"
+            )
+    return path
+
+
+def shared_directory(name: str) -> str:
+    """Return the private default directory ``name`` under DEFAULT_SHARED_DIR."""
+    private_directory(DEFAULT_SHARED_DIR)
+    return private_directory(os.path.join(DEFAULT_SHARED_DIR, name))
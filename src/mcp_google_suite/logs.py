@@ -0,0 +1,240 @@
+"""Non-blocking structured logging and bounded summaries of tool arguments."""
+
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, List, Optional, Union
+
+from mcp_google_suite.config import LoggingConfig
+
+
+# Tool call lines have their own logger so their level can be set separately
+call_logger = logging.getLogger("mcp_google_suite.tool_calls")
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+REDACTED = "[redacted]"
+# Per-level limits that keep a summary's cost independent of the payload size
+MAX_STRING_CHARS = 80
+MAX_ITEMS = 5
+MAX_KEYS = 20
+MAX_DEPTH = 3
+# Log record attributes that are not structured fields
+_RECORD_ATTRIBUTES = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+def _shrink(value: Any, redact: List[str], depth: int = 0) -> Any:
+    if isinstance(value, str):
+        if len(value) > MAX_STRING_CHARS:
+            return f"{value[:MAX_STRING_CHARS]}...(+{len(value) - MAX_STRING_CHARS} chars)"
+        return value
+    if isinstance(value, dict):
+        return _shrink_dict(value, redact, depth)
+    if isinstance(value, (list, tuple)):
+        return _shrink_items(value, redact, depth)
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    return _shrink(str(value), redact, depth)
+
+
+def _shrink_dict(value: Dict[Any, Any], redact: List[str], depth: int) -> Any:
+    if depth >= MAX_DEPTH:
+        return f"{{{len(value)} keys}}"
+    shrunk = {}
+    for index, (key, item) in enumerate(value.items()):
+        if index == MAX_KEYS:
+            shrunk["..."] = f"+{len(value) - MAX_KEYS} keys"
+            break
+        name = str(key)
+        if any(word in name.lower() for word in redact):
+            shrunk[name] = REDACTED
+        else:
+            shrunk[name] = _shrink(item, redact, depth + 1)
+    return shrunk
+
+
+def _shrink_items(value: Union[list, tuple], redact: List[str], depth: int) -> Any:
+    if depth >= MAX_DEPTH:
+        return f"[{len(value)} items]"
+    shrunk_items = [_shrink(item, redact, depth + 1) for item in value[:MAX_ITEMS]]
+    if len(value) > MAX_ITEMS:
+        shrunk_items.append(f"...(+{len(value) - MAX_ITEMS} items)")
+    return shrunk_items
+
+
+def summarize(value: Any, max_chars: int = 512, redact: Optional[List[str]] = None) -> str:
+    """Describe tool arguments in at most ``max_chars`` characters.
+
+    Long strings and lists are cut at each level before anything is
+    serialized, so a multi-megabyte payload costs about as much to summarize
+    as a small one. Values of keys containing a ``redact`` word are hidden.
+    """
+    words = [word.lower() for word in (redact or [])]
+    text = json.dumps(_shrink(value, words), ensure_ascii=False, default=str)
+    if len(text) > max_chars:
+        return f"{text[:max_chars]}...(+{len(text) - max_chars} chars)"
+    return text
+
+
+def _fields(record: logging.LogRecord) -> Dict[str, Any]:
+    return {key: value for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with ``extra`` fields as top-level keys."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            **_fields(record),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """The usual text line, followed by ``key=value`` for each ``extra`` field."""
+
+    def __init__(self):
+        super().__init__(TEXT_FORMAT)
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = _fields(record)
+        if not fields:
+            return line
+        pairs = " ".join(f"{key}={value}" for key, value in fields.items())
+        head, newline, rest = line.partition("\n")
+        return f"{head} {pairs}{newline}{rest}"
+
+
+class DeferredQueueHandler(QueueHandler):
+    """Queue records as they are, leaving all formatting to the writer thread.
+
+    The standard handler formats the message before queueing it. Here the
+    caller's thread only enqueues, and a full queue drops the record instead
+    of blocking.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogPipeline:
+    """Root log handler that hands records to a thread writing to a stream."""
+
+    def __init__(self, config: LoggingConfig, stream: Any = None):
+        self.config = config
+        target = logging.StreamHandler(stream or sys.stderr)
+        target.setFormatter(JsonFormatter() if config.format == "json" else TextFormatter())
+        self.queue: "queue.Queue[logging.LogRecord]" = queue.Queue(max(1, config.queue_size))
+        self.handler = DeferredQueueHandler(self.queue)
+        self.listener = QueueListener(self.queue, target, respect_handler_level=True)
+        self.started = False
+
+    def start(self) -> None:
+        root = logging.getLogger()
+        root.setLevel(self.config.level.upper())
+        root.addHandler(self.handler)
+        self.listener.start()
+        self.started = True
+
+    def stop(self) -> None:
+        """Write everything still queued and detach from the root logger."""
+        if self.started:
+            self.started = False
+            logging.getLogger().removeHandler(self.handler)
+            self.listener.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"queued": self.queue.qsize(), "dropped": self.handler.dropped}
+
+
+_pipeline: Optional[LogPipeline] = None
+
+
+def configure_logging(config: LoggingConfig, stream: Any = None) -> LogPipeline:
+    """Route all logging through a queue to a background writer.
+
+    Replaces a pipeline set up earlier in the process. The queue is drained
+    at interpreter exit.
+    """
+    global _pipeline  # noqa: PLW0603 - one pipeline per process
+    if _pipeline is not None:
+        _pipeline.stop()
+    _pipeline = LogPipeline(config, stream)
+    _pipeline.start()
+    atexit.register(_pipeline.stop)
+    return _pipeline
+
+
+class ToolCallLog:
+    """One log line per tool call, with a bounded summary of its arguments.
+
+    Failed calls are always logged at WARNING; successful ones at INFO for a
+    sampled fraction of calls per tool.
+    """
+
+    def __init__(self, config: Optional[LoggingConfig] = None):
+        self.config = config or LoggingConfig()
+        self.logged = 0
+        self.sampled_out = 0
+
+    @classmethod
+    def from_config(cls, config: LoggingConfig) -> "ToolCallLog":
+        """Create a tool call log from configuration settings."""
+        return cls(config)
+
+    def sample_rate(self, tool_name: str) -> float:
+        return self.config.tool_sample_rates.get(tool_name, self.config.tool_sample_rate)
+
+    def finished(
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        started: float,
+        error: Optional[str] = None,
+    ) -> None:
+        """Log a call that began at ``started`` (``time.perf_counter``)."""
+        level = logging.WARNING if error else logging.INFO
+        if not call_logger.isEnabledFor(level):
+            return
+        if not error and random.random() >= self.sample_rate(tool_name):
+            self.sampled_out += 1
+            return
+        self.logged += 1
+        fields = {
+            "tool": tool_name,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+            "outcome": error or "ok",
+            "arguments": summarize(
+                arguments, self.config.max_argument_chars, self.config.redact_keys
+            ),
+        }
+        call_logger.log(level, "tool call %s %s", tool_name, fields["outcome"], extra=fields)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return call log counters and the state of the log queue."""
+        return {
+            "logged": self.logged,
+            "sampled_out": self.sampled_out,
+            "pipeline": _pipeline.stats() if _pipeline is not None else None,
+        }
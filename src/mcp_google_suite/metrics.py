@@ -0,0 +1,241 @@
+"""Low-overhead metrics in the Prometheus text exposition format."""
+
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+LabelValues = Tuple[str, ...]
+Sample = Tuple[str, Dict[str, Any], float]
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, Any]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """A metric family whose series are keyed by label values.
+
+    Updates are plain arithmetic on per-series values without locks; they all
+    happen on the event loop, and a scrape reading a value mid-update at worst
+    sees the previous count.
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+
+    def _labels(self, values: LabelValues) -> Dict[str, Any]:
+        return dict(zip(self.label_names, values, strict=True))
+
+    def samples(self) -> Iterable[Sample]:
+        return ()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for name, labels, value in self.samples():
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        super().__init__(name, help_text, labels)
+        self.values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self) -> Iterable[Sample]:
+        for labels, value in self.values.items():
+            yield self.name, self._labels(labels), value
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) - amount
+
+
+class Histogram(Metric):
+    """Distribution over fixed buckets; an observation is one bisect and two adds."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per series: [count per bucket..., count above the last bucket], sum
+        self.series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1][0] += value
+
+    def samples(self) -> Iterable[Sample]:
+        for labels, (counts, total) in self.series.items():
+            base = self._labels(labels)
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts, strict=True):
+                cumulative += count
+                yield f"{self.name}_bucket", {**base, "le": _format_value(bound)}, cumulative
+            yield f"{self.name}_sum", base, total[0]
+            yield f"{self.name}_count", base, cumulative
+
+
+class Collected(Metric):
+    """Metric whose samples are read from another component at scrape time."""
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        kind: str,
+        read: Callable[[], Iterable[Tuple[Dict[str, Any], float]]],
+    ):
+        super().__init__(name, help_text)
+        self.kind = kind
+        self._read = read
+
+    def samples(self) -> Iterable[Sample]:
+        for labels, value in self._read():
+            yield self.name, labels, value
+
+
+class MetricsRegistry:
+    """Named metric families rendered together."""
+
+    def __init__(self, prefix: str = "mcp_google_suite"):
+        self.prefix = prefix
+        self._metrics: Dict[str, Metric] = {}
+
+    def _add(self, metric: Metric) -> Any:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(f"{self.prefix}_{name}", help_text, labels))
+
+    def gauge(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Gauge:
+        return self._add(Gauge(f"{self.prefix}_{name}", help_text, labels))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._add(Histogram(f"{self.prefix}_{name}", help_text, labels, buckets))
+
+    def collect(
+        self,
+        name: str,
+        help_text: str,
+        kind: str,
+        read: Callable[[], Iterable[Tuple[Dict[str, Any], float]]],
+    ) -> None:
+        """Register a metric computed from component statistics when rendered."""
+        self._add(Collected(f"{self.prefix}_{name}", help_text, kind, read))
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class ServerMetrics:
+    """Metrics for tool calls and upstream Google API requests."""
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        self.registry = registry or MetricsRegistry()
+        registry = self.registry
+        self.tool_latency = registry.histogram(
+            "tool_call_duration_seconds", "Tool call latency including queueing", ["tool"]
+        )
+        self.tool_in_flight = registry.gauge(
+            "tool_calls_in_flight", "Tool calls currently running", ["tool"]
+        )
+        self.tool_errors = registry.counter(
+            "tool_call_errors_total", "Tool calls that raised an error", ["tool", "error"]
+        )
+        self.upstream_latency = registry.histogram(
+            "upstream_request_duration_seconds",
+            "Google API request latency",
+            ["service", "method", "status"],
+        )
+        self.upstream_sent = registry.counter(
+            "upstream_sent_bytes_total", "Request body bytes sent to Google APIs", ["service"]
+        )
+        self.upstream_received = registry.counter(
+            "upstream_received_bytes_total",
+            "Response body bytes received from Google APIs",
+            ["service"],
+        )
+
+    def tool_started(self, tool_name: str) -> float:
+        """Count a tool call as in flight and return its start time."""
+        self.tool_in_flight.inc(tool_name)
+        return time.perf_counter()
+
+    def tool_finished(self, tool_name: str, started: float, error: Optional[str] = None):
+        """Record a finished tool call."""
+        self.tool_in_flight.dec(tool_name)
+        self.tool_latency.observe(time.perf_counter() - started, tool_name)
+        if error is not None:
+            self.tool_errors.inc(tool_name, error)
+
+    def upstream(  # noqa: PLR0913 - one argument per recorded dimension
+        self,
+        service: str,
+        method: str,
+        status: Any,
+        seconds: float,
+        sent: int = 0,
+        received: int = 0,
+    ) -> None:
+        """Record one request to a Google API."""
+        self.upstream_latency.observe(seconds, service, method, str(status))
+        if sent:
+            self.upstream_sent.inc(service, amount=sent)
+        if received:
+            self.upstream_received.inc(service, amount=received)
+
+    def render(self) -> str:
+        return self.registry.render()
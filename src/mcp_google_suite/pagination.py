@@ -0,0 +1,269 @@
+"""Result-size budget for large reads, with continuation tokens for the rest."""
+
+import contextlib
+import json
+import logging
+import os
+import re
+import secrets
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Union
+
+from mcp_google_suite.config import PaginationConfig
+from mcp_google_suite.localdirs import private_directory
+
+
+logger = logging.getLogger(__name__)
+
+# Tools whose results are split, and the field that is cut: text at paragraph
+# (line) boundaries, sheet values at row boundaries
+PAGED_FIELDS = {
+    "docs_get_content": "content",
+    "docs_get_section": "content",
+    "sheets_get_values": "values",
+}
+MAX_RESULT_CHARS_ARGUMENT = "max_result_chars"
+MAX_RESULT_CHARS_SCHEMA = {
+    "type": "integer",
+    "description": (
+        "Largest result to return in one call, in characters; the rest is "
+        "returned by fetch_more with the continuation_token"
+    ),
+}
+_SPILL_ID = re.compile(r"^[A-Za-z0-9_-]+$")
+
+
+@dataclass
+class Spill:
+    """The part of a result that did not fit in the first page."""
+
+    field: str
+    data: Union[str, List[Any]]
+    meta: Dict[str, Any]
+    offset: int
+    created: float
+    size: int = 0
+
+
+def _row_size(row: Any) -> int:
+    return len(json.dumps(row, ensure_ascii=False, default=str)) + 1
+
+
+def cut(data: Union[str, List[Any]], start: int, budget: int) -> int:
+    """Return where a page starting at ``start`` ends within ``budget`` characters.
+
+    Text is cut after the last line break that fits and rows after the last
+    whole row. A page always makes progress, so a single paragraph or row
+    larger than the budget is returned on its own (text is then cut hard).
+    """
+    if isinstance(data, str):
+        if len(data) - start <= budget:
+            return len(data)
+        end = start + budget
+        newline = data.rfind("\n", start, end)
+        return newline + 1 if newline >= start else end
+
+    used = 0
+    for index in range(start, len(data)):
+        used += _row_size(data[index])
+        if used > budget and index > start:
+            return index
+    return len(data)
+
+
+class SpillStore:
+    """Bounded, TTL'd store for the remainders of oversized results.
+
+    Spills are kept in memory up to ``max_entries`` and ``max_bytes``, oldest
+    evicted first. With a ``directory`` they are written to local disk
+    instead, where worker processes of one instance can read each other's.
+    """
+
+    def __init__(self, config: Optional[PaginationConfig] = None):
+        self.config = config or PaginationConfig()
+        self.directory = self.config.directory
+        if self.directory:
+            private_directory(self.directory)
+        self._spills: "OrderedDict[str, Spill]" = OrderedDict()
+        self.bytes = 0
+
+    def put(self, spill: Spill) -> Optional[str]:
+        """Keep ``spill`` and return its ID, or None if it is larger than the store."""
+        if spill.size == 0:
+            spill.size = (
+                len(spill.data)
+                if isinstance(spill.data, str)
+                else sum(_row_size(row) for row in spill.data)
+            )
+        spill_id = secrets.token_urlsafe(16)
+        if self.directory:
+            self._write_disk(spill_id, spill)
+            return spill_id
+        if spill.size > self.config.max_bytes:
+            return None
+        self._evict(spill.size)
+        self._spills[spill_id] = spill
+        self.bytes += spill.size
+        return spill_id
+
+    def get(self, spill_id: str) -> Optional[Spill]:
+        if not _SPILL_ID.match(spill_id):
+            return None
+        spill = self._read_disk(spill_id) if self.directory else self._spills.get(spill_id)
+        if spill is None or self._expired(spill):
+            return None
+        return spill
+
+    def _expired(self, spill: Spill) -> bool:
+        return time.time() - spill.created > self.config.ttl_seconds
+
+    def _evict(self, incoming: int) -> None:
+        """Drop expired spills, then the oldest until ``incoming`` bytes fit."""
+        for spill_id in [key for key, spill in self._spills.items() if self._expired(spill)]:
+            self.bytes -= self._spills.pop(spill_id).size
+        while self._spills and (
+            len(self._spills) >= self.config.max_entries
+            or self.bytes + incoming > self.config.max_bytes
+        ):
+            self.bytes -= self._spills.popitem(last=False)[1].size
+
+    # Local disk persistence
+
+    def _path(self, spill_id: str) -> str:
+        return os.path.join(self.directory, f"{spill_id}.json")
+
+    def _read_disk(self, spill_id: str) -> Optional[Spill]:
+        try:
+            with open(self._path(spill_id), "r") as f:
+                return Spill(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def _write_disk(self, spill_id: str, spill: Spill) -> None:
+        path = self._path(spill_id)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(vars(spill), f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, path)
+        self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        """Drop expired spills and the oldest ones beyond ``max_entries``."""
+        entries = []
+        now = time.time()
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(".json"):
+                    continue
+                mtime = entry.stat().st_mtime
+                if now - mtime > self.config.ttl_seconds:
+                    _remove(entry.path)
+                else:
+                    entries.append((mtime, entry.path))
+        entries.sort()
+        for _mtime, path in entries[: max(0, len(entries) - self.config.max_entries)]:
+            _remove(path)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the number and size of spills held in memory."""
+        return {"entries": len(self._spills), "bytes": self.bytes, "directory": self.directory}
+
+
+class ResultPager:
+    """Cut oversized tool results to a budget and serve the rest by token.
+
+    The first page keeps the shape of the original result, with
+    ``truncated``, ``continuation_token`` and ``remaining`` (characters or
+    rows) added. Each token resolves to the next page without calling Google
+    again, for as long as the spill is kept.
+    """
+
+    def __init__(self, config: Optional[PaginationConfig] = None):
+        self.config = config or PaginationConfig()
+        self.enabled = self.config.enabled
+        self.store = SpillStore(self.config)
+        self.counters = {"paginated": 0, "fetched": 0, "expired": 0, "too_large": 0}
+
+    @classmethod
+    def from_config(cls, config: PaginationConfig) -> "ResultPager":
+        """Create a pager from configuration settings."""
+        return cls(config)
+
+    def budget(self, max_chars: Any = None) -> int:
+        if max_chars is None:
+            return self.config.max_result_chars
+        if isinstance(max_chars, bool) or not isinstance(max_chars, int) or max_chars < 1:
+            raise ValueError(f"{MAX_RESULT_CHARS_ARGUMENT} must be a positive integer")
+        return max_chars
+
+    def paginate(self, tool_name: str, result: Any, max_chars: Any = None) -> Any:
+        """Return ``result``, or its first page when the paged field is over budget."""
+        field = PAGED_FIELDS.get(tool_name)
+        budget = self.budget(max_chars)
+        if not self.enabled or field is None or not isinstance(result, dict):
+            return result
+        data = result.get(field)
+        if not isinstance(data, (str, list)):
+            return result
+        end = cut(data, 0, budget)
+        if end >= len(data):
+            return result
+
+        meta = {
+            key: value
+            for key, value in result.items()
+            if key != field and isinstance(value, (str, int, float, bool))
+        }
+        spill_id = self.store.put(Spill(field, data[end:], meta, end, time.time()))
+        self.counters["paginated"] += 1
+        page = {**result, field: data[:end]}
+        if spill_id is None:
+            self.counters["too_large"] += 1
+            logger.warning(f"{tool_name} result too large to keep; returning the first page only")
+            return {**page, "truncated": True, "remaining": len(data) - end}
+        logger.debug(f"{tool_name} result cut at {end} of {len(data)}; spilled as {spill_id}")
+        return {**page, **_continuation(spill_id, 0, len(data) - end)}
+
+    def fetch(self, token: str, max_chars: Any = None) -> Dict[str, Any]:
+        """Return the page a continuation token points at."""
+        budget = self.budget(max_chars)
+        spill_id, _, position = str(token).rpartition(".")
+        if not spill_id or not position.isdigit():
+            raise ValueError("Invalid continuation_token")
+
+        spill = self.store.get(spill_id)
+        if spill is None:
+            self.counters["expired"] += 1
+            raise ValueError(
+                "continuation_token has expired or is unknown; call the original tool again"
+            )
+        start = int(position)
+        if start >= len(spill.data):
+            raise ValueError("Invalid continuation_token")
+
+        end = cut(spill.data, start, budget)
+        self.counters["fetched"] += 1
+        page = {**spill.meta, spill.field: spill.data[start:end], "offset": spill.offset + start}
+        if end < len(spill.data):
+            return {**page, **_continuation(spill_id, end, len(spill.data) - end)}
+        return {**page, "truncated": False}
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pagination counters and the size of the spill store."""
+        return {"enabled": self.enabled, **self.counters, "store": self.store.stats()}
+
+
+def _continuation(spill_id: str, position: int, remaining: int) -> Dict[str, Any]:
+    return {
+        "truncated": True,
+        "continuation_token": f"{spill_id}.{position}",
+        "remaining": remaining,
+    }
+
+
+def _remove(path: str) -> None:
+    with contextlib.suppress(OSError):
+        os.remove(path)
@@ -0,0 +1,259 @@
+"""Sampling profiles of live instances: sampled tool calls and on-demand process captures."""
+
+import asyncio
+import contextlib
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from mcp_google_suite.config import ProfilingConfig
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE_DIR = os.path.join(tempfile.gettempdir(), "mcp-google-suite-profiles")
+# Fraction of tool calls to profile, overriding ``profiling.sample_rate``
+PROFILE_TOOLS_ENV = "MCP_PROFILE_TOOLS"
+MAX_CAPTURE_SECONDS = 120.0
+TOP_ENTRIES = 25
+
+
+def _frame_name(code: Any, lineno: int) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{lineno})"
+
+
+def _fold(frames: Iterable[Any]) -> str:
+    """Collapse frames, outermost first, into one ``a;b;c`` flame graph line."""
+    return ";".join(_frame_name(frame.f_code, frame.f_lineno) for frame in frames)
+
+
+def _thread_stack(frame: Any) -> List[Any]:
+    stack = []
+    while frame is not None:
+        stack.append(frame)
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+def _await_chain(coro: Any) -> List[Any]:
+    """Frames of a task's coroutine and everything it is awaiting, outermost first.
+
+    ``Task.get_stack`` stops at the outer frame of a suspended coroutine;
+    following ``cr_await`` reaches the call that is actually waiting.
+    """
+    stack = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            break
+        stack.append(frame)
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return stack
+
+
+def write_folded(path: str, stacks: "Counter[str]") -> None:
+    """Write stacks in the folded format read by flamegraph.pl and speedscope."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for stack, count in stacks.most_common():
+            f.write(f"{stack} {count}\n")
+    os.replace(tmp_path, path)
+
+
+class Sampler:
+    """Background thread that samples stacks at a fixed interval.
+
+    The profiled code is never instrumented; each tick the thread reads the
+    frames it was asked to watch, so the cost is bounded by the sampling rate
+    and paid off the event loop.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        # Held while a tick runs, so a watcher is never called after unwatch returns
+        self._tick = threading.Lock()
+        self._watchers: Dict[str, Callable[[], None]] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def watch(self, key: str, sample: Callable[[], None]) -> None:
+        with self._lock:
+            self._watchers[key] = sample
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="Sampler", daemon=True)
+                self._thread.start()
+
+    def unwatch(self, key: str) -> None:
+        with self._lock:
+            self._watchers.pop(key, None)
+        with self._tick:
+            pass
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                watchers = list(self._watchers.values())
+                if not watchers:
+                    self._thread = None
+                    return
+            with self._tick:
+                for sample in watchers:
+                    # A stack that changes mid-read is skipped for this tick
+                    with contextlib.suppress(Exception):
+                        sample()
+
+
+class Profiler:
+    """Profiles a sampled fraction of tool calls and captures whole-process profiles.
+
+    A tool call profile samples the await chain of the task running the call,
+    so it attributes wall time, including time spent waiting on Google, to the
+    code that waited. Profiles are written in the folded stack format.
+    """
+
+    def __init__(self, config: Optional[ProfilingConfig] = None):
+        self.config = config or ProfilingConfig()
+        self.sample_rate = self.config.sample_rate
+        override = os.environ.get(PROFILE_TOOLS_ENV)
+        if override:
+            try:
+                self.sample_rate = float(override)
+            except ValueError:
+                logger.warning(f"Ignoring invalid {PROFILE_TOOLS_ENV}={override!r}")
+        self.sample_rate = min(1.0, max(0.0, self.sample_rate))
+        self.directory = os.path.expanduser(self.config.directory or DEFAULT_PROFILE_DIR)
+        self.sampler = Sampler(self.config.interval_seconds)
+        self._capturing = False
+        self.counters = {"calls_profiled": 0, "captures": 0, "write_errors": 0}
+
+    @classmethod
+    def from_config(cls, config: ProfilingConfig) -> "Profiler":
+        """Create a profiler from configuration settings."""
+        return cls(config)
+
+    def sample(self) -> bool:
+        """Decide whether to profile the next tool call."""
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def run(self, tool_name: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``call`` while sampling the current task and write its profile."""
+        task = asyncio.current_task()
+        stacks: "Counter[str]" = Counter()
+        key = uuid.uuid4().hex[:12]
+
+        def sample() -> None:
+            frames = _await_chain(task.get_coro())
+            if frames:
+                stacks[_fold(frames)] += 1
+
+        started = time.time()
+        self.sampler.watch(key, sample)
+        try:
+            return await call()
+        finally:
+            self.sampler.unwatch(key)
+            self.counters["calls_profiled"] += 1
+            stamp = time.strftime("%Y%m%dT%H%M%S", time.localtime(started))
+            name = f"{stamp}-{tool_name}-{key}.folded"
+            await asyncio.to_thread(self._save, name, stacks)
+
+    def _save(self, name: str, stacks: "Counter[str]") -> None:
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            write_folded(os.path.join(self.directory, name), stacks)
+            self._prune()
+        except OSError as e:
+            self.counters["write_errors"] += 1
+            logger.warning(f"Could not write profile {name}: {str(e)}")
+
+    def _prune(self) -> None:
+        """Keep only the newest ``max_profiles`` files."""
+        with os.scandir(self.directory) as it:
+            entries = sorted((entry.stat().st_mtime, entry.path) for entry in it)
+        for _mtime, path in entries[: max(0, len(entries) - self.config.max_profiles)]:
+            with contextlib.suppress(OSError):
+                os.remove(path)
+
+    async def capture(self, seconds: float) -> Dict[str, Any]:
+        """Sample every thread for ``seconds`` and take a tracemalloc snapshot.
+
+        Memory figures only cover allocations made while the capture runs,
+        unless tracemalloc was already tracing (``PYTHONTRACEMALLOC``).
+        """
+        if self._capturing:
+            raise ValueError("A profile capture is already running")
+        seconds = min(max(seconds, self.config.interval_seconds), MAX_CAPTURE_SECONDS)
+        self._capturing = True
+        stacks: "Counter[str]" = Counter()
+
+        def sample() -> None:
+            sampler_thread = threading.get_ident()
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != sampler_thread:
+                    stacks[_fold(_thread_stack(frame))] += 1
+
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        key = f"capture-{uuid.uuid4().hex[:12]}"
+        self.sampler.watch(key, sample)
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            self.sampler.unwatch(key)
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            if started_tracing:
+                tracemalloc.stop()
+            self._capturing = False
+        self.counters["captures"] += 1
+
+        stamp = time.strftime("%Y%m%dT%H%M%S")
+        files = {
+            "profile": os.path.join(self.directory, f"{stamp}-process-{key[8:]}.folded"),
+            "memory": os.path.join(self.directory, f"{stamp}-process-{key[8:]}.tracemalloc"),
+        }
+
+        def save() -> List[Any]:
+            os.makedirs(self.directory, exist_ok=True)
+            write_folded(files["profile"], stacks)
+            snapshot.dump(files["memory"])
+            return snapshot.statistics("lineno")[:TOP_ENTRIES]
+
+        top_memory = await asyncio.to_thread(save)
+        return {
+            "seconds": seconds,
+            "samples": sum(stacks.values()),
+            "top_stacks": [
+                {"stack": stack, "samples": count}
+                for stack, count in stacks.most_common(TOP_ENTRIES)
+            ],
+            "memory": {
+                "current_bytes": current,
+                "peak_bytes": peak,
+                "top": [
+                    {"location": str(stat.traceback[0]), "bytes": stat.size, "count": stat.count}
+                    for stat in top_memory
+                ],
+            },
+            "files": files,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the sampling settings and profile counters."""
+        return {
+            "sample_rate": self.sample_rate,
+            "directory": self.directory,
+            "capturing": self._capturing,
+            **self.counters,
+        }
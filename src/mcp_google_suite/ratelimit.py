@@ -0,0 +1,214 @@
+"""Client-side quota enforcement and retry with backoff for Google API calls."""
+
+import asyncio
+import logging
+import math
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from mcp_google_suite import tracing
+from mcp_google_suite.config import QuotaConfig, RateLimitConfig
+
+
+logger = logging.getLogger(__name__)
+
+READ, WRITE = "read", "write"
+# HTTP methods whose effect does not change when a request is repeated
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE"})
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Google also reports rate limiting as 403 with one of these reasons
+FORBIDDEN = 403
+RATE_LIMIT_REASONS = ("ratelimitexceeded", "userratelimitexceeded")
+
+
+class RateLimitedError(Exception):
+    """Raised when a call would wait longer than allowed for quota."""
+
+    def __init__(self, service_name: str, kind: str, wait: float):
+        super().__init__(
+            f"Client-side {service_name} {kind} quota exhausted; "
+            f"next slot in {wait:.1f} seconds"
+        )
+        self.wait = wait
+        self.retry_after = max(1, math.ceil(wait))
+
+
+class TokenBucket:
+    """Token bucket that hands out reservations instead of polling.
+
+    A caller takes its tokens immediately, possibly driving the balance
+    negative, and sleeps for as long as the deficit takes to refill. This
+    keeps waiters in arrival order without a queue.
+    """
+
+    def __init__(self, per_minute: float, burst_seconds: float, clock: Callable[[], float]):
+        self.rate = max(per_minute, 1e-9) / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+
+    def reserve(self, count: int, max_wait: float) -> Optional[float]:
+        """Take ``count`` tokens and return the seconds to wait, or None if too long."""
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+        wait = max(0.0, (count - self.tokens) / self.rate)
+        if wait > max_wait:
+            return None
+        self.tokens -= count
+        return wait
+
+
+def is_idempotent(request: Any) -> bool:
+    """Return True for requests that can be repeated without a different effect."""
+    return getattr(request, "method", "GET").upper() in IDEMPOTENT_METHODS
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Read a ``Retry-After`` header (seconds or HTTP date) from an HttpError."""
+    resp = getattr(error, "resp", None)
+    value = resp.get("retry-after") if hasattr(resp, "get") else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error: Exception) -> bool:
+    """Return True for throttling and transient server errors."""
+    status = getattr(getattr(error, "resp", None), "status", None)
+    if status in RETRYABLE_STATUSES:
+        return True
+    if status == FORBIDDEN:
+        content = getattr(error, "content", b"") or b""
+        if isinstance(content, bytes):
+            content = content.decode("utf-8", "replace")
+        return any(reason in content.lower() for reason in RATE_LIMIT_REASONS)
+    return False
+
+
+class RateLimiter:
+    """Per-API, per-credential token buckets plus the retry policy for API calls.
+
+    Buckets follow the published per-minute read and write quotas of each API;
+    APIs without a configured quota are not throttled.
+    """
+
+    def __init__(
+        self,
+        config: Optional[RateLimitConfig] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Any] = asyncio.sleep,
+    ):
+        self.config = config or RateLimitConfig()
+        self.enabled = self.config.enabled
+        self._clock = clock
+        self._sleep = sleep
+        self._buckets: Dict[Tuple[str, str, str], TokenBucket] = {}
+        self.counters: Dict[str, Dict[str, int]] = {}
+
+    @classmethod
+    def from_config(cls, config: RateLimitConfig) -> "RateLimiter":
+        """Create a limiter from configuration settings."""
+        return cls(config)
+
+    def _count(self, service_name: str, counter: str, amount: int = 1) -> None:
+        counters = self.counters.setdefault(
+            service_name, {"calls": 0, "throttled": 0, "retried": 0, "dropped": 0}
+        )
+        counters[counter] += amount
+
+    def _bucket(self, service_name: str, credential: str, kind: str) -> Optional[TokenBucket]:
+        quota: Optional[QuotaConfig] = self.config.quotas.get(service_name)
+        if quota is None:
+            return None
+        key = (service_name, credential, kind)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            per_minute = quota.read_per_minute if kind == READ else quota.write_per_minute
+            bucket = TokenBucket(per_minute, self.config.burst_seconds, self._clock)
+            self._buckets[key] = bucket
+        return bucket
+
+    async def acquire(self, service_name: str, credential: str, kind: str, count: int = 1):
+        """Wait for ``count`` quota tokens, raising ``RateLimitedError`` if the wait is too long."""
+        if not self.enabled:
+            return
+        self._count(service_name, "calls", count)
+        bucket = self._bucket(service_name, credential, kind)
+        if bucket is None:
+            return
+
+        wait = bucket.reserve(count, self.config.max_wait_seconds)
+        if wait is None:
+            self._count(service_name, "dropped", count)
+            raise RateLimitedError(service_name, kind, (count - bucket.tokens) / bucket.rate)
+        if wait > 0:
+            self._count(service_name, "throttled", count)
+            logger.debug(f"Throttling {service_name} {kind} call for {wait:.2f}s")
+            with tracing.span("quota.wait", service=service_name, kind=kind):
+                await self._sleep(wait)
+
+    def backoff(self, attempt: int, error: Exception) -> Optional[float]:
+        """Return the delay before retry ``attempt`` (0-based), or None to give up.
+
+        Full-jitter exponential backoff, never shorter than the server's
+        ``Retry-After`` and never longer than the configured maximum wait.
+        """
+        config = self.config
+        if attempt >= config.max_retries:
+            return None
+        ceiling = min(config.backoff_max_seconds, config.backoff_base_seconds * 2**attempt)
+        delay = random.uniform(0, ceiling)
+        hinted = retry_after_seconds(error)
+        if hinted is not None:
+            delay = max(delay, hinted)
+        return delay if delay <= config.max_wait_seconds else None
+
+    async def call(
+        self,
+        service_name: str,
+        credential: str,
+        kind: str,
+        send: Callable[[], Any],
+        retry: bool,
+    ) -> Any:
+        """Run ``send`` under quota, retrying throttled or transient failures if allowed."""
+        attempt = 0
+        while True:
+            await self.acquire(service_name, credential, kind)
+            try:
+                return await send()
+            except Exception as error:
+                if not (self.enabled and retry and is_retryable(error)):
+                    raise
+                delay = self.backoff(attempt, error)
+                if delay is None:
+                    self._count(service_name, "dropped")
+                    raise
+                self._count(service_name, "retried")
+                logger.debug(f"Retrying {service_name} call in {delay:.2f}s after: {error}")
+                with tracing.span("retry.backoff", service=service_name, attempt=attempt + 1):
+                    await self._sleep(delay)
+                attempt += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return call counters per API and the current bucket balances."""
+        return {
+            "enabled": self.enabled,
+            "services": {name: dict(counters) for name, counters in self.counters.items()},
+            "buckets": {
+                f"{service}:{kind}:{credential}": round(bucket.tokens, 2)
+                for (service, credential, kind), bucket in self._buckets.items()
+            },
+        }
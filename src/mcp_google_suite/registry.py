@@ -0,0 +1,53 @@
+"""Immutable registry of MCP tool definitions and their handlers."""
+
+import hashlib
+import json
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Dict, Iterable, Mapping, Optional, Tuple
+
+import mcp.types as types
+
+
+ToolHandler = Callable[[Any, dict], Awaitable[Dict[str, Any]]]
+
+
+class ToolRegistry:
+    """Tool schemas, handlers and the pre-serialized ``/tools`` payload.
+
+    Built once at startup; lookups are plain dictionary reads and the JSON
+    payload and its ETag never change for the lifetime of the process.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[types.Tool, ToolHandler]]):
+        entries = list(entries)
+        self.tools: Tuple[types.Tool, ...] = tuple(tool for tool, _handler in entries)
+        self.handlers: Mapping[str, ToolHandler] = MappingProxyType(
+            {tool.name: handler for tool, handler in entries}
+        )
+        self.names: Tuple[str, ...] = tuple(self.handlers)
+        self._schemas: Mapping[str, types.Tool] = MappingProxyType(
+            {tool.name: tool for tool in self.tools}
+        )
+
+        listing = [
+            {"name": tool.name, "description": tool.description, "inputSchema": tool.inputSchema}
+            for tool in self.tools
+        ]
+        self.payload: bytes = json.dumps(
+            {"tools": listing}, separators=(",", ":"), ensure_ascii=False
+        ).encode("utf-8")
+        self.etag = f'"{hashlib.sha256(self.payload).hexdigest()[:32]}"'
+
+    def get(self, name: str) -> Optional[ToolHandler]:
+        """Return the handler registered for a tool name."""
+        return self.handlers.get(name)
+
+    def schema(self, name: str) -> Optional[types.Tool]:
+        """Return the tool definition for a tool name."""
+        return self._schemas.get(name)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.handlers
+
+    def __len__(self) -> int:
+        return len(self.handlers)
@@ -0,0 +1,420 @@
+"""Replay captured tool call traces against a server: ``mcp-google-suite bench replay``.
+
+A trace is a JSON lines file with one tool call per line::
+
+    {"timestamp": "2024-06-10T09:00:00.250Z", "tool_name": "docs_get_content",
+     "params": {"document_id": "..."}}
+
+``timestamp`` may be epoch seconds or ISO 8601, or ``offset`` may give seconds
+since the start of the trace; ``tool``/``name`` and ``arguments`` are accepted
+for the tool name and parameters. Calls are sent open loop: each goes out at
+its scheduled time whether or not earlier calls have finished, so a slow
+server shows up as latency rather than as a lower request rate.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import zlib
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional
+
+
+TOOL_KEYS = ("tool_name", "tool", "name")
+PARAM_KEYS = ("params", "arguments")
+# Trace IDs that --fake maps onto seeded files, by the kind of file they name
+FAKE_ID_PARAMS = {
+    "document_id": "documents",
+    "file_id": "documents",
+    "file_ids": "documents",
+    "spreadsheet_id": "spreadsheets",
+}
+FAKE_FOLDER_PARAMS = ("parent_id", "new_parent_id")
+THROTTLED = 429
+# Statuses recorded for calls that never got an HTTP response
+TRANSPORT_ERROR = 0
+DROPPED = -1
+
+Send = Callable[[str, Dict[str, Any]], Awaitable[int]]
+
+
+@dataclass
+class TraceCall:
+    """One recorded tool call and when it was made, relative to the first call."""
+
+    offset: float
+    tool_name: str
+    params: Dict[str, Any]
+
+
+@dataclass
+class Outcome:
+    """What happened to one replayed call."""
+
+    tool_name: str
+    status: int
+    latency_ms: float
+    lag_ms: float
+    warmup: bool
+
+
+def _timestamp(value: Any) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+
+
+def load_trace(path: str) -> List[TraceCall]:
+    """Read a trace, ordered by time, with offsets relative to its first call.
+
+    Lines without a time are sent together with the call before them; a trace
+    without any times can only be replayed at a fixed rate.
+    """
+    calls = []
+    times: List[Optional[float]] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{number}: invalid JSON: {e.msg}") from e
+            tool_name = next((entry[key] for key in TOOL_KEYS if key in entry), None)
+            if not isinstance(tool_name, str):
+                raise ValueError(f"{path}:{number}: no tool name ({', '.join(TOOL_KEYS)})")
+            params = next((entry[key] for key in PARAM_KEYS if key in entry), None) or {}
+            try:
+                if "offset" in entry:
+                    at: Optional[float] = float(entry["offset"])
+                elif "timestamp" in entry:
+                    at = _timestamp(entry["timestamp"])
+                else:
+                    at = None
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"{path}:{number}: invalid time") from e
+            calls.append(TraceCall(0.0, tool_name, params))
+            times.append(at)
+
+    previous = next((at for at in times if at is not None), 0.0)
+    for call, at in zip(calls, times, strict=True):
+        previous = at if at is not None else previous
+        call.offset = previous
+    calls.sort(key=lambda call: call.offset)
+    start = calls[0].offset if calls else 0.0
+    for call in calls:
+        call.offset -= start
+    return calls
+
+
+def schedule(
+    calls: List[TraceCall], speed: float = 1.0, rate: Optional[float] = None, repeat: int = 1
+) -> List[float]:
+    """Return the send time of every call, in seconds after the replay starts.
+
+    With ``rate`` calls go out at that fixed rate regardless of the trace's
+    timing; otherwise the original gaps are divided by ``speed``. Repeats follow
+    each other, a gap of one average interval apart.
+    """
+    if rate is not None:
+        return [index / rate for index in range(len(calls) * repeat)]
+    span = calls[-1].offset / speed if calls else 0.0
+    gap = span / max(1, len(calls) - 1)
+    return [
+        round_number * (span + gap) + call.offset / speed
+        for round_number in range(repeat)
+        for call in calls
+    ]
+
+
+def remap_ids(params: Dict[str, Any], seeded: Dict[str, List[str]]) -> Dict[str, Any]:
+    """Point the file IDs of a recorded call at files seeded in the fake backend.
+
+    The same recorded ID always maps to the same fake file, so a trace keeps
+    its pattern of repeated reads and writes.
+    """
+
+    def fake_id(value: Any, pool: List[str]) -> Any:
+        if not isinstance(value, str) or not pool:
+            return value
+        return pool[zlib.crc32(value.encode("utf-8")) % len(pool)]
+
+    remapped = dict(params)
+    for key, kind in FAKE_ID_PARAMS.items():
+        if key in remapped:
+            value = remapped[key]
+            if isinstance(value, list):
+                remapped[key] = [fake_id(item, seeded[kind]) for item in value]
+            else:
+                remapped[key] = fake_id(value, seeded[kind])
+    for key in FAKE_FOLDER_PARAMS:
+        if remapped.get(key):
+            remapped[key] = "root"
+    return remapped
+
+
+async def replay(
+    calls: List[TraceCall],
+    send_at: List[float],
+    send: Send,
+    warmup_seconds: float = 0.0,
+    max_in_flight: int = 1000,
+) -> Dict[str, Any]:
+    """Send every call at its scheduled time and collect the outcomes.
+
+    Calls scheduled within the first ``warmup_seconds`` are sent but left out
+    of the figures. A call due while ``max_in_flight`` calls are outstanding is
+    dropped and counted, rather than delayed.
+    """
+    loop = asyncio.get_running_loop()
+    outcomes: List[Outcome] = []
+    tasks = set()
+    in_flight = 0
+    peak_in_flight = 0
+
+    async def run(call: TraceCall, due: float, warmup: bool) -> None:
+        nonlocal in_flight
+        sent = loop.time()
+        try:
+            status = await send(call.tool_name, call.params)
+        except Exception:
+            status = TRANSPORT_ERROR
+        finally:
+            in_flight -= 1
+        latency = (loop.time() - sent) * 1000
+        outcomes.append(Outcome(call.tool_name, status, latency, (sent - due) * 1000, warmup))
+
+    started = loop.time()
+    for index, at in enumerate(send_at):
+        call = calls[index % len(calls)]
+        due = started + at
+        delay = due - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        warmup = at < warmup_seconds
+        if in_flight >= max_in_flight:
+            outcomes.append(Outcome(call.tool_name, DROPPED, 0.0, 0.0, warmup))
+            continue
+        in_flight += 1
+        peak_in_flight = max(peak_in_flight, in_flight)
+        task = asyncio.create_task(run(call, due, warmup))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+    if tasks:
+        await asyncio.gather(*tasks)
+
+    measured_from = started + min(warmup_seconds, send_at[-1] if send_at else 0.0)
+    return summarize(outcomes, loop.time() - measured_from, peak_in_flight)
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 2)
+
+
+def _figures(outcomes: List[Outcome]) -> Dict[str, Any]:
+    answered = sorted(o.latency_ms for o in outcomes if o.status not in (DROPPED, TRANSPORT_ERROR))
+    return {
+        "calls": len(outcomes),
+        "errors": sum(1 for o in outcomes if o.status not in (200, THROTTLED, DROPPED)),
+        "throttled": sum(1 for o in outcomes if o.status == THROTTLED),
+        "dropped": sum(1 for o in outcomes if o.status == DROPPED),
+        "mean_ms": round(statistics.fmean(answered), 2) if answered else 0.0,
+        "p50_ms": _percentile(answered, 0.50),
+        "p90_ms": _percentile(answered, 0.90),
+        "p99_ms": _percentile(answered, 0.99),
+        "max_ms": round(answered[-1], 2) if answered else 0.0,
+    }
+
+
+def summarize(outcomes: List[Outcome], seconds: float, peak_in_flight: int) -> Dict[str, Any]:
+    """Overall and per-tool figures for the calls made after the warm-up."""
+    measured = [outcome for outcome in outcomes if not outcome.warmup]
+    lags = sorted(outcome.lag_ms for outcome in measured if outcome.status != DROPPED)
+    tools: Dict[str, List[Outcome]] = {}
+    for outcome in measured:
+        tools.setdefault(outcome.tool_name, []).append(outcome)
+    return {
+        "seconds": round(seconds, 3),
+        "throughput": round(len(measured) / seconds, 2) if seconds > 0 else 0.0,
+        "warmup_calls": len(outcomes) - len(measured),
+        "peak_in_flight": peak_in_flight,
+        "send_lag_p99_ms": _percentile(lags, 0.99),
+        "total": _figures(measured),
+        "tools": {name: _figures(tools[name]) for name in sorted(tools)},
+    }
+
+
+@asynccontextmanager
+async def http_sender(
+    url: str, timeout: float, headers: Optional[Dict[str, str]] = None
+) -> AsyncIterator[Send]:
+    """Send calls to a server's ``/invoke-tool`` endpoint; yields the HTTP status."""
+    import httpx
+
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=100)
+    async with httpx.AsyncClient(
+        base_url=url.rstrip("/"), headers=headers, timeout=timeout, limits=limits
+    ) as client:
+
+        async def send(tool_name: str, params: Dict[str, Any]) -> int:
+            response = await client.post(
+                "/invoke-tool", json={"tool_name": tool_name, "params": params}
+            )
+            return response.status_code
+
+        yield send
+
+
+@contextmanager
+def fake_target(args: argparse.Namespace) -> Iterator[tuple]:
+    """Serve a seeded fake backend and an in-process server that uses it.
+
+    Yields the server URL and the seeded file IDs.
+    """
+    from mcp_google_suite.config import Config
+    from mcp_google_suite.fake import (
+        FakeGoogle,
+        FakeSettings,
+        create_fake_app,
+        discovery_url,
+        serve_in_thread,
+        write_fake_credentials,
+    )
+    from mcp_google_suite.server import GoogleWorkspaceMCPServer
+    from mcp_google_suite.web_app import create_web_app
+
+    fake = FakeGoogle(
+        FakeSettings(latency_seconds=args.fake_latency, error_rate=args.fake_error_rate)
+    )
+    seeded = fake.seed(documents=args.fake_documents, spreadsheets=args.fake_spreadsheets)
+    with tempfile.TemporaryDirectory(prefix="mcp-replay-") as workdir:
+        credentials_path = os.path.join(workdir, "credentials.json")
+        write_fake_credentials(credentials_path)
+        with serve_in_thread(create_fake_app(fake)) as fake_url:
+            config = Config.load(args.config)
+            config.credentials.server_credentials = credentials_path
+            config.google_api.discovery_url = discovery_url(fake_url)
+            server = GoogleWorkspaceMCPServer(config)
+            with serve_in_thread(create_web_app(server)) as server_url:
+                yield server_url, seeded
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    from tabulate import tabulate
+
+    columns = ["calls", "errors", "throttled", "dropped", "p50_ms", "p90_ms", "p99_ms"]
+    headers = ["Tool", "Calls", "Errors", "429s", "Dropped", "p50 ms", "p90 ms", "p99 ms"]
+    rows = [
+        [name] + [figures[column] for column in columns]
+        for name, figures in report["tools"].items()
+    ]
+    rows.append(["(all)"] + [report["total"][column] for column in columns])
+    print(tabulate(rows, headers=headers, tablefmt="grid"))
+    print(
+        f"{report['total']['calls']} calls in {report['seconds']}s "
+        f"({report['throughput']} calls/s, peak {report['peak_in_flight']} in flight, "
+        f"p99 send lag {report['send_lag_p99_ms']} ms, "
+        f"{report['warmup_calls']} warm-up calls not counted)"
+    )
+
+
+def run_replay(args: argparse.Namespace) -> Dict[str, Any]:
+    """Replay the trace named by the parsed arguments and return the report."""
+    calls = load_trace(args.trace)
+    if not calls:
+        raise ValueError(f"{args.trace} contains no calls")
+    if args.rate is None and calls[-1].offset == 0 and len(calls) > 1:
+        raise ValueError("The trace has no timing; replay it with --rate")
+    send_at = schedule(calls, speed=args.speed, rate=args.rate, repeat=args.repeat)
+    if args.duration is not None:
+        send_at = [at for at in send_at if at < args.duration]
+    headers = dict(header.split(":", 1) for header in args.header)
+    headers = {key.strip(): value.strip() for key, value in headers.items()}
+
+    async def go(url: str) -> Dict[str, Any]:
+        async with http_sender(url, args.timeout, headers) as send:
+            return await replay(calls, send_at, send, args.warmup, args.max_in_flight)
+
+    if args.fake:
+        with fake_target(args) as (url, seeded):
+            calls = [
+                TraceCall(call.offset, call.tool_name, remap_ids(call.params, seeded))
+                for call in calls
+            ]
+            return asyncio.run(go(url))
+    return asyncio.run(go(args.url))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Entry point of ``mcp-google-suite bench``."""
+    parser = argparse.ArgumentParser(
+        prog="mcp-google-suite bench", description="Load generators for the server"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    parser_replay = commands.add_parser(
+        "replay", help="Replay a JSON lines trace of tool calls", description=__doc__
+    )
+    parser_replay.formatter_class = argparse.RawDescriptionHelpFormatter
+    parser_replay.add_argument("trace", help="JSON lines file of recorded tool calls")
+    target = parser_replay.add_mutually_exclusive_group()
+    target.add_argument("--url", default="http://127.0.0.1:8000", help="Server to replay against")
+    target.add_argument(
+        "--fake",
+        action="store_true",
+        help="Replay against an in-process server backed by the fake Google APIs",
+    )
+    timing = parser_replay.add_mutually_exclusive_group()
+    timing.add_argument(
+        "--speed", type=float, default=1.0, help="Replay the original timing this many times faster"
+    )
+    timing.add_argument("--rate", type=float, help="Send calls at this fixed rate per second")
+    parser_replay.add_argument("--repeat", type=int, default=1, help="Replay the trace N times")
+    parser_replay.add_argument("--duration", type=float, help="Stop sending after N seconds")
+    parser_replay.add_argument(
+        "--warmup", type=float, default=0.0, help="Leave calls of the first N seconds out"
+    )
+    parser_replay.add_argument(
+        "--max-in-flight", type=int, default=1000, help="Drop calls beyond this many outstanding"
+    )
+    parser_replay.add_argument("--timeout", type=float, default=60.0, help="Per-call timeout")
+    parser_replay.add_argument(
+        "--header", action="append", default=[], help="Extra HTTP header, as 'Name: value'"
+    )
+    parser_replay.add_argument("--output", help="Write the report as JSON to this path")
+    parser_replay.add_argument("--config", help="Server configuration for --fake")
+    parser_replay.add_argument(
+        "--fake-latency", type=float, default=0.05, help="Fake API latency in seconds"
+    )
+    parser_replay.add_argument(
+        "--fake-error-rate", type=float, default=0.0, help="Fake API failure rate"
+    )
+    parser_replay.add_argument("--fake-documents", type=int, default=20, help="Documents to seed")
+    parser_replay.add_argument(
+        "--fake-spreadsheets", type=int, default=5, help="Spreadsheets to seed"
+    )
+    args = parser.parse_args(argv)
+
+    if args.speed <= 0 or (args.rate is not None and args.rate <= 0) or args.repeat < 1:
+        parser.error("--speed, --rate and --repeat must be positive")
+    if any(":" not in header for header in args.header):
+        parser.error("--header takes 'Name: value'")
+
+    try:
+        report = run_replay(args)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"trace": args.trace, "created": time.time(), **report}, f, indent=2)
@@ -0,0 +1,130 @@
+"""Serialization of tool results for MCP and HTTP responses."""
+
+import json
+import logging
+import time
+from typing import Any, Dict, Iterator, Optional
+
+from mcp_google_suite.config import SerializationConfig
+
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+logger = logging.getLogger(__name__)
+
+
+class JsonBackend:
+    """Standard library JSON encoder."""
+
+    name = "json"
+
+    def __init__(self, indent: Optional[int] = None):
+        separators = (",", ":") if indent is None else (",", ": ")
+        self._encoder = json.JSONEncoder(
+            ensure_ascii=False, indent=indent, separators=separators, default=str
+        )
+
+    def dumps(self, obj: Any) -> bytes:
+        """Serialize ``obj`` to UTF-8 JSON bytes."""
+        return self._encoder.encode(obj).encode("utf-8")
+
+    def iter_chunks(self, obj: Any, chunk_size: int) -> Iterator[bytes]:
+        """Encode ``obj`` incrementally, yielding chunks of roughly ``chunk_size`` bytes."""
+        buffer, size = [], 0
+        for piece in self._encoder.iterencode(obj):
+            buffer.append(piece)
+            size += len(piece)
+            if size >= chunk_size:
+                yield "".join(buffer).encode("utf-8")
+                buffer, size = [], 0
+        if buffer:
+            yield "".join(buffer).encode("utf-8")
+
+
+class OrjsonBackend:
+    """orjson encoder, falling back to the standard library for unsupported values."""
+
+    name = "orjson"
+
+    def __init__(self, indent: Optional[int] = None):
+        self._options = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        self._fallback = JsonBackend(indent)
+
+    def dumps(self, obj: Any) -> bytes:
+        """Serialize ``obj`` to UTF-8 JSON bytes."""
+        try:
+            return orjson.dumps(obj, default=str, option=self._options)
+        except TypeError:
+            return self._fallback.dumps(obj)
+
+    def iter_chunks(self, obj: Any, chunk_size: int) -> Iterator[bytes]:
+        """Serialize ``obj`` at once and yield zero-copy slices of ``chunk_size`` bytes."""
+        view = memoryview(self.dumps(obj))
+        for start in range(0, len(view), chunk_size):
+            yield view[start : start + chunk_size]
+
+
+def create_backend(backend: str = "auto", indent: Optional[int] = None):
+    """Create the configured serialization backend.
+
+    ``auto`` uses orjson when it is installed and the indent is one it supports.
+    """
+    orjson_usable = orjson is not None and indent in (None, 0, 2)
+    if backend == "orjson" and not orjson_usable:
+        logger.warning("orjson backend requested but unavailable; using json")
+    if backend in ("auto", "orjson") and orjson_usable:
+        return OrjsonBackend(indent)
+    return JsonBackend(indent)
+
+
+class ResultSerializer:
+    """Serializes tool results and records time and output size per tool."""
+
+    def __init__(self, backend: str = "auto", indent: Optional[int] = None):
+        self.backend = create_backend(backend, indent)
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    @classmethod
+    def from_config(cls, config: SerializationConfig) -> "ResultSerializer":
+        """Create a serializer from configuration settings."""
+        return cls(backend=config.backend, indent=config.indent)
+
+    def dumps(self, tool_name: str, obj: Any) -> bytes:
+        """Serialize a tool result in one piece."""
+        started = time.perf_counter()
+        data = self.backend.dumps(obj)
+        self._record(tool_name, time.perf_counter() - started, len(data))
+        return data
+
+    def iter_chunks(self, tool_name: str, obj: Any, chunk_size: int) -> Iterator[bytes]:
+        """Serialize a tool result as a stream of chunks."""
+        elapsed, total = 0.0, 0
+        chunks = self.backend.iter_chunks(obj, chunk_size)
+        while True:
+            started = time.perf_counter()
+            chunk = next(chunks, None)
+            elapsed += time.perf_counter() - started
+            if chunk is None:
+                break
+            total += len(chunk)
+            yield chunk
+        self._record(tool_name, elapsed, total)
+
+    def _record(self, tool_name: str, seconds: float, size: int) -> None:
+        """Accumulate serialization counters for a tool."""
+        stats = self._stats.setdefault(
+            tool_name, {"calls": 0, "seconds": 0.0, "bytes": 0, "max_bytes": 0}
+        )
+        stats["calls"] += 1
+        stats["seconds"] += seconds
+        stats["bytes"] += size
+        stats["max_bytes"] = max(stats["max_bytes"], size)
+        logger.debug(f"Serialized {tool_name} result - {size} bytes in {seconds * 1000:.2f} ms")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return per-tool serialization counters."""
+        return {"backend": self.backend.name, "tools": {k: dict(v) for k, v in self._stats.items()}}
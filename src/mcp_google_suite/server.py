@@ -1,20 +1,50 @@
-import json
 import logging
+import time
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
-from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import mcp.types as types
 from mcp.server import Server
 from mcp.server.models import InitializationOptions
 from mcp.shared.exceptions import McpError
-from tabulate import tabulate
 
+from mcp_google_suite import tracing
+from mcp_google_suite.admission import OVERLOADED_ERROR_CODE, AdmissionController, OverloadedError
 from mcp_google_suite.auth.google_auth import GoogleAuth
+from mcp_google_suite.cache import ResponseCache
 from mcp_google_suite.config import Config
-from mcp_google_suite.docs.service import DocsService
-from mcp_google_suite.drive.service import DriveService
+from mcp_google_suite.docs.service import (
+    CONTENT_FORMATS,
+    EXPORT_MIME_TYPES,
+    TEXT_RUN_FIELDS,
+    DocsService,
+    invalid_placeholder_names,
+)
+from mcp_google_suite.docs.structure import DocumentIndex
+from mcp_google_suite.drive.service import DOCUMENT_MIME_TYPE, DriveService
+from mcp_google_suite.fields import PRESETS, requested_names, resolve_fields
+from mcp_google_suite.idempotency import (
+    IDEMPOTENCY_KEY_ARGUMENT,
+    IDEMPOTENCY_KEY_SCHEMA,
+    IdempotencyStore,
+)
+from mcp_google_suite.logs import ToolCallLog
+from mcp_google_suite.metrics import MetricsRegistry, ServerMetrics
+from mcp_google_suite.pagination import (
+    MAX_RESULT_CHARS_ARGUMENT,
+    MAX_RESULT_CHARS_SCHEMA,
+    PAGED_FIELDS,
+    ResultPager,
+)
+from mcp_google_suite.profiling import Profiler
+from mcp_google_suite.ratelimit import RateLimitedError, RateLimiter
+from mcp_google_suite.registry import ToolHandler, ToolRegistry
+from mcp_google_suite.serialization import ResultSerializer
+from mcp_google_suite.sessions import ContextPool, current_session
 from mcp_google_suite.sheets.service import SheetsService
+from mcp_google_suite.singleflight import SingleFlight
+from mcp_google_suite.tracing import Tracer
 
 
 # Configure logging
@@ -29,30 +59,77 @@ class GoogleWorkspaceContext:
     drive: DriveService
     docs: DocsService
     sheets: SheetsService
-
-
-ToolHandler = Callable[[GoogleWorkspaceContext, dict], Awaitable[Dict[str, Any]]]
+    cache: Optional[ResponseCache] = None
+
+
+# Tools without side effects; identical concurrent calls share one upstream request
+READ_ONLY_TOOLS = frozenset(
+    {
+        "drive_search_files",
+        "drive_get_file_metadata",
+        "drive_resolve_path",
+        "docs_get_content",
+        "docs_outline",
+        "docs_get_section",
+        "docs_find",
+        "sheets_get_values",
+        "fetch_more",
+    }
+)
+
+FIELDS_SCHEMA = {
+    "type": "string",
+    "description": (
+        f"Fields to return: a preset ({', '.join(PRESETS)}) "
+        "or a comma-separated list of field names"
+    ),
+}
 
 
 class GoogleWorkspaceMCPServer:
     """MCP server for Google Workspace operations."""
 
-    def __init__(self, config: Optional[Config] = None, config_path: Optional[str] = None):
-        """Initialize the server with optional configuration."""
+    def __init__(
+        self,
+        config: Optional[Config] = None,
+        config_path: Optional[str] = None,
+        show_tools: bool = False,
+    ):
+        """Initialize the server with optional configuration.
+
+        The tool summary table is only rendered when ``show_tools`` is set.
+        """
         logger.info("Initializing GoogleWorkspaceMCPServer")
         self.config = config or Config.load(config_path)
-        self._context = None
-        self._tool_registry: Dict[str, ToolHandler] = {}
+        self.contexts: ContextPool[GoogleWorkspaceContext] = ContextPool(self.create_context)
+        self.response_cache = ResponseCache.from_config(self.config.cache)
+        self.serializer = ResultSerializer.from_config(self.config.serialization)
+        self.admission = AdmissionController(self.config.admission)
+        self.rate_limiter = RateLimiter.from_config(self.config.rate_limit)
+        self.singleflight = SingleFlight()
+        self.idempotency = IdempotencyStore.from_config(self.config.idempotency)
+        self.pager = ResultPager.from_config(self.config.pagination)
+        self.metrics = ServerMetrics() if self.config.metrics.enabled else None
+        self.tracer = Tracer.from_config(self.config.tracing)
+        self.profiler = Profiler.from_config(self.config.profiling)
+        self.call_log = ToolCallLog.from_config(self.config.logging)
+        if self.metrics is not None:
+            self._register_metric_collectors(self.metrics.registry)
 
         # Initialize MCP server
         self.server = Server(name="mcp-google-suite", version="0.1.0")
 
         # Register tools
         self.register_tools()
-        self._display_available_tools()
+        if show_tools:
+            self._display_available_tools()
 
     def _get_tools_list(self) -> List[types.Tool]:
         """Get the list of available tools with their schemas."""
+        return list(self.registry.tools)
+
+    def _build_tools_list(self) -> List[types.Tool]:
+        """Build the tool definitions; called once when the registry is created."""
         return [
             types.Tool(
                 name="drive_search_files",
@@ -61,15 +138,50 @@ class GoogleWorkspaceMCPServer:
                     "type": "object",
                     "properties": {
                         "query": {"type": "string", "description": "Search query"},
+                        "folder_path": {
+                            "type": "string",
+                            "description": "Restrict results to this folder, e.g. Reports/2026",
+                        },
                         "page_size": {
                             "type": "integer",
                             "description": "Number of results to return",
                             "default": 10,
                         },
+                        "fields": FIELDS_SCHEMA,
                     },
                     "required": ["query"],
                 },
             ),
+            types.Tool(
+                name="drive_get_file_metadata",
+                description="Get metadata for a file in Google Drive",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "file_id": {"type": "string", "description": "ID of the file"},
+                        "path": {
+                            "type": "string",
+                            "description": "Path of the file, used when file_id is not given",
+                        },
+                        "fields": FIELDS_SCHEMA,
+                    },
+                },
+            ),
+            types.Tool(
+                name="drive_resolve_path",
+                description="Resolve Google Drive paths such as Reports/2026/Q3 to file IDs",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "path": {"type": "string", "description": "Slash-separated path"},
+                        "paths": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Several paths to resolve together",
+                        },
+                    },
+                },
+            ),
             types.Tool(
                 name="drive_create_folder",
                 description="Create a new folder in Google Drive",
@@ -78,10 +190,84 @@ class GoogleWorkspaceMCPServer:
                     "properties": {
                         "name": {"type": "string", "description": "Name of the folder"},
                         "parent_id": {"type": "string", "description": "ID of parent folder"},
+                        "parent_path": {"type": "string", "description": "Path of parent folder"},
                     },
                     "required": ["name"],
                 },
             ),
+            types.Tool(
+                name="drive_move_files",
+                description="Move multiple files to a Google Drive folder using batched requests",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "file_ids": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "IDs of the files to move",
+                        },
+                        "file_paths": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Paths of the files to move",
+                        },
+                        "new_parent_id": {
+                            "type": "string",
+                            "description": "ID of the destination folder",
+                        },
+                        "new_parent_path": {
+                            "type": "string",
+                            "description": "Path of the destination folder",
+                        },
+                    },
+                },
+            ),
+            types.Tool(
+                name="drive_copy_files",
+                description="Copy multiple files in Google Drive using batched requests",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "file_ids": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "IDs of the files to copy",
+                        },
+                        "file_paths": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Paths of the files to copy",
+                        },
+                        "parent_id": {
+                            "type": "string",
+                            "description": "ID of the folder to place the copies in",
+                        },
+                        "parent_path": {
+                            "type": "string",
+                            "description": "Path of the folder to place the copies in",
+                        },
+                    },
+                },
+            ),
+            types.Tool(
+                name="drive_trash_files",
+                description="Move multiple Google Drive files to the trash using batched requests",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "file_ids": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "IDs of the files to trash",
+                        },
+                        "file_paths": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Paths of the files to trash",
+                        },
+                    },
+                },
+            ),
             types.Tool(
                 name="docs_create",
                 description="Create a new Google Doc",
@@ -94,17 +280,134 @@ class GoogleWorkspaceMCPServer:
                     "required": ["title"],
                 },
             ),
+            types.Tool(
+                name="docs_create_from_template",
+                description=(
+                    "Create a Google Doc by copying a template document and replacing its "
+                    "{{name}} placeholders"
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "template_id": {
+                            "type": "string",
+                            "description": "ID of the template document",
+                        },
+                        "template_path": {
+                            "type": "string",
+                            "description": "Path of the template document",
+                        },
+                        "title": {"type": "string", "description": "Title of the new document"},
+                        "folder_id": {
+                            "type": "string",
+                            "description": "ID of the folder to create the document in",
+                        },
+                        "folder_path": {
+                            "type": "string",
+                            "description": "Path of the folder to create the document in",
+                        },
+                        "substitutions": {
+                            "type": "object",
+                            "description": (
+                                "Placeholder names and the text replacing them; a name "
+                                "matches {{name}} exactly, with no spaces inside the braces"
+                            ),
+                        },
+                    },
+                },
+            ),
             types.Tool(
                 name="docs_get_content",
                 description="Get the contents of a Google Doc",
                 inputSchema={
                     "type": "object",
                     "properties": {
-                        "document_id": {"type": "string", "description": "ID of the document"}
+                        "document_id": {"type": "string", "description": "ID of the document"},
+                        "format": {
+                            "type": "string",
+                            "enum": list(CONTENT_FORMATS),
+                            "description": (
+                                "text and markdown are exported by Drive; structured reads the "
+                                "Docs API and supports fields"
+                            ),
+                            "default": "text",
+                        },
+                        "fields": FIELDS_SCHEMA,
                     },
                     "required": ["document_id"],
                 },
             ),
+            types.Tool(
+                name="docs_outline",
+                description=(
+                    "List the headings and tables of a Google Doc with the index range of "
+                    "each section"
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "document_id": {"type": "string", "description": "ID of the document"},
+                        "max_level": {
+                            "type": "integer",
+                            "description": "Deepest heading level to list (0 is the title)",
+                        },
+                    },
+                    "required": ["document_id"],
+                },
+            ),
+            types.Tool(
+                name="docs_get_section",
+                description=(
+                    "Get one section of a Google Doc, from its heading to the next heading "
+                    "of the same level, with exact start and end indexes"
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "document_id": {"type": "string", "description": "ID of the document"},
+                        "heading": {
+                            "type": "string",
+                            "description": "Heading text; case-insensitive, partial if unique",
+                        },
+                        "heading_id": {"type": "string", "description": "Heading ID"},
+                        "number": {
+                            "type": "integer",
+                            "description": "Heading number as listed by docs_outline",
+                        },
+                        "include_subsections": {
+                            "type": "boolean",
+                            "description": "Include lower-level headings and their content",
+                            "default": True,
+                        },
+                    },
+                    "required": ["document_id"],
+                },
+            ),
+            types.Tool(
+                name="docs_find",
+                description=(
+                    "Find text in a Google Doc, returning the index range and section of "
+                    "each occurrence"
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "document_id": {"type": "string", "description": "ID of the document"},
+                        "query": {"type": "string", "description": "Text to find"},
+                        "match_case": {
+                            "type": "boolean",
+                            "description": "Match upper and lower case exactly",
+                            "default": False,
+                        },
+                        "max_results": {
+                            "type": "integer",
+                            "description": "Most occurrences to return",
+                            "default": 50,
+                        },
+                    },
+                    "required": ["document_id", "query"],
+                },
+            ),
             types.Tool(
                 name="docs_update_content",
                 description="Update the content of a Google Doc",
@@ -119,12 +422,18 @@ class GoogleWorkspaceMCPServer:
             ),
             types.Tool(
                 name="docs_append_formatted_text",
-                description="Append formatted text to the end of a Google Doc without destroying existing formatting",
+                description=(
+                    "Append Markdown (headings, bold, italic, strikethrough, code, links and "
+                    "lists) to the end of a Google Doc as formatted text, in one update"
+                ),
                 inputSchema={
                     "type": "object",
                     "properties": {
                         "document_id": {"type": "string", "description": "ID of the document"},
-                        "text_content": {"type": "string", "description": "Text content to append"},
+                        "text_content": {
+                            "type": "string",
+                            "description": "Markdown text to append",
+                        },
                     },
                     "required": ["document_id", "text_content"],
                 },
@@ -137,14 +446,60 @@ class GoogleWorkspaceMCPServer:
                     "properties": {
                         "document_id": {"type": "string", "description": "ID of the document"},
                         "requests": {
-                            "type": "array", 
-                            "description": "List of batch update requests compatible with Google Docs API batchUpdate",
-                            "items": {"type": "object"}
+                            "type": "array",
+                            "description": (
+                                "List of batch update requests compatible with Google Docs "
+                                "API batchUpdate"
+                            ),
+                            "items": {"type": "object"},
                         },
                     },
                     "required": ["document_id", "requests"],
                 },
             ),
+            types.Tool(
+                name="docs_batch_update_many",
+                description=(
+                    "Apply the same batch update requests to many Google Docs, given by ID "
+                    "or as a Drive folder, and report the outcome per document"
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "document_ids": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "IDs of the documents to update",
+                        },
+                        "folder_id": {
+                            "type": "string",
+                            "description": "ID of a folder whose Google Docs are updated",
+                        },
+                        "folder_path": {
+                            "type": "string",
+                            "description": "Path of a folder whose Google Docs are updated",
+                        },
+                        "requests": {
+                            "type": "array",
+                            "description": (
+                                "Batch update requests compatible with Google Docs API "
+                                "batchUpdate; strings may contain {{name}} placeholders"
+                            ),
+                            "items": {"type": "object"},
+                        },
+                        "substitutions": {
+                            "type": "object",
+                            "description": (
+                                "Placeholder values per document: document ID to an object "
+                                "of placeholder names and values; a name matches {{name}} "
+                                "exactly, with no spaces inside the braces"
+                            ),
+                            "additionalProperties": {"type": "object"},
+                        },
+                    },
+                    "required": ["requests"],
+                },
+            ),
             types.Tool(
                 name="sheets_create",
                 description="Create a new Google Sheet",
@@ -172,6 +527,7 @@ class GoogleWorkspaceMCPServer:
                             "description": "ID of the spreadsheet",
                         },
                         "range": {"type": "string", "description": "A1 notation range"},
+                        "fields": FIELDS_SCHEMA,
                     },
                     "required": ["spreadsheet_id", "range"],
                 },
@@ -196,23 +552,54 @@ class GoogleWorkspaceMCPServer:
                     "required": ["spreadsheet_id", "range", "values"],
                 },
             ),
+            types.Tool(
+                name="fetch_more",
+                description=(
+                    "Get the next part of a truncated docs_get_content, docs_get_section or "
+                    "sheets_get_values result"
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "continuation_token": {
+                            "type": "string",
+                            "description": "continuation_token of the previous part",
+                        },
+                        MAX_RESULT_CHARS_ARGUMENT: MAX_RESULT_CHARS_SCHEMA,
+                    },
+                    "required": ["continuation_token"],
+                },
+            ),
         ]
 
     def register_tools(self):
         """Register all available tools."""
         try:
             # Register tool handlers
-            for tool in self._get_tools_list():
-                handler_name = f"_handle_{tool.name}"
-                if hasattr(self, handler_name):
-                    handler = getattr(self, handler_name)
-                    self._tool_registry[tool.name] = handler
-                    logger.debug(f"Registered handler for {tool.name}")
+            entries = []
+            for tool in self._build_tools_list():
+                if tool.name not in READ_ONLY_TOOLS:
+                    tool.inputSchema.setdefault("properties", {})[
+                        IDEMPOTENCY_KEY_ARGUMENT
+                    ] = IDEMPOTENCY_KEY_SCHEMA
+                if tool.name in PAGED_FIELDS:
+                    tool.inputSchema["properties"][
+                        MAX_RESULT_CHARS_ARGUMENT
+                    ] = MAX_RESULT_CHARS_SCHEMA
+                handler = getattr(self, f"_handle_{tool.name}", None)
+                if handler is None:
+                    logger.warning(f"No handler for tool {tool.name}; skipping")
+                    continue
+                entries.append((tool, handler))
+                logger.debug(f"Registered handler for {tool.name}")
+
+            self.registry = ToolRegistry(entries)
+            self._tool_registry = self.registry.handlers
 
             # Register server handlers
             @self.server.list_tools()
             async def list_tools() -> List[types.Tool]:
-                return self._get_tools_list()
+                return list(self.registry.tools)
 
             @self.server.call_tool()
             async def call_tool(
@@ -221,46 +608,122 @@ class GoogleWorkspaceMCPServer:
                 if not arguments:
                     raise ValueError("Missing arguments for tool execution")
 
-                if not self._context:
-                    raise McpError("Server context not initialized")
-
-                is_authorized = await self._context.auth.is_authorized()
-                if not is_authorized:
-                    raise McpError("Not authenticated. Please run 'mcp-google auth' first.")
-
-                handler = self._tool_registry.get(name)
-                if not handler:
-                    raise ValueError(f"Unknown tool: {name}")
-
-                result = await handler(self._context, arguments)
-                return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+                context = self.contexts.get()
+                session = current_session.get()
+                if session is not None:
+                    session.tool_calls += 1
+
+                with self.tracer.trace("mcp.call_tool", tool=name):
+                    with tracing.span("auth.check"):
+                        is_authorized = await context.auth.is_authorized()
+                    if not is_authorized:
+                        raise McpError(
+                            types.ErrorData(
+                                code=types.INVALID_REQUEST,
+                                message="Not authenticated. Please run 'mcp-google auth' first.",
+                            )
+                        )
+
+                    handler = self.registry.get(name)
+                    if not handler:
+                        raise ValueError(f"Unknown tool: {name}")
+
+                    try:
+                        result = await self.run_tool(name, handler, context, arguments)
+                    except (OverloadedError, RateLimitedError) as e:
+                        raise McpError(
+                            types.ErrorData(
+                                code=OVERLOADED_ERROR_CODE,
+                                message=f"{e}; retry after {e.retry_after} seconds",
+                                data={"retry_after": e.retry_after},
+                            )
+                        ) from e
+                    with tracing.span("serialize") as span:
+                        text = self.serializer.dumps(name, result).decode("utf-8")
+                        if span is not None:
+                            span.set("bytes", len(text))
+                    return [types.TextContent(type="text", text=text)]
 
         except Exception as e:
             logger.error(f"Error registering tools: {str(e)}", exc_info=True)
             raise
 
+    async def run_tool(
+        self,
+        name: str,
+        handler: ToolHandler,
+        context: GoogleWorkspaceContext,
+        arguments: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Run a tool handler under admission control.
+
+        Identical concurrent calls of read-only tools join the call already in
+        flight instead of taking their own admission slot. Write tools called
+        with an idempotency key run once per key; repeats wait for or replay
+        the original result. Results of paged tools larger than the size budget
+        are cut, keeping the rest for ``fetch_more``.
+        """
+        arguments = dict(arguments)
+        idempotency_key = arguments.pop(IDEMPOTENCY_KEY_ARGUMENT, None)
+        max_chars = None
+        if name in PAGED_FIELDS:
+            max_chars = arguments.pop(MAX_RESULT_CHARS_ARGUMENT, None)
+
+        async def call() -> Dict[str, Any]:
+            queued = time.time_ns()
+            async with self.admission.admit(name):
+                tracing.record("admission.wait", queued)
+                return await handler(context, arguments)
+
+        async def dispatch() -> Dict[str, Any]:
+            if name in READ_ONLY_TOOLS:
+                return await self.singleflight.do(name, arguments, call)
+            if idempotency_key:
+                return await self.idempotency.run(name, str(idempotency_key), arguments, call)
+            return await call()
+
+        metrics = self.metrics
+        started = metrics.tool_started(name) if metrics is not None else 0.0
+        called = time.perf_counter()
+        error = None
+        try:
+            with self.tracer.trace("tool.run", tool=name):
+                budget = self.pager.budget(max_chars)
+                if self.profiler.sample():
+                    result = await self.profiler.run(name, dispatch)
+                else:
+                    result = await dispatch()
+                return self.pager.paginate(name, result, budget)
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            if metrics is not None:
+                metrics.tool_finished(name, started, error)
+            self.call_log.finished(name, arguments, called, error)
+
     def _display_available_tools(self):
         """Display available tools in a structured format."""
         try:
+            from tabulate import tabulate
+
             logger.info("Available Tools Summary:")
 
             # Prepare tool information for display
             tool_info = []
-            for name, _handler in self._tool_registry.items():
-                tool_schema = next((t for t in self._get_tools_list() if t.name == name), None)
-                if tool_schema:
-                    required_params = tool_schema.inputSchema.get("required", [])
-                    all_params = list(tool_schema.inputSchema.get("properties", {}).keys())
-                    optional_params = [p for p in all_params if p not in required_params]
-
-                    tool_info.append(
-                        [
-                            name,
-                            tool_schema.description,
-                            ", ".join(required_params) or "None",
-                            ", ".join(optional_params) or "None",
-                        ]
-                    )
+            for tool_schema in self.registry.tools:
+                required_params = tool_schema.inputSchema.get("required", [])
+                all_params = list(tool_schema.inputSchema.get("properties", {}).keys())
+                optional_params = [p for p in all_params if p not in required_params]
+
+                tool_info.append(
+                    [
+                        tool_schema.name,
+                        tool_schema.description,
+                        ", ".join(required_params) or "None",
+                        ", ".join(optional_params) or "None",
+                    ]
+                )
 
             # Create a formatted table
             headers = ["Tool Name", "Description", "Required Parameters", "Optional Parameters"]
@@ -286,46 +749,284 @@ class GoogleWorkspaceMCPServer:
         except Exception as e:
             logger.error(f"Error displaying tools: {str(e)}", exc_info=True)
 
-    @asynccontextmanager
-    async def lifespan(self) -> AsyncIterator[GoogleWorkspaceContext]:
-        """Manage Google Workspace services lifecycle."""
-        try:
-            auth = GoogleAuth(config=self.config)
-            drive = DriveService(auth)
-            docs = DocsService(auth)
-            sheets = SheetsService(auth)
-            context = GoogleWorkspaceContext(auth=auth, drive=drive, docs=docs, sheets=sheets)
-            self._context = context
-            yield context
-        finally:
-            self._context = None
+    def create_context(self) -> GoogleWorkspaceContext:
+        """Create Google Workspace service clients sharing auth, cache and rate limiter."""
+        auth = GoogleAuth(config=self.config)
+        cache, limiter, metrics = self.response_cache, self.rate_limiter, self.metrics
+        return GoogleWorkspaceContext(
+            auth=auth,
+            drive=DriveService(
+                auth,
+                cache,
+                path_ttl=self.config.drive.path_ttl_seconds,
+                limiter=limiter,
+                metrics=metrics,
+            ),
+            docs=DocsService(
+                auth,
+                cache,
+                limiter,
+                metrics,
+                index_entries=self.config.docs.index_cache_entries,
+            ),
+            sheets=SheetsService(auth, cache, limiter, metrics),
+            cache=cache,
+        )
+
+    def _register_metric_collectors(self, registry: MetricsRegistry) -> None:
+        """Expose the counters kept by caches, limiters and auth as metrics."""
+
+        def from_context(read):
+            def samples():
+                context = self.contexts.current
+                return read(context) if context is not None else []
 
-    async def run(self, read_stream, write_stream, init_options: InitializationOptions) -> None:
-        """Run the server with the given streams and initialization options."""
-        async with self.lifespan():
+            return samples
+
+        cache = self.response_cache
+        registry.collect(
+            "credential_refreshes_total",
+            "OAuth access token refreshes performed by this process",
+            "counter",
+            from_context(lambda context: [({}, context.auth.refresh_count)]),
+        )
+        registry.collect(
+            "path_cache_lookups_total",
+            "Drive path cache lookups by result",
+            "counter",
+            from_context(
+                lambda context: [
+                    ({"result": result}, value)
+                    for result, value in context.drive.paths.stats().items()
+                    if result != "entries"
+                ]
+            ),
+        )
+        registry.collect(
+            "response_cache_lookups_total",
+            "Response cache lookups by result",
+            "counter",
+            lambda: [
+                ({"result": "revalidated"}, cache.revalidations),
+                ({"result": "miss"}, cache.lookups - cache.revalidations),
+            ],
+        )
+        registry.collect(
+            "response_cache_not_modified_total",
+            "Revalidations answered with 304 Not Modified",
+            "counter",
+            lambda: [({}, cache.not_modified)],
+        )
+        registry.collect(
+            "response_cache_hit_ratio",
+            "Share of cache lookups answered with 304 Not Modified",
+            "gauge",
+            lambda: [({}, cache.stats()["hit_ratio"])],
+        )
+        registry.collect(
+            "response_cache_bytes",
+            "Bytes held by the response cache",
+            "gauge",
+            lambda: [({}, cache.stats()["bytes"])],
+        )
+        registry.collect(
+            "tool_result_bytes_total",
+            "Serialized tool result bytes sent to clients",
+            "counter",
+            lambda: [
+                ({"tool": tool}, stats["bytes"])
+                for tool, stats in self.serializer.stats()["tools"].items()
+            ],
+        )
+        registry.collect(
+            "admission_queue_depth",
+            "Tool calls waiting for an admission slot",
+            "gauge",
+            lambda: self._admission_samples("queued"),
+        )
+        registry.collect(
+            "admission_wait_seconds_total",
+            "Time tool calls spent waiting for admission",
+            "counter",
+            lambda: self._admission_samples("wait_seconds"),
+        )
+        registry.collect(
+            "admission_rejected_total",
+            "Tool calls rejected by admission control",
+            "counter",
+            lambda: [
+                ({"scope": scope, "reason": reason}, count)
+                for scope, stats in self._admission_scopes()
+                for reason, count in stats["rejected"].items()
+            ],
+        )
+        registry.collect(
+            "upstream_rate_limit_total",
+            "Google API calls by client-side rate limiting outcome",
+            "counter",
+            lambda: [
+                ({"service": service, "outcome": outcome}, count)
+                for service, counters in self.rate_limiter.stats()["services"].items()
+                for outcome, count in counters.items()
+            ],
+        )
+        registry.collect(
+            "singleflight_collapsed_total",
+            "Read calls that joined an identical call in flight",
+            "counter",
+            lambda: [
+                ({"tool": tool}, counters["collapsed"])
+                for tool, counters in self.singleflight.stats()["tools"].items()
+            ],
+        )
+        registry.collect(
+            "idempotency_calls_total",
+            "Keyed write calls by outcome",
+            "counter",
+            lambda: [
+                ({"outcome": outcome}, self.idempotency.counters[outcome])
+                for outcome in self.idempotency.counters
+            ],
+        )
+        registry.collect(
+            "sessions",
+            "Open MCP sessions by transport",
+            "gauge",
+            lambda: [
+                ({"transport": transport}, count)
+                for transport, count in self.contexts.stats()["sessions"].items()
+            ],
+        )
+
+    def _admission_scopes(self):
+        stats = self.admission.stats()
+        yield "*", stats["global"]
+        yield from stats["tools"].items()
+
+    def _admission_samples(self, key: str):
+        return [({"scope": scope}, stats[key]) for scope, stats in self._admission_scopes()]
+
+    @asynccontextmanager
+    async def lifespan(self, transport: str = "stdio") -> AsyncIterator[GoogleWorkspaceContext]:
+        """Hold the shared Google Workspace context for the duration of one session."""
+        async with self.contexts.session(transport):
+            yield self.contexts.get()
+
+    async def run(
+        self,
+        read_stream,
+        write_stream,
+        init_options: Optional[InitializationOptions] = None,
+        transport: str = "stdio",
+    ) -> None:
+        """Run one MCP session over the given streams."""
+        if init_options is None:
+            init_options = self.server.create_initialization_options()
+        async with self.lifespan(transport):
             await self.server.run(read_stream, write_stream, init_options)
 
+    async def _resolve_drive_id(
+        self, context: GoogleWorkspaceContext, file_id: Optional[str], path: Optional[str]
+    ) -> Optional[str]:
+        """Return ``file_id`` or, when only a path is given, the ID it resolves to."""
+        if file_id or not path:
+            return file_id
+
+        resolved = await context.drive.resolve_path(path)
+        if not resolved["success"]:
+            raise ValueError(resolved["error"])
+        return resolved["id"]
+
+    async def _resolve_drive_ids(
+        self, context: GoogleWorkspaceContext, arguments: dict
+    ) -> List[str]:
+        """Collect the ``file_ids`` and resolved ``file_paths`` of a bulk request."""
+        file_ids = arguments.get("file_ids") or []
+        file_paths = arguments.get("file_paths") or []
+
+        if not isinstance(file_ids, list) or not isinstance(file_paths, list):
+            raise ValueError("file_ids and file_paths must be lists")
+
+        if file_paths:
+            resolved = await context.drive.resolve_paths(file_paths)
+            missing = [result["path"] for result in resolved.values() if not result["success"]]
+            if missing:
+                raise ValueError(f"Could not resolve paths: {', '.join(missing)}")
+            file_ids = file_ids + [result["id"] for result in resolved.values()]
+
+        if not file_ids:
+            raise ValueError("file_ids or file_paths is required")
+        return file_ids
+
     async def _handle_drive_search_files(
         self, context: GoogleWorkspaceContext, arguments: dict
     ) -> Dict[str, Any]:
         """Handle drive search files requests."""
         query = arguments.get("query")
         page_size = arguments.get("page_size", 10)
+        fields = arguments.get("fields")
 
         if not query:
             raise ValueError("Search query is required")
 
+        folder_id = await self._resolve_drive_id(context, None, arguments.get("folder_path"))
+        if folder_id:
+            query = f"({query}) and '{folder_id}' in parents"
+
         logger.debug(f"Drive search request - Query: {query}, Page Size: {page_size}")
-        result = await context.drive.search_files(query=query, page_size=page_size)
+        result = await context.drive.search_files(query=query, page_size=page_size, fields=fields)
         logger.debug(f"Drive search completed - Found {len(result.get('files', []))} files")
         return result
 
+    async def _handle_drive_get_file_metadata(
+        self, context: GoogleWorkspaceContext, arguments: dict
+    ) -> Dict[str, Any]:
+        """Handle drive get file metadata requests."""
+        fields = arguments.get("fields")
+        file_id = await self._resolve_drive_id(
+            context, arguments.get("file_id"), arguments.get("path")
+        )
+
+        if not file_id:
+            raise ValueError("file_id or path is required")
+
+        logger.debug(f"Getting file metadata - ID: {file_id}, Fields: {fields or 'default'}")
+        result = await context.drive.get_file_metadata(file_id=file_id, fields=fields)
+        logger.debug("File metadata retrieved")
+        return result
+
+    async def _handle_drive_resolve_path(
+        self, context: GoogleWorkspaceContext, arguments: dict
+    ) -> Dict[str, Any]:
+        """Handle drive path resolution requests."""
+        path = arguments.get("path")
+        paths = arguments.get("paths")
+
+        if path is None and not paths:
+            raise ValueError("path or paths is required")
+
+        if paths is not None and not isinstance(paths, list):
+            raise ValueError("paths must be a list")
+
+        if paths is None:
+            logger.debug(f"Resolving path - {path}")
+            return await context.drive.resolve_path(path)
+
+        logger.debug(f"Resolving {len(paths)} paths")
+        resolved = await context.drive.resolve_paths(paths)
+        return {
+            "success": all(result["success"] for result in resolved.values()),
+            "results": list(resolved.values()),
+        }
+
     async def _handle_drive_create_folder(
         self, context: GoogleWorkspaceContext, arguments: dict
     ) -> Dict[str, Any]:
         """Handle drive create folder requests."""
         name = arguments.get("name")
-        parent_id = arguments.get("parent_id")
+        parent_id = await self._resolve_drive_id(
+            context, arguments.get("parent_id"), arguments.get("parent_path")
+        )
 
         if not name:
             raise ValueError("Folder name is required")
@@ -335,6 +1036,49 @@ class GoogleWorkspaceMCPServer:
         logger.debug(f"Folder created - ID: {result.get('id')}")
         return result
 
+    async def _handle_drive_move_files(
+        self, context: GoogleWorkspaceContext, arguments: dict
+    ) -> Dict[str, Any]:
+        """Handle drive bulk move requests."""
+        new_parent_id = await self._resolve_drive_id(
+            context, arguments.get("new_parent_id"), arguments.get("new_parent_path")
+        )
+
+        if not new_parent_id:
+            raise ValueError("new_parent_id or new_parent_path is required")
+
+        file_ids = await self._resolve_drive_ids(context, arguments)
+
+        logger.debug(f"Moving {len(file_ids)} files to folder {new_parent_id}")
+        result = await context.drive.move_files(file_ids=file_ids, new_parent_id=new_parent_id)
+        logger.debug(f"Bulk move done - {result['succeeded']} moved, {result['failed']} failed")
+        return result
+
+    async def _handle_drive_copy_files(
+        self, context: GoogleWorkspaceContext, arguments: dict
+    ) -> Dict[str, Any]:
+        """Handle drive bulk copy requests."""
+        parent_id = await self._resolve_drive_id(
+            context, arguments.get("parent_id"), arguments.get("parent_path")
+        )
+        file_ids = await self._resolve_drive_ids(context, arguments)
+
+        logger.debug(f"Copying {len(file_ids)} files to folder {parent_id or 'source'}")
+        result = await context.drive.copy_files(file_ids=file_ids, parent_id=parent_id)
+        logger.debug(f"Bulk copy done - {result['succeeded']} copied, {result['failed']} failed")
+        return result
+
+    async def _handle_drive_trash_files(
+        self, context: GoogleWorkspaceContext, arguments: dict
+    ) -> Dict[str, Any]:
+        """Handle drive bulk trash requests."""
+        file_ids = await self._resolve_drive_ids(context, arguments)
+
+        logger.debug(f"Trashing {len(file_ids)} files")
+        result = await context.drive.trash_files(file_ids=file_ids)
+        logger.debug(f"Bulk trash done - {result['succeeded']} trashed, {result['failed']} failed")
+        return result
+
     async def _handle_docs_create(
         self, context: GoogleWorkspaceContext, arguments: dict
     ) -> Dict[str, Any]:
@@ -350,37 +1094,168 @@ class GoogleWorkspaceMCPServer:
         logger.debug(f"Document created - ID: {result.get('documentId')}")
         return result
 
+    async def _handle_docs_create_from_template(
+        self, context: GoogleWorkspaceContext, arguments: dict
+    ) -> Dict[str, Any]:
+        """Handle docs create from template requests."""
+        title = arguments.get("title")
+        substitutions = arguments.get("substitutions") or {}
+
+        if not isinstance(substitutions, dict):
+            raise ValueError("substitutions must be an object")
+
+        invalid = invalid_placeholder_names(substitutions)
+        if invalid:
+            raise ValueError(f"Invalid placeholder names (no spaces or braces): {invalid}")
+
+        template_id = await self._resolve_drive_id(
+            context, arguments.get("template_id"), arguments.get("template_path")
+        )
+        if not template_id:
+            raise ValueError("template_id or template_path is required")
+
+        folder_id = await self._resolve_drive_id(
+            context, arguments.get("folder_id"), arguments.get("folder_path")
+        )
+
+        logger.debug(f"Copying template {template_id} to folder {folder_id or 'source'}")
+        copied = await context.drive.copy_file(template_id, name=title, parent_id=folder_id)
+        if not copied["success"]:
+            raise Exception(f"Failed to copy template: {copied.get('error', 'Unknown error')}")
+        file = copied["file"]
+
+        filled = await context.docs.fill_placeholders(file["id"], substitutions)
+        if not filled["success"]:
+            # Do not leave a half-made document behind
+            await context.drive.trash_files([file["id"]])
+            raise Exception(f"Failed to fill template: {filled.get('error', 'Unknown error')}")
+
+        replacements = filled["replacements"]
+        logger.debug(f"Document created from template - ID: {file['id']}")
+        return {
+            "success": True,
+            "document_id": file["id"],
+            "title": file.get("name"),
+            "webViewLink": file.get("webViewLink"),
+            "replacements": replacements,
+            "unmatched": [name for name, count in replacements.items() if not count],
+        }
+
     async def _handle_docs_get_content(
         self, context: GoogleWorkspaceContext, arguments: dict
     ) -> Dict[str, Any]:
         """Handle docs get content requests."""
         document_id = arguments.get("document_id")
+        fields = arguments.get("fields")
+        content_format = arguments.get("format") or ("structured" if fields else "text")
 
         if not document_id:
             raise ValueError("Document ID is required")
 
-        logger.debug(f"Getting document content - ID: {document_id}")
-        result = await context.docs.get_document(document_id=document_id)
-        
+        if content_format not in CONTENT_FORMATS:
+            raise ValueError(f"format must be one of: {', '.join(CONTENT_FORMATS)}")
+
+        if fields and content_format != "structured":
+            raise ValueError("fields is only supported with format 'structured'")
+
+        logger.debug(f"Getting document content - ID: {document_id}, Format: {content_format}")
+        if content_format in EXPORT_MIME_TYPES:
+            result = await context.drive.export_text(
+                document_id, mime_type=EXPORT_MIME_TYPES[content_format]
+            )
+            if not result.get("success", False):
+                error = result.get("error", "Unknown error")
+                raise Exception(f"Failed to export document: {error}")
+            logger.debug(f"Document exported successfully - {result['bytes']} bytes")
+            return {"content": result["content"], "format": content_format}
+
+        result = await context.docs.get_document(
+            document_id=document_id, fields=fields, raw_fields=TEXT_RUN_FIELDS
+        )
+
         if not result.get("success", False):
             raise Exception(f"Failed to get document: {result.get('error', 'Unknown error')}")
-        
-        # Extract text content from the document
+
         document = result["document"]
-        content_parts = []
-        
-        if "body" in document and "content" in document["body"]:
-            for element in document["body"]["content"]:
-                if "paragraph" in element:
-                    paragraph = element["paragraph"]
-                    if "elements" in paragraph:
-                        for elem in paragraph["elements"]:
-                            if "textRun" in elem and "content" in elem["textRun"]:
-                                content_parts.append(elem["textRun"]["content"])
-        
-        full_content = "".join(content_parts)
+        full_content = self._text_run_content(document)
         logger.debug(f"Document content retrieved successfully - {len(full_content)} characters")
-        return {"content": full_content}
+        if not fields:
+            return {"content": full_content}
+
+        names = requested_names(resolve_fields("docs.document", fields))
+        if "*" not in names:
+            document = {name: document[name] for name in names if name in document}
+        return {"content": full_content, "document": document}
+
+    @staticmethod
+    def _text_run_content(document: Dict[str, Any]) -> str:
+        """Join the text runs of a document's top-level paragraphs."""
+        content_parts = []
+        for element in document.get("body", {}).get("content", []):
+            for elem in element.get("paragraph", {}).get("elements", []):
+                if "content" in elem.get("textRun", {}):
+                    content_parts.append(elem["textRun"]["content"])
+        return "".join(content_parts)
+
+    async def _document_index(
+        self, context: GoogleWorkspaceContext, document_id: Optional[str]
+    ) -> DocumentIndex:
+        """Return the cached or freshly built structural index of a document."""
+        if not document_id:
+            raise ValueError("Document ID is required")
+
+        result = await context.docs.get_index(document_id)
+        if not result.get("success", False):
+            raise Exception(f"Failed to get document: {result.get('error', 'Unknown error')}")
+        return result["index"]
+
+    async def _handle_docs_outline(
+        self, context: GoogleWorkspaceContext, arguments: dict
+    ) -> Dict[str, Any]:
+        """Handle docs outline requests."""
+        max_level = arguments.get("max_level")
+
+        if max_level is not None and not isinstance(max_level, int):
+            raise ValueError("max_level must be an integer")
+
+        index = await self._document_index(context, arguments.get("document_id"))
+        logger.debug(f"Outline of {index.document_id} - {len(index.headings)} headings")
+        return {"success": True, **index.outline(max_level)}
+
+    async def _handle_docs_get_section(
+        self, context: GoogleWorkspaceContext, arguments: dict
+    ) -> Dict[str, Any]:
+        """Handle docs get section requests."""
+        number = arguments.get("number")
+
+        if number is not None and not isinstance(number, int):
+            raise ValueError("number must be an integer")
+
+        index = await self._document_index(context, arguments.get("document_id"))
+        heading = index.find_heading(arguments.get("heading"), arguments.get("heading_id"), number)
+        section = index.section(heading, bool(arguments.get("include_subsections", True)))
+        logger.debug(
+            f"Section of {index.document_id} - {section['start_index']}:{section['end_index']}"
+        )
+        return {"success": True, **section}
+
+    async def _handle_docs_find(
+        self, context: GoogleWorkspaceContext, arguments: dict
+    ) -> Dict[str, Any]:
+        """Handle docs find requests."""
+        query = arguments.get("query")
+        max_results = arguments.get("max_results", 50)
+
+        if not query:
+            raise ValueError("Search query is required")
+
+        if not isinstance(max_results, int) or max_results < 1:
+            raise ValueError("max_results must be a positive integer")
+
+        index = await self._document_index(context, arguments.get("document_id"))
+        result = index.find(query, bool(arguments.get("match_case", False)), max_results)
+        logger.debug(f"Find in {index.document_id} - {result['total']} occurrences")
+        return {"success": True, **result}
 
     async def _handle_docs_update_content(
         self, context: GoogleWorkspaceContext, arguments: dict
@@ -396,10 +1271,10 @@ class GoogleWorkspaceMCPServer:
         result = await context.docs.update_document_content(
             document_id=document_id, content=content
         )
-        
+
         if not result.get("success", False):
             raise Exception(f"Failed to update document: {result.get('error', 'Unknown error')}")
-        
+
         logger.debug("Document content updated successfully")
         return result
 
@@ -413,22 +1288,26 @@ class GoogleWorkspaceMCPServer:
         if not document_id or text_content is None:
             raise ValueError("Both document_id and text_content are required")
 
-        logger.debug(f"Appending formatted text to document - ID: {document_id}, Text length: {len(text_content)}")
+        logger.debug(
+            f"Appending formatted text to document - ID: {document_id}, "
+            f"Text length: {len(text_content)}"
+        )
         result = await context.docs.append_formatted_text(
             document_id=document_id, text_content=text_content
         )
-        
+
         if not result.get("success", False):
-            raise Exception(f"Failed to append text to document: {result.get('error', 'Unknown error')}")
-        
-        logger.debug("Formatted text appended successfully")
+            raise Exception(
+                f"Failed to append text to document: {result.get('error', 'Unknown error')}"
+            )
+
+        logger.debug(f"Formatted text appended - {result['requests']} requests")
         return result
 
     async def _handle_docs_batch_update(
         self, context: GoogleWorkspaceContext, arguments: dict
     ) -> Dict[str, Any]:
         """Handle docs batch update requests."""
-        logger.debug(f"[DIAGNOSTICS] Handling docs_batch_update with args: {arguments}")
         document_id = arguments.get("document_id")
         requests = arguments.get("requests")
 
@@ -438,17 +1317,76 @@ class GoogleWorkspaceMCPServer:
         if not isinstance(requests, list):
             raise ValueError("requests must be a list")
 
-        logger.debug(f"Executing batch update on document - ID: {document_id}, Requests count: {len(requests)}")
-        result = await context.docs.batch_update(
-            document_id=document_id, requests=requests
+        logger.debug(
+            f"Executing batch update on document - ID: {document_id}, "
+            f"Requests count: {len(requests)}"
         )
-        
+        result = await context.docs.batch_update(document_id=document_id, requests=requests)
+
         if not result.get("success", False):
-            raise Exception(f"Failed to execute batch update: {result.get('error', 'Unknown error')}")
-        
+            raise Exception(
+                f"Failed to execute batch update: {result.get('error', 'Unknown error')}"
+            )
+
         logger.debug("Batch update executed successfully")
         return result
 
+    async def _handle_docs_batch_update_many(
+        self, context: GoogleWorkspaceContext, arguments: dict
+    ) -> Dict[str, Any]:
+        """Handle docs fan-out batch update requests."""
+        requests = arguments.get("requests")
+        document_ids = arguments.get("document_ids") or []
+        substitutions = arguments.get("substitutions") or {}
+        limit = self.config.docs.fan_out_max_documents
+
+        if not isinstance(requests, list) or not requests:
+            raise ValueError("requests must be a non-empty list")
+
+        if not isinstance(document_ids, list):
+            raise ValueError("document_ids must be a list")
+
+        if not isinstance(substitutions, dict) or not all(
+            isinstance(values, dict) for values in substitutions.values()
+        ):
+            raise ValueError("substitutions must map document IDs to objects")
+
+        invalid = invalid_placeholder_names(
+            {name for values in substitutions.values() for name in values}
+        )
+        if invalid:
+            raise ValueError(f"Invalid placeholder names (no spaces or braces): {sorted(invalid)}")
+
+        folder_id = await self._resolve_drive_id(
+            context, arguments.get("folder_id"), arguments.get("folder_path")
+        )
+        if folder_id:
+            listed = await context.drive.list_folder(
+                folder_id, mime_type=DOCUMENT_MIME_TYPE, limit=limit
+            )
+            if not listed["success"]:
+                raise Exception(f"Failed to list folder: {listed.get('error', 'Unknown error')}")
+            if listed["truncated"]:
+                raise ValueError(f"Folder holds more than {limit} documents")
+            document_ids = document_ids + [file["id"] for file in listed["files"]]
+
+        document_ids = list(dict.fromkeys(document_ids))
+        if not document_ids and not folder_id:
+            raise ValueError("document_ids, folder_id or folder_path is required")
+
+        if len(document_ids) > limit:
+            raise ValueError(f"At most {limit} documents can be updated in one call")
+
+        logger.debug(f"Updating {len(document_ids)} documents with {len(requests)} requests each")
+        result = await context.docs.batch_update_many(
+            document_ids=document_ids,
+            requests=requests,
+            substitutions=substitutions,
+            max_concurrency=self.config.docs.fan_out_concurrency,
+        )
+        logger.debug(f"Fan-out done - {result['succeeded']} updated, {result['failed']} failed")
+        return result
+
     async def _handle_sheets_create(
         self, context: GoogleWorkspaceContext, arguments: dict
     ) -> Dict[str, Any]:
@@ -470,13 +1408,14 @@ class GoogleWorkspaceMCPServer:
         """Handle sheets get values requests."""
         spreadsheet_id = arguments.get("spreadsheet_id")
         range_name = arguments.get("range")
+        fields = arguments.get("fields")
 
         if not spreadsheet_id or not range_name:
             raise ValueError("Both spreadsheet_id and range are required")
 
         logger.debug(f"Getting sheet values - ID: {spreadsheet_id}, Range: {range_name}")
         result = await context.sheets.get_values(
-            spreadsheet_id=spreadsheet_id, range_name=range_name
+            spreadsheet_id=spreadsheet_id, range_name=range_name, fields=fields
         )
         logger.debug(f"Sheet values retrieved - Row count: {len(result.get('values', []))}")
         return result
@@ -499,15 +1438,25 @@ class GoogleWorkspaceMCPServer:
         logger.debug(f"Sheet values updated - Updated cells: {result.get('updatedCells', 0)}")
         return result
 
+    async def _handle_fetch_more(
+        self, context: GoogleWorkspaceContext, arguments: dict
+    ) -> Dict[str, Any]:
+        """Handle continuation token requests."""
+        token = arguments.get("continuation_token")
+
+        if not token:
+            raise ValueError("continuation_token is required")
+
+        logger.debug(f"Fetching more of a paged result - Token: {token}")
+        return self.pager.fetch(token, arguments.get(MAX_RESULT_CHARS_ARGUMENT))
+
     def list_tools_table(self) -> str:
         """List available tools in a table format."""
         try:
+            from tabulate import tabulate
+
             # Prepare tool information for display
-            tool_info = []
-            for name, _handler in self._tool_registry.items():
-                tool_schema = next((t for t in self._get_tools_list() if t.name == name), None)
-                if tool_schema:
-                    tool_info.append([name, tool_schema.description])
+            tool_info = [[tool.name, tool.description] for tool in self.registry.tools]
 
             return tabulate(tool_info, headers=["Tool", "Description"], tablefmt="grid")
         except Exception as e:
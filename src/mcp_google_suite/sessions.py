@@ -0,0 +1,91 @@
+"""Process-wide service context shared by MCP sessions and HTTP requests."""
+
+import threading
+import time
+import uuid
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, Generic, Optional, TypeVar
+
+
+ContextT = TypeVar("ContextT")
+
+
+@dataclass
+class SessionState:
+    """State that belongs to one MCP connection rather than to the shared context."""
+
+    transport: str
+    session_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    opened: float = field(default_factory=time.time)
+    tool_calls: int = 0
+
+
+current_session: ContextVar[Optional[SessionState]] = ContextVar("current_session", default=None)
+
+
+class ContextPool(Generic[ContextT]):
+    """Holds the one service context of the process and counts who is using it.
+
+    The context (credentials, API clients, caches) is built once, on first
+    use or at application startup, and is shared by every session and HTTP
+    request. Sessions only add and remove their own ``SessionState``, so a
+    disconnect never tears down the context another session is using.
+    """
+
+    def __init__(self, factory: Callable[[], ContextT]):
+        self._factory = factory
+        self._context: Optional[ContextT] = None
+        # A plain lock: building the context does no I/O, and HTTP requests may
+        # arrive from more than one thread (e.g. test clients)
+        self._lock = threading.Lock()
+        self.refs = 0
+        self.sessions: Dict[str, SessionState] = {}
+        self.created = 0
+
+    @property
+    def current(self) -> Optional[ContextT]:
+        """The shared context, or None if it has not been built yet."""
+        return self._context
+
+    def get(self) -> ContextT:
+        """Return the shared context, building it exactly once."""
+        if self._context is None:
+            with self._lock:
+                if self._context is None:
+                    self._context = self._factory()
+                    self.created += 1
+        return self._context
+
+    @asynccontextmanager
+    async def session(self, transport: str) -> AsyncIterator[SessionState]:
+        """Register a session for the duration of a connection."""
+        self.get()
+        state = SessionState(transport=transport)
+        self.refs += 1
+        self.sessions[state.session_id] = state
+        token = current_session.set(state)
+        try:
+            yield state
+        finally:
+            current_session.reset(token)
+            self.sessions.pop(state.session_id, None)
+            self.refs -= 1
+
+    def close(self) -> None:
+        """Drop the shared context once no session holds it (application shutdown)."""
+        if self.refs == 0:
+            self._context = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return reference and session counters."""
+        sessions: Dict[str, int] = {}
+        for state in self.sessions.values():
+            sessions[state.transport] = sessions.get(state.transport, 0) + 1
+        return {
+            "initialized": self._context is not None,
+            "created": self.created,
+            "refs": self.refs,
+            "sessions": sessions,
+        }
@@ -3,17 +3,21 @@ from typing import Any, Dict, List, Optional
 from googleapiclient.errors import HttpError
 
 from mcp_google_suite.base_service import BaseGoogleService
+from mcp_google_suite.fields import FieldsArgument, requested_names, resolve_fields
 
 
 class SheetsService(BaseGoogleService):
     """Google Sheets service implementation."""
 
-    def __init__(self, auth=None):
-        super().__init__("sheets", "v4", auth)
+    def __init__(self, auth=None, cache=None, limiter=None, metrics=None):
+        super().__init__("sheets", "v4", auth, cache, limiter, metrics)
 
-    def create_spreadsheet(self, title: str, sheets: Optional[List[str]] = None) -> Dict[str, Any]:
+    async def create_spreadsheet(
+        self, title: str, sheets: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
         """Create a new Google Spreadsheet with optional sheets."""
         try:
+            service = await self.get_service()
             spreadsheet_body = {"properties": {"title": title}}
 
             if sheets:
@@ -21,27 +25,33 @@ class SheetsService(BaseGoogleService):
                     {"properties": {"title": sheet_name}} for sheet_name in sheets
                 ]
 
-            spreadsheet = self.service.spreadsheets().create(body=spreadsheet_body).execute()
+            spreadsheet = await self.execute(service.spreadsheets().create(body=spreadsheet_body))
 
             return {"success": True, "spreadsheet": spreadsheet}
         except HttpError as error:
             return {"success": False, **self.handle_error(error)}
 
-    def get_values(self, spreadsheet_id: str, range_name: str) -> Dict[str, Any]:
+    async def get_values(
+        self, spreadsheet_id: str, range_name: str, fields: FieldsArgument = None
+    ) -> Dict[str, Any]:
         """Get values from a specific range in a spreadsheet."""
+        value_fields = resolve_fields("sheets.values", fields)
         try:
-            result = (
-                self.service.spreadsheets()
+            service = await self.get_service()
+            result = await self.execute(
+                service.spreadsheets()
                 .values()
-                .get(spreadsheetId=spreadsheet_id, range=range_name)
-                .execute()
+                .get(spreadsheetId=spreadsheet_id, range=range_name, fields=value_fields)
             )
 
-            return {"success": True, "values": result.get("values", [])}
+            selected = {
+                name: result[name] for name in requested_names(value_fields) if name in result
+            }
+            return {"success": True, "values": [], **selected}
         except HttpError as error:
             return {"success": False, **self.handle_error(error)}
 
-    def update_values(
+    async def update_values(
         self,
         spreadsheet_id: str,
         range_name: str,
@@ -50,10 +60,11 @@ class SheetsService(BaseGoogleService):
     ) -> Dict[str, Any]:
         """Update values in a specific range of a spreadsheet."""
         try:
+            service = await self.get_service()
             body = {"values": values, "majorDimension": major_dimension}
 
-            result = (
-                self.service.spreadsheets()
+            result = await self.execute(
+                service.spreadsheets()
                 .values()
                 .update(
                     spreadsheetId=spreadsheet_id,
@@ -61,14 +72,13 @@ class SheetsService(BaseGoogleService):
                     valueInputOption="USER_ENTERED",
                     body=body,
                 )
-                .execute()
             )
 
             return {"success": True, "result": result}
         except HttpError as error:
             return {"success": False, **self.handle_error(error)}
 
-    def append_values(
+    async def append_values(
         self,
         spreadsheet_id: str,
         range_name: str,
@@ -77,10 +87,11 @@ class SheetsService(BaseGoogleService):
     ) -> Dict[str, Any]:
         """Append values to a spreadsheet."""
         try:
+            service = await self.get_service()
             body = {"values": values, "majorDimension": major_dimension}
 
-            result = (
-                self.service.spreadsheets()
+            result = await self.execute(
+                service.spreadsheets()
                 .values()
                 .append(
                     spreadsheetId=spreadsheet_id,
@@ -88,21 +99,20 @@ class SheetsService(BaseGoogleService):
                     valueInputOption="USER_ENTERED",
                     body=body,
                 )
-                .execute()
             )
 
             return {"success": True, "result": result}
         except HttpError as error:
             return {"success": False, **self.handle_error(error)}
 
-    def clear_values(self, spreadsheet_id: str, range_name: str) -> Dict[str, Any]:
+    async def clear_values(self, spreadsheet_id: str, range_name: str) -> Dict[str, Any]:
         """Clear values from a specific range in a spreadsheet."""
         try:
-            result = (
-                self.service.spreadsheets()
+            service = await self.get_service()
+            result = await self.execute(
+                service.spreadsheets()
                 .values()
                 .clear(spreadsheetId=spreadsheet_id, range=range_name, body={})
-                .execute()
             )
 
             return {"success": True, "result": result}
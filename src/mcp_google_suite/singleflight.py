@@ -0,0 +1,54 @@
+"""Collapse identical concurrent tool calls into one upstream call."""
+
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Dict
+
+
+def call_key(tool_name: str, arguments: Dict[str, Any]) -> str:
+    """Build a key from the tool name and its arguments, ignoring order and unset values."""
+    normalized = {key: value for key, value in arguments.items() if value is not None}
+    encoded = json.dumps(normalized, sort_keys=True, separators=(",", ":"), default=str)
+    return f"{tool_name}:{encoded}"
+
+
+class SingleFlight:
+    """Shares the result of an in-flight call with identical calls that arrive meanwhile.
+
+    Nothing is kept once the call finishes, so this never serves stale data; it
+    only removes duplicate work during bursts. The shared call runs as its own
+    task, so a caller that gives up does not cancel it for the others.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, "asyncio.Future[Any]"] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    async def do(
+        self, tool_name: str, arguments: Dict[str, Any], call: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Return the result of ``call``, joining an identical call already in flight."""
+        key = call_key(tool_name, arguments)
+        stats = self._stats.setdefault(tool_name, {"calls": 0, "collapsed": 0})
+        stats["calls"] += 1
+
+        task = self._inflight.get(key)
+        if task is not None:
+            stats["collapsed"] += 1
+        else:
+            task = asyncio.ensure_future(call())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: "asyncio.Future[Any]") -> None:
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # retrieved here in case every caller has gone away
+
+    def stats(self) -> Dict[str, Any]:
+        """Return per-tool call and collapsed-call counters."""
+        return {
+            "inflight": len(self._inflight),
+            "tools": {name: dict(counters) for name, counters in self._stats.items()},
+        }
@@ -0,0 +1,55 @@
+"""Start-up timing for the ``--profile-startup`` launcher option."""
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, TextIO, Tuple
+
+
+PROFILE_ENV = "MCP_PROFILE_STARTUP"
+
+
+def profiling_requested(flag: bool = False) -> bool:
+    """Return True when start-up profiling is enabled by flag or environment."""
+    return flag or os.environ.get(PROFILE_ENV, "").lower() in ("1", "true", "yes")
+
+
+class StartupProfile:
+    """Records wall time and newly imported modules for each start-up phase.
+
+    Disabled profiles do no bookkeeping, so the launcher can use one
+    unconditionally.
+    """
+
+    def __init__(self, enabled: bool = False, stream: Optional[TextIO] = None):
+        self.enabled = enabled
+        self.stream = stream
+        self.phases: List[Tuple[str, float, int]] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as one phase."""
+        if not self.enabled:
+            yield
+            return
+        modules = len(sys.modules)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            self.phases.append((name, elapsed, len(sys.modules) - modules))
+
+    def report(self) -> None:
+        """Write the phase breakdown to stderr (stdout carries the stdio transport)."""
+        if not self.enabled:
+            return
+        stream = self.stream or sys.stderr
+        width = max((len(name) for name, _ms, _modules in self.phases), default=0)
+        lines = ["Startup profile:"]
+        for name, elapsed, modules in self.phases:
+            lines.append(f"  {name:<{width}}  {elapsed:8.1f} ms  +{modules} modules")
+        total = sum(elapsed for _name, elapsed, _modules in self.phases)
+        lines.append(f"  {'total':<{width}}  {total:8.1f} ms  {len(sys.modules)} modules loaded")
+        print("\n".join(lines), file=stream, flush=True)
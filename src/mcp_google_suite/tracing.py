@@ -0,0 +1,387 @@
+"""Lightweight per-call tracing with W3C trace context and batched exporters."""
+
+import abc
+import json
+import logging
+import os
+import queue
+import random
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from mcp_google_suite.config import TracingConfig
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TRACE_FILE = os.path.join(tempfile.gettempdir(), "mcp-google-suite-traces.jsonl")
+TRACEPARENT_HEADER = "traceparent"
+# Spans written per batch and the longest a finished span waits to be written
+EXPORT_BATCH_SIZE = 512
+EXPORT_INTERVAL_SECONDS = 1.0
+# Sizes in bytes of the IDs in a traceparent header, which holds them as hex
+TRACE_ID_SIZE = 16
+SPAN_ID_SIZE = 8
+TRACEPARENT_FIELDS = 4
+# Width of the version and flags fields
+BYTE_HEX = 2
+
+
+def _new_id(size: int) -> str:
+    return os.urandom(size).hex()
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[Tuple[str, str, bool]]:
+    """Return ``(trace_id, parent_id, sampled)`` from a W3C ``traceparent`` header."""
+    if not header:
+        return None
+    parts = header.strip().lower().split("-")
+    if len(parts) < TRACEPARENT_FIELDS or len(parts[0]) != BYTE_HEX or parts[0] == "ff":
+        return None
+    version, trace_id, parent_id, flags = parts[:TRACEPARENT_FIELDS]
+    if (
+        len(trace_id) != 2 * TRACE_ID_SIZE
+        or len(parent_id) != 2 * SPAN_ID_SIZE
+        or len(flags) != BYTE_HEX
+    ):
+        return None
+    try:
+        int(trace_id, 16), int(parent_id, 16), int(version, 16)
+        sampled = bool(int(flags, 16) & 1)
+    except ValueError:
+        return None
+    if not int(trace_id, 16) or not int(parent_id, 16):
+        return None
+    return trace_id, parent_id, sampled
+
+
+class Span:
+    """One timed operation; ended spans are handed to the tracer's exporters."""
+
+    __slots__ = (
+        "attributes",
+        "end_ns",
+        "error",
+        "name",
+        "parent_id",
+        "span_id",
+        "start_ns",
+        "trace_id",
+        "tracer",
+    )
+
+    def __init__(  # noqa: PLR0913 - one argument per span field set by the caller
+        self,
+        tracer: "Tracer",
+        name: str,
+        trace_id: str,
+        parent_id: Optional[str] = None,
+        start_ns: Optional[int] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+    ):
+        self.tracer = tracer
+        self.trace_id = trace_id
+        self.span_id = _new_id(SPAN_ID_SIZE)
+        self.parent_id = parent_id
+        self.name = name
+        self.start_ns = start_ns if start_ns is not None else time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes or {}
+        self.error: Optional[str] = None
+
+    def set(self, key: str, value: Any) -> None:
+        """Set an attribute."""
+        self.attributes[key] = value
+
+    def child(self, name: str, start_ns: Optional[int] = None, **attributes: Any) -> "Span":
+        """Start a child span; the caller must ``end`` it."""
+        return Span(self.tracer, name, self.trace_id, self.span_id, start_ns, attributes)
+
+    def record(
+        self, name: str, start_ns: int, end_ns: Optional[int] = None, **attributes: Any
+    ) -> "Span":
+        """Add an already finished child span, e.g. a measured wait."""
+        span = self.child(name, start_ns, **attributes)
+        span.end(end_ns)
+        return span
+
+    def end(self, end_ns: Optional[int] = None) -> None:
+        if self.end_ns is None:
+            self.end_ns = end_ns if end_ns is not None else time.time_ns()
+            self.tracer.export(self)
+
+    @property
+    def traceparent(self) -> str:
+        """This span as a W3C ``traceparent`` header value."""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round(((self.end_ns or self.start_ns) - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+@contextmanager
+def _activate(span: Span) -> Iterator[Span]:
+    token = current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.error = type(e).__name__
+        raise
+    finally:
+        current_span.reset(token)
+        span.end()
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """Trace a block as a child of the current span.
+
+    Outside a sampled trace this yields None and records nothing, so
+    instrumented code costs one context variable lookup when tracing is off.
+    """
+    parent = current_span.get()
+    if parent is None:
+        yield None
+        return
+    with _activate(parent.child(name, **attributes)) as child:
+        yield child
+
+
+def record(name: str, start_ns: int, end_ns: Optional[int] = None, **attributes: Any) -> None:
+    """Add a finished child span to the current span, if there is one."""
+    parent = current_span.get()
+    if parent is not None:
+        parent.record(name, start_ns, end_ns, **attributes)
+
+
+class SpanExporter(abc.ABC):
+    """Writes finished spans in batches from a background thread.
+
+    The event loop only enqueues a span; file or network I/O happens on the
+    exporter thread, which is started with the first span.
+    """
+
+    def __init__(self):
+        self._queue: "queue.SimpleQueue[Span]" = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.exported = 0
+        self.failed = 0
+
+    def export(self, span: Span) -> None:
+        self._queue.put(span)
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name=type(self).__name__, daemon=True
+                    )
+                    self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(EXPORT_INTERVAL_SECONDS)
+            self.flush()
+
+    def flush(self) -> None:
+        """Write every queued span now."""
+        with self._lock:
+            while True:
+                batch: List[Span] = []
+                while len(batch) < EXPORT_BATCH_SIZE:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if not batch:
+                    return
+                try:
+                    self.write(batch)
+                    self.exported += len(batch)
+                except Exception as e:
+                    self.failed += len(batch)
+                    logger.warning(f"Could not export {len(batch)} spans: {str(e)}")
+
+    @abc.abstractmethod
+    def write(self, spans: List[Span]) -> None:
+        """Write one batch of spans; raising counts the whole batch as failed."""
+
+
+class JsonlSpanExporter(SpanExporter):
+    """Appends one JSON object per span to a local file."""
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = os.path.expanduser(path)
+
+    def write(self, spans: List[Span]) -> None:
+        lines = "".join(json.dumps(span.to_dict(), default=str) + "\n" for span in spans)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class OtlpSpanExporter(SpanExporter):
+    """Posts spans to an OTLP/HTTP collector using the JSON encoding."""
+
+    def __init__(self, endpoint: str, service_name: str, timeout: float = 5.0):
+        super().__init__()
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.timeout = timeout
+
+    def _span(self, span: Span) -> Dict[str, Any]:
+        attributes = [
+            {"key": key, "value": _otlp_value(value)} for key, value in span.attributes.items()
+        ]
+        encoded = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 1,
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": attributes,
+            "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+        }
+        if span.parent_id:
+            encoded["parentSpanId"] = span.parent_id
+        return encoded
+
+    def write(self, spans: List[Span]) -> None:
+        import urllib.request
+
+        payload = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {"key": "service.name", "value": _otlp_value(self.service_name)}
+                        ]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "mcp_google_suite"},
+                            "spans": [self._span(span) for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+        request = urllib.request.Request(
+            self.endpoint,
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+class Tracer:
+    """Starts traces for tool calls and sends finished spans to the exporters.
+
+    Child spans find their parent through a context variable, so services do
+    not need a tracer of their own: they call ``tracing.span`` and get a span
+    only while a sampled trace is active.
+    """
+
+    def __init__(self, config: Optional[TracingConfig] = None):
+        self.config = config or TracingConfig()
+        self.enabled = self.config.enabled
+        self.exporters: List[SpanExporter] = []
+        if self.enabled:
+            if self.config.file_path or not self.config.otlp_endpoint:
+                path = self.config.file_path or DEFAULT_TRACE_FILE
+                self.exporters.append(JsonlSpanExporter(path))
+            if self.config.otlp_endpoint:
+                self.exporters.append(
+                    OtlpSpanExporter(self.config.otlp_endpoint, self.config.service_name)
+                )
+        self.started = 0
+        self.sampled_out = 0
+
+    @classmethod
+    def from_config(cls, config: TracingConfig) -> "Tracer":
+        """Create a tracer from configuration settings."""
+        return cls(config)
+
+    @contextmanager
+    def trace(
+        self, name: str, traceparent: Optional[str] = None, **attributes: Any
+    ) -> Iterator[Optional[Span]]:
+        """Trace a block, as a child of the current span or as the root of a new trace.
+
+        A valid ``traceparent`` continues the caller's trace and follows its
+        sampling decision; otherwise ``sample_rate`` decides.
+        """
+        parent = current_span.get()
+        if parent is not None:
+            with _activate(parent.child(name, **attributes)) as child:
+                yield child
+            return
+
+        if not self.enabled:
+            yield None
+            return
+        incoming = parse_traceparent(traceparent)
+        if incoming is not None:
+            trace_id, parent_id, sampled = incoming
+        else:
+            trace_id, parent_id = _new_id(TRACE_ID_SIZE), None
+            sampled = random.random() < self.config.sample_rate
+        if not sampled:
+            self.sampled_out += 1
+            yield None
+            return
+
+        self.started += 1
+        with _activate(Span(self, name, trace_id, parent_id, attributes=attributes)) as root:
+            yield root
+
+    def export(self, span: Span) -> None:
+        for exporter in self.exporters:
+            exporter.export(span)
+
+    def flush(self) -> None:
+        """Write all finished spans now (e.g. at shutdown)."""
+        for exporter in self.exporters:
+            exporter.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return trace and exporter counters."""
+        return {
+            "enabled": self.enabled,
+            "traces": self.started,
+            "sampled_out": self.sampled_out,
+            "exporters": {
+                type(exporter).__name__: {"exported": exporter.exported, "failed": exporter.failed}
+                for exporter in self.exporters
+            },
+        }
@@ -1,170 +1,349 @@
-"""
-Модуль: web_app
-Призначення: HTTP-адаптер для MCP Google Workspace Server
-Залежності: mcp.server, starlette, GoogleWorkspaceMCPServer
-Експортує: create_web_app функцію для створення Starlette додатку з HTTP ендпоінтами
+"""HTTP adapter for the MCP Google Workspace server.
+
+Provides create_web_app, which builds the Starlette application with the HTTP
+endpoints, and the create_app factory used to run several uvicorn workers.
 """
 
+import asyncio
 import json
 import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, Tuple
+
 from mcp.server.sse import SseServerTransport
 from mcp.server.websocket import websocket_server
 from starlette.applications import Starlette
 from starlette.requests import Request
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, Response, StreamingResponse
 from starlette.routing import Mount, Route, WebSocketRoute
 
-from mcp_google_suite.server import GoogleWorkspaceMCPServer, GoogleWorkspaceContext
-from mcp_google_suite.auth.google_auth import GoogleAuth
-from mcp_google_suite.docs.service import DocsService
-from mcp_google_suite.drive.service import DriveService
-from mcp_google_suite.sheets.service import SheetsService
+from mcp_google_suite import tracing
+from mcp_google_suite.admission import OverloadedError
+from mcp_google_suite.config import Config
+from mcp_google_suite.idempotency import IDEMPOTENCY_KEY_ARGUMENT, IdempotencyConflictError
+from mcp_google_suite.localdirs import shared_directory
+from mcp_google_suite.logs import configure_logging
+from mcp_google_suite.metrics import CONTENT_TYPE
+from mcp_google_suite.ratelimit import RateLimitedError
+from mcp_google_suite.server import GoogleWorkspaceMCPServer
+from mcp_google_suite.tracing import TRACEPARENT_HEADER
+
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Worker processes cannot receive arguments from the launcher, only environment
+CONFIG_PATH_ENV = "MCP_CONFIG_PATH"
+WORKERS_ENV = "MCP_WORKERS"
+
+
+class WorkerLoad:
+    """Load counters of one worker process, reported by the health check."""
+
+    def __init__(self, workers: int = 1):
+        self.workers = workers
+        self.started = time.monotonic()
+        self.in_flight = 0
+        self.requests = 0
+        self.sessions = 0
+
+    @asynccontextmanager
+    async def request(self):
+        """Count an HTTP tool invocation while it runs."""
+        self.in_flight += 1
+        self.requests += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
 
-def create_web_app(server: GoogleWorkspaceMCPServer) -> Starlette:
+    @asynccontextmanager
+    async def session(self):
+        """Count an open SSE or WebSocket session."""
+        self.sessions += 1
+        try:
+            yield
+        finally:
+            self.sessions -= 1
+
+    async def snapshot(self) -> dict:
+        """Return current counters plus the event loop scheduling delay."""
+        loop = asyncio.get_running_loop()
+        scheduled = loop.time()
+        ran = loop.create_future()
+        loop.call_soon(lambda: ran.set_result(loop.time()))
+        lag = await ran - scheduled
+        return {
+            "pid": os.getpid(),
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "sessions": self.sessions,
+            "loop_lag_ms": round(lag * 1000, 3),
+            "uptime_seconds": round(time.monotonic() - self.started, 1),
+        }
+
+
+def create_app() -> Starlette:
+    """Build the server and web app inside a uvicorn worker (``factory=True``).
+
+    Each worker gets its own server and Google Workspace context. With more
+    than one worker, state a later request may need on any worker is kept in
+    private local directories unless configured otherwise: refreshed access
+    tokens (so only one worker refreshes an expired token), idempotency
+    records and pagination spills.
+    """
+    workers = int(os.environ.get(WORKERS_ENV, "1"))
+    config = Config.load(os.environ.get(CONFIG_PATH_ENV) or None)
+    if workers > 1:
+        if not config.credentials.shared_token_dir:
+            config.credentials.shared_token_dir = shared_directory("tokens")
+        if config.idempotency.enabled and not config.idempotency.directory:
+            config.idempotency.directory = shared_directory("idempotency")
+        if config.pagination.enabled and not config.pagination.directory:
+            config.pagination.directory = shared_directory("spills")
+    configure_logging(config.logging)
+    return create_web_app(GoogleWorkspaceMCPServer(config=config), workers=workers)
+
+
+def create_web_app(server: GoogleWorkspaceMCPServer, workers: int = 1) -> Starlette:
     """Create a Starlette application with both SSE and WebSocket support."""
 
     # Initialize SSE transport
     sse = SseServerTransport("/messages/")
+    load = WorkerLoad(workers)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        """Build this worker's shared Google Workspace context before serving requests."""
+        server.contexts.get()
+        logger.info(f"Worker {os.getpid()}: initialized server context")
+        try:
+            yield
+        finally:
+            server.contexts.close()
+            server.tracer.flush()
 
     async def root(request):
         return JSONResponse({"message": "MCP Google Workspace Server", "status": "healthy"})
 
     async def health(request):
-        """Health check endpoint returning {"status": "ok"}."""
-        return JSONResponse({"status": "ok"})
+        """Health check endpoint returning {"status": "ok"} and this worker's load."""
+        return JSONResponse({"status": "ok", "worker": await load.snapshot()})
 
-    async def tools(request):
-        try:
-            tools_list = server._get_tools_list()
-            # Convert Tool objects to dictionaries for JSON serialization
-            tools_dict = [
-                {
-                    "name": tool.name,
-                    "description": tool.description,
-                    "inputSchema": tool.inputSchema
-                }
-                for tool in tools_list
-            ]
-            return JSONResponse({"tools": tools_dict})
-        except Exception as e:
-            return JSONResponse({"error": str(e)}, status_code=500)
+    async def metrics(request):
+        """Prometheus scrape endpoint for tool, upstream and cache metrics."""
+        if server.metrics is None:
+            return JSONResponse({"error": "Metrics are disabled"}, status_code=404)
+        return Response(server.metrics.render(), media_type=CONTENT_TYPE)
 
-    async def invoke_tool(request: Request):
-        """
-        HTTP-адаптер для виклику MCP інструментів.
-        Приймає POST запити з JSON тілом: {"tool_name": "...", "params": {...}}
-        Повертає результат виклику інструменту або помилку.
-        """
+    async def debug_profile(request):
+        """Capture a whole-process sampling profile and tracemalloc snapshot."""
+        if not server.config.profiling.debug_endpoints:
+            return JSONResponse({"error": "Debug endpoints are disabled"}, status_code=404)
         try:
-            # Parse request body
-            body = await request.json()
-            tool_name = body.get("tool_name")
-            params = body.get("params", {})
-
-            if not tool_name:
-                return JSONResponse(
-                    {"error": "Missing required field: tool_name"}, 
-                    status_code=400
-                )
-
-            logger.info(f"HTTP adapter invoking tool: {tool_name} with params: {params}")
-
-            # Handle special system tools
-            if tool_name == "system.list_tools":
-                tools = server._get_tools_list()
-                tool_names = [tool.name for tool in tools]
-                return JSONResponse({"tools": tool_names})
-
-            # Check if server context is initialized
-            if not server._context:
-                # Initialize context for HTTP requests (permanently)
-                auth = GoogleAuth(config=server.config)
-                drive = DriveService(auth)
-                docs = DocsService(auth)
-                sheets = SheetsService(auth)
-                server._context = GoogleWorkspaceContext(
-                    auth=auth, drive=drive, docs=docs, sheets=sheets
-                )
-                logger.info("HTTP adapter: Initialized server context for web requests")
-
-            return await _execute_tool(server, tool_name, params)
-
-        except json.JSONDecodeError:
-            return JSONResponse(
-                {"error": "Invalid JSON in request body"}, 
-                status_code=400
-            )
-        except Exception as e:
-            logger.error(f"Error invoking tool {tool_name}: {str(e)}", exc_info=True)
-            return JSONResponse(
-                {"error": f"Tool execution failed: {str(e)}"}, 
-                status_code=500
-            )
-
-    async def _execute_tool(server: GoogleWorkspaceMCPServer, tool_name: str, params: dict):
-        """Execute a tool using the server's internal logic."""
+            seconds = float(request.query_params.get("seconds", "10"))
+        except ValueError:
+            return JSONResponse({"error": "seconds must be a number"}, status_code=400)
         try:
-            # Check if tool exists
-            handler = server._tool_registry.get(tool_name)
-            if not handler:
-                available_tools = list(server._tool_registry.keys())
-                return JSONResponse(
-                    {
-                        "error": f"Unknown tool: {tool_name}",
-                        "available_tools": available_tools
-                    }, 
-                    status_code=404
-                )
-
-            # Check authentication
-            is_authorized = await server._context.auth.is_authorized()
-            if not is_authorized:
-                return JSONResponse(
-                    {"error": "Not authenticated. Please run 'mcp-google auth' first."}, 
-                    status_code=401
-                )
-
-            # Execute the tool
-            result = await handler(server._context, params)
-            
-            logger.info(f"Tool {tool_name} executed successfully")
-            return JSONResponse({"result": result})
-
+            return JSONResponse(await server.profiler.capture(seconds))
         except ValueError as e:
-            return JSONResponse(
-                {"error": f"Invalid parameters: {str(e)}"}, 
-                status_code=400
-            )
-        except Exception as e:
-            logger.error(f"Tool execution error: {str(e)}", exc_info=True)
-            return JSONResponse(
-                {"error": f"Tool execution failed: {str(e)}"}, 
-                status_code=500
-            )
+            return JSONResponse({"error": str(e)}, status_code=409)
+
+    async def tools(request):
+        """Serve the pre-serialized tool list, answering revalidations with 304."""
+        registry = server.registry
+        headers = {"ETag": registry.etag, "Cache-Control": "no-cache"}
+        if request.headers.get("if-none-match") == registry.etag:
+            return Response(status_code=304, headers=headers)
+        return Response(registry.payload, media_type="application/json", headers=headers)
+
+    system_tools = _system_tools(server)
+
+    async def invoke_tool(request: Request):
+        """HTTP adapter for calling MCP tools.
+
+        Accepts POST requests with a JSON body ``{"tool_name": "...", "params": {...}}``
+        and returns the tool result or an error.
+        """
+        return await _invoke_tool(server, load, system_tools, request)
 
     async def handle_sse(request):
         """Handle SSE connections."""
-        async with sse.connect_sse(request.scope, request.receive, request._send) as streams:
-            await server.run(streams[0], streams[1])
+        async with (
+            load.session(),
+            sse.connect_sse(request.scope, request.receive, request._send) as streams,
+        ):
+            await server.run(streams[0], streams[1], transport="sse")
 
     async def handle_websocket(websocket):
         """Handle WebSocket connections."""
-        async with websocket_server(websocket.scope, websocket.receive, websocket.send) as streams:
-            await server.run(streams[0], streams[1])
+        async with (
+            load.session(),
+            websocket_server(websocket.scope, websocket.receive, websocket.send) as streams,
+        ):
+            await server.run(streams[0], streams[1], transport="ws")
 
     # Define routes for both SSE and WebSocket
     routes = [
         Route("/", endpoint=root),
         Route("/health", endpoint=health),
         Route("/tools", endpoint=tools),
+        Route("/metrics", endpoint=metrics),
+        Route("/debug/profile", endpoint=debug_profile),
         Route("/invoke-tool", endpoint=invoke_tool, methods=["POST"]),
         Route("/sse", endpoint=handle_sse),
         Mount("/messages", app=sse.handle_post_message),
         WebSocketRoute("/ws", endpoint=handle_websocket),
     ]
 
-    return Starlette(routes=routes)
+    return Starlette(routes=routes, lifespan=lifespan)
+
+
+async def _invoke_tool(
+    server: GoogleWorkspaceMCPServer,
+    load: WorkerLoad,
+    system_tools: Dict[str, Tuple[str, Callable[[], Any]]],
+    request: Request,
+) -> Response:
+    """Answer one /invoke-tool request."""
+    tool_name = None
+    try:
+        # Parse request body
+        body = await request.json()
+        tool_name = body.get("tool_name")
+        params = body.get("params", {})
+        stream = bool(body.get("stream", False))
+        idempotency_key = request.headers.get("idempotency-key") or body.get(
+            IDEMPOTENCY_KEY_ARGUMENT
+        )
+        if idempotency_key:
+            params = {**params, IDEMPOTENCY_KEY_ARGUMENT: idempotency_key}
+
+        if not tool_name:
+            return JSONResponse({"error": "Missing required field: tool_name"}, status_code=400)
+
+        logger.debug("HTTP adapter invoking tool: %s", tool_name)
+
+        # Special system tools are answered by the adapter itself
+        system_tool = system_tools.get(tool_name)
+        if system_tool is not None:
+            key, read = system_tool
+            return JSONResponse({key: read()})
+
+        async with load.request():
+            with server.tracer.trace(
+                "http.invoke_tool",
+                traceparent=request.headers.get(TRACEPARENT_HEADER),
+                tool=tool_name,
+            ) as span:
+                response = await _execute_tool(server, tool_name, params, stream)
+                if span is not None:
+                    span.set("http.status_code", response.status_code)
+                    response.headers[TRACEPARENT_HEADER] = span.traceparent
+                return response
+
+    except json.JSONDecodeError:
+        return JSONResponse({"error": "Invalid JSON in request body"}, status_code=400)
+    except Exception as e:
+        logger.error(f"Error invoking tool {tool_name}: {str(e)}", exc_info=True)
+        return JSONResponse({"error": f"Tool execution failed: {str(e)}"}, status_code=500)
+
+
+def _system_tools(server: GoogleWorkspaceMCPServer) -> Dict[str, Tuple[str, Callable[[], Any]]]:
+    """Map each special system tool to its response key and what it reports."""
+    return {
+        "system.list_tools": ("tools", lambda: list(server.registry.names)),
+        "system.cache_stats": ("cache", lambda: server.response_cache.stats()),
+        "system.serialization_stats": ("serialization", lambda: server.serializer.stats()),
+        "system.admission_stats": ("admission", lambda: server.admission.stats()),
+        "system.rate_limit_stats": ("rate_limit", lambda: server.rate_limiter.stats()),
+        "system.singleflight_stats": ("singleflight", lambda: server.singleflight.stats()),
+        "system.idempotency_stats": ("idempotency", lambda: server.idempotency.stats()),
+        "system.pagination_stats": ("pagination", lambda: server.pager.stats()),
+        "system.docs_index_stats": (
+            "docs_index",
+            lambda: server.contexts.get().docs.index_stats(),
+        ),
+        "system.session_stats": ("sessions", lambda: server.contexts.stats()),
+        "system.trace_stats": ("tracing", lambda: server.tracer.stats()),
+        "system.profile_stats": ("profiling", lambda: server.profiler.stats()),
+        "system.log_stats": ("logging", lambda: server.call_log.stats()),
+    }
+
+
+def _result_response(
+    server: GoogleWorkspaceMCPServer, tool_name: str, result: Any, stream: bool
+) -> Response:
+    """Serialize a tool result, streaming it in chunks when requested or large."""
+    settings = server.config.serialization
+    envelope = {"result": result}
+
+    if stream:
+        chunks = server.serializer.iter_chunks(tool_name, envelope, settings.chunk_size)
+        return StreamingResponse(chunks, media_type="application/json")
+
+    with tracing.span("serialize") as span:
+        body = server.serializer.dumps(tool_name, envelope)
+        if span is not None:
+            span.set("bytes", len(body))
+    if len(body) <= settings.stream_threshold_bytes:
+        return Response(body, media_type="application/json")
+
+    view = memoryview(body)
+    chunks = (
+        view[start : start + settings.chunk_size]
+        for start in range(0, len(view), settings.chunk_size)
+    )
+    return StreamingResponse(chunks, media_type="application/json")
+
+
+async def _execute_tool(
+    server: GoogleWorkspaceMCPServer, tool_name: str, params: dict, stream: bool = False
+) -> Response:
+    """Execute a tool using the server's internal logic."""
+    try:
+        # Check if tool exists
+        handler = server.registry.get(tool_name)
+        if not handler:
+            return JSONResponse(
+                {
+                    "error": f"Unknown tool: {tool_name}",
+                    "available_tools": list(server.registry.names),
+                },
+                status_code=404,
+            )
+
+        # Check authentication
+        context = server.contexts.get()
+        with tracing.span("auth.check"):
+            is_authorized = await context.auth.is_authorized()
+        if not is_authorized:
+            return JSONResponse(
+                {"error": "Not authenticated. Please run 'mcp-google auth' first."},
+                status_code=401,
+            )
+
+        # Execute the tool
+        result = await server.run_tool(tool_name, handler, context, params)
+        return _result_response(server, tool_name, result, stream)
+    except Exception as e:
+        return _error_response(e)
+
+
+def _error_response(error: Exception) -> JSONResponse:
+    """Map a failed tool call to its HTTP status."""
+    if isinstance(error, (OverloadedError, RateLimitedError)):
+        return JSONResponse(
+            {"error": str(error), "retry_after": error.retry_after},
+            status_code=429,
+            headers={"Retry-After": str(error.retry_after)},
+        )
+    if isinstance(error, IdempotencyConflictError):
+        return JSONResponse({"error": str(error)}, status_code=409)
+    if isinstance(error, ValueError):
+        return JSONResponse({"error": f"Invalid parameters: {str(error)}"}, status_code=400)
+    logger.error(f"Tool execution error: {str(error)}", exc_info=error)
+    return JSONResponse({"error": f"Tool execution failed: {str(error)}"}, status_code=500)
@@ -0,0 +1,41 @@
+"""Shared fixtures: a fake Google backend and a server whose clients use it."""
+
+import pytest
+
+from mcp_google_suite.config import Config
+from mcp_google_suite.fake import (
+    FakeGoogle,
+    create_fake_app,
+    discovery_url,
+    serve_in_thread,
+    write_fake_credentials,
+)
+from mcp_google_suite.server import GoogleWorkspaceMCPServer
+
+
+@pytest.fixture
+def fake_config():
+    """Config sections for the ``fake_google`` server; override in a module to change them."""
+    return {"rate_limit": {"enabled": False}}
+
+
+@pytest.fixture
+def fake_google(tmp_path, fake_config):
+    """An empty fake on a local port, a server whose clients use it and a tool runner."""
+    fake = FakeGoogle()
+    credentials = tmp_path / "credentials.json"
+    write_fake_credentials(str(credentials))
+    with serve_in_thread(create_fake_app(fake)) as base_url:
+        server = GoogleWorkspaceMCPServer(
+            Config(
+                credentials={"server_credentials": str(credentials)},
+                google_api={"discovery_url": discovery_url(base_url)},
+                **fake_config,
+            )
+        )
+
+        async def run(name, arguments):
+            handler = server.registry.get(name)
+            return await server.run_tool(name, handler, server.contexts.get(), arguments)
+
+        yield fake, server, run
@@ -0,0 +1,82 @@
+"""Tests for admission control."""
+
+import asyncio
+
+import pytest
+from starlette.testclient import TestClient
+
+from mcp_google_suite.admission import AdmissionController, OverloadedError
+from mcp_google_suite.config import AdmissionConfig, Config, ToolLimitConfig
+from mcp_google_suite.server import GoogleWorkspaceMCPServer
+from mcp_google_suite.web_app import create_web_app
+
+
+async def test_tool_limit_queues_then_rejects():
+    """Calls beyond the tool limit wait; calls beyond the queue are rejected at once."""
+    config = AdmissionConfig(
+        queue_timeout_seconds=1.0,
+        tools={"slow": ToolLimitConfig(max_concurrency=1, max_queue=1)},
+    )
+    admission = AdmissionController(config)
+    release = asyncio.Event()
+
+    async def call():
+        async with admission.admit("slow"):
+            await release.wait()
+
+    running = asyncio.create_task(call())
+    waiting = asyncio.create_task(call())
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(OverloadedError) as rejected:
+        async with admission.admit("slow"):
+            pass
+    assert rejected.value.reason == "queue full"
+    assert rejected.value.retry_after >= 1
+
+    # Other tools are unaffected by the saturated one
+    async with admission.admit("fast"):
+        pass
+
+    release.set()
+    await asyncio.gather(running, waiting)
+    stats = admission.stats()["tools"]["slow"]
+    assert stats["admitted"] == 2
+    assert stats["max_queued"] == 1
+    assert stats["rejected"]["queue_full"] == 1
+    assert stats["active"] == 0
+
+
+async def test_queue_timeout_frees_tool_slot():
+    """A call that times out waiting for the global gate gives back its tool slot."""
+    config = AdmissionConfig(max_concurrency=1, queue_timeout_seconds=0.01)
+    admission = AdmissionController(config)
+
+    async with admission.admit("a"):
+        with pytest.raises(OverloadedError) as rejected:
+            async with admission.admit("b"):
+                pass
+
+    assert rejected.value.reason == "queue timeout"
+    assert admission.gate("b").active == 0
+    assert admission.stats()["global"]["rejected"]["timeout"] == 1
+
+
+def test_invoke_tool_returns_429_when_saturated():
+    """The HTTP adapter answers a full queue with 429 and a Retry-After hint."""
+    config = Config(admission=AdmissionConfig(max_concurrency=1, max_queue=0))
+    server = GoogleWorkspaceMCPServer(config)
+    server.admission.global_gate._semaphore = asyncio.Semaphore(0)
+    context = server.contexts.get()
+
+    async def authorized():
+        return True
+
+    context.auth.is_authorized = authorized
+    client = TestClient(create_web_app(server))
+
+    response = client.post("/invoke-tool", json={"tool_name": "docs_create", "params": {}})
+
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+    assert response.json()["retry_after"] >= 1
@@ -0,0 +1,50 @@
+"""Tests for the ETag response cache."""
+
+from mcp_google_suite.cache import ResponseCache
+
+
+def test_lru_eviction_by_size():
+    """Entries over the byte budget evict the least recently used ones."""
+    cache = ResponseCache(max_bytes=10)
+    cache.put("a", '"1"', {"id": "a"}, 4)
+    cache.put("b", '"2"', {"id": "b"}, 4)
+    assert cache.get("a").etag == '"1"'
+
+    cache.put("c", '"3"', {"id": "c"}, 4)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] == 8
+
+
+def test_disabled_cache_stores_nothing():
+    """A disabled cache neither stores nor returns entries."""
+    cache = ResponseCache(enabled=False)
+    cache.put("a", '"1"', {}, 1)
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+
+
+async def test_repeated_read_is_revalidated_with_etag(fake_google):
+    """The second read sends If-None-Match and is answered from the cache on a 304."""
+    fake, server, _run = fake_google
+    document_id = fake.seed(documents=1, paragraphs=3)["documents"][0]
+    sent = []
+    dispatch = fake.dispatch
+
+    def recording_dispatch(method, path, query, body, headers):
+        result = dispatch(method, path, query, body, headers)
+        if path.startswith("/v1/documents/"):
+            sent.append((headers.get("if-none-match"), result[0]))
+        return result
+
+    fake.dispatch = recording_dispatch
+    docs = server.contexts.get().docs
+    first = await docs.get_document(document_id)
+    second = await docs.get_document(document_id)
+
+    assert second["document"] == first["document"]
+    etag = f'"{fake.documents[document_id].revision_id}"'
+    assert sent == [(None, 200), (etag, 304)]
+    assert server.response_cache.stats()["not_modified"] == 1
@@ -0,0 +1,51 @@
+"""Tests for applying one batch update to many documents."""
+
+import pytest
+
+from mcp_google_suite.docs.service import substitute
+from mcp_google_suite.drive.paths import FOLDER_MIME_TYPE
+
+
+def test_substitute_fills_known_placeholders_only():
+    """Placeholders are filled in nested strings; unknown, spaced ones and non-strings are kept."""
+    requests = [
+        {"insertText": {"location": {"index": 1}, "text": "Dear {{name}}, {{missing}} {{ name }}"}},
+        {"replaceAllText": {"containsText": {"text": "{{name}}"}, "replaceText": "{{total}}"}},
+    ]
+
+    assert substitute(requests, {"name": "Ada", "total": 3}) == [
+        {"insertText": {"location": {"index": 1}, "text": "Dear Ada, {{missing}} {{ name }}"}},
+        {"replaceAllText": {"containsText": {"text": "Ada"}, "replaceText": "3"}},
+    ]
+    assert requests[0]["insertText"]["text"] == "Dear {{name}}, {{missing}} {{ name }}"
+
+
+@pytest.fixture
+def fake_config():
+    """Update two documents at a time."""
+    return {"rate_limit": {"enabled": False}, "docs": {"fan_out_concurrency": 2}}
+
+
+async def test_fan_out_to_folder_isolates_failures(fake_google):
+    """Every document in the folder is updated once; an unknown ID fails on its own."""
+    fake, _server, run = fake_google
+    folder = fake._add_file("Letters", FOLDER_MIME_TYPE)["id"]
+    first, second = fake.seed(documents=2, paragraphs=0, folder=folder)["documents"]
+    fake.seed(documents=1, paragraphs=0)  # outside the folder
+    result = await run(
+        "docs_batch_update_many",
+        {
+            "document_ids": ["missing-document"],
+            "folder_path": "Letters",
+            "requests": [{"insertText": {"location": {"index": 1}, "text": "Dear {{name}}"}}],
+            "substitutions": {first: {"name": "Ada"}},
+        },
+    )
+
+    assert (result["success"], result["succeeded"], result["failed"]) == (False, 2, 1)
+    outcomes = {item["document_id"]: item for item in result["results"]}
+    assert outcomes["missing-document"]["status"] == 404
+    assert outcomes[first]["success"] and outcomes[second]["success"]
+    assert fake.documents[first].text == "Dear Ada\n"
+    assert fake.documents[second].text == "Dear {{name}}\n"
+    assert fake.stats()["requests"]["docs.documents.batchUpdate"] == 2
@@ -0,0 +1,100 @@
+"""Tests for compiling Markdown into Docs batchUpdate requests."""
+
+from mcp_google_suite.docs.markdown import compile_markdown, parse_inline
+
+
+def kinds(requests):
+    return [next(iter(request)) for request in requests]
+
+
+def test_inline_styles_nest_and_escape():
+    """Emphasis nests, code spans are literal, and snake_case is not italic."""
+    assert parse_inline("a **b *c*** `d*e*` [f](http://x) snake_case_name \\*g\\*") == [
+        ("a ", {}),
+        ("b ", {"bold": True}),
+        ("c", {"bold": True, "italic": True}),
+        (" ", {}),
+        ("d*e*", {"code": True}),
+        (" ", {}),
+        ("f", {"link": "http://x"}),
+        (" snake_case_name ", {}),
+        ("*", {}),
+        ("g", {}),
+        ("*", {}),
+    ]
+
+
+def test_compile_merges_ranges_and_counts_utf16():
+    """One insert, merged style ranges, and indexes that count surrogate pairs twice."""
+    markdown = "# Title 😀\n\nSome **bold** text\nwrapped line\n\n- one **two**\n- **three**\n"
+
+    requests = compile_markdown(markdown, 10)
+
+    assert requests[0] == {
+        "insertText": {
+            "location": {"index": 10},
+            "text": "Title 😀\nSome bold text wrapped line\none two\nthree",
+        }
+    }
+    assert kinds(requests) == [
+        "insertText",
+        "updateTextStyle",
+        "updateParagraphStyle",
+        "updateParagraphStyle",
+        "updateTextStyle",
+        "updateTextStyle",
+        "createParagraphBullets",
+    ]
+    # "Title 😀\n" is 9 code units, so the second paragraph starts at 19
+    assert requests[3]["updateParagraphStyle"]["range"] == {"startIndex": 10, "endIndex": 19}
+    assert requests[4]["updateTextStyle"]["range"] == {"startIndex": 24, "endIndex": 28}
+    # "two" and "three" are only separated by a paragraph break: one range
+    assert requests[5]["updateTextStyle"] == {
+        "range": {"startIndex": 51, "endIndex": 60},
+        "textStyle": {"bold": True},
+        "fields": "bold",
+    }
+    assert requests[6]["createParagraphBullets"]["range"] == {"startIndex": 47, "endIndex": 61}
+    assert compile_markdown("\n\n", 1) == []
+
+
+def test_nested_lists_and_code_blocks():
+    """Nesting becomes leading tabs and code lines share one font range."""
+    requests = compile_markdown("1. a\n   - b\n\n```\nx = 1\ny = 2\n```", 1, new_paragraph=True)
+
+    assert requests[0]["insertText"]["text"] == "\na\n\tb\nx = 1\ny = 2"
+    styles = [r["updateTextStyle"] for r in requests if "updateTextStyle" in r]
+    code = [style["range"] for style in styles if "weightedFontFamily" in style["textStyle"]]
+    assert code == [{"startIndex": 7, "endIndex": 18}]
+    bullets = [r["createParagraphBullets"] for r in requests if "createParagraphBullets" in r]
+    assert [(b["range"]["startIndex"], b["bulletPreset"]) for b in bullets] == [
+        (4, "BULLET_DISC_CIRCLE_SQUARE"),
+        (2, "NUMBERED_DECIMAL_ALPHA_ROMAN"),
+    ]
+
+
+async def test_append_formatted_text_is_one_batch_update(fake_google):
+    """The fake document gets headings, bold and bullets from a single batchUpdate."""
+    fake, _server, run = fake_google
+    document_id = fake.seed(documents=1, paragraphs=0)["documents"][0]
+    fake.documents[document_id].batch_update(
+        [{"insertText": {"location": {"index": 1}, "text": "Existing"}}]
+    )
+    result = await run(
+        "docs_append_formatted_text",
+        {"document_id": document_id, "text_content": "## Notes\n\n- **Done** item\n- next"},
+    )
+
+    document = fake.documents[document_id]
+    assert result["success"]
+    assert fake.stats()["requests"]["docs.documents.batchUpdate"] == 1
+    assert document.text == "Existing\nNotes\nDone item\nnext\n"
+    styles = [p["paragraphStyle"]["namedStyleType"] for p in document.paragraphs]
+    assert styles == ["NORMAL_TEXT", "HEADING_2", "NORMAL_TEXT", "NORMAL_TEXT"]
+    assert ["bullet" in p for p in document.paragraphs] == [False, False, True, True]
+    bold = [
+        char
+        for char, style in zip(document.text, document.char_styles, strict=True)
+        if style.get("bold")
+    ]
+    assert "".join(bold) == "Done"
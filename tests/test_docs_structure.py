@@ -0,0 +1,198 @@
+"""Tests for the document structure index and the outline, section and find tools."""
+
+import pytest
+
+from mcp_google_suite.docs.structure import build_index
+
+
+def paragraph(start, text="", style="NORMAL_TEXT", runs=None):
+    """A body paragraph; ``runs`` lists (start index, text) when not one plain run."""
+    runs = runs or [(start, text)]
+    elements = [{"startIndex": index, "textRun": {"content": run}} for index, run in runs]
+    end = runs[-1][0] + len(runs[-1][1].encode("utf-16-le")) // 2
+    return {
+        "startIndex": start,
+        "endIndex": end,
+        "paragraph": {"paragraphStyle": {"namedStyleType": style}, "elements": elements},
+    }
+
+
+def sample_document():
+    # "Intro 😀 text\n" holds a surrogate pair; an inline image at 33 splits "Run setup now"
+    return {
+        "documentId": "d1",
+        "revisionId": "r1",
+        "title": "Guide",
+        "body": {
+            "content": [
+                {"endIndex": 1, "sectionBreak": {}},
+                paragraph(1, "Guide\n", "TITLE"),
+                paragraph(7, "Intro 😀 text\n"),
+                paragraph(21, "Install\n", "HEADING_1"),
+                paragraph(29, runs=[(29, "Run "), (34, "setup now\n")]),
+                {
+                    "startIndex": 44,
+                    "endIndex": 60,
+                    "table": {
+                        "rows": 1,
+                        "columns": 2,
+                        "tableRows": [
+                            {
+                                "tableCells": [
+                                    {"content": [paragraph(46, "key\n")]},
+                                    {"content": [paragraph(52, "setup\n")]},
+                                ]
+                            }
+                        ],
+                    },
+                },
+                paragraph(60, "Options\n", "HEADING_2"),
+                paragraph(68, "Usage\n", "HEADING_1"),
+                paragraph(74, "Done\n"),
+            ]
+        },
+    }
+
+
+def test_outline_and_sections():
+    """Sections run to the next heading of the same level and include tables."""
+    index = build_index(sample_document())
+
+    outline = index.outline()
+    headings = [
+        (h["text"], h["level"], h["start_index"], h["end_index"]) for h in outline["headings"]
+    ]
+    assert headings == [
+        ("Guide", 0, 1, 79),
+        ("Install", 1, 21, 68),
+        ("Options", 2, 60, 68),
+        ("Usage", 1, 68, 79),
+    ]
+    assert outline["tables"] == [
+        {
+            "type": "table",
+            "start_index": 44,
+            "end_index": 60,
+            "style": "TABLE",
+            "rows": 1,
+            "columns": 2,
+            "section": "Install",
+        }
+    ]
+    assert [h["text"] for h in index.outline(max_level=1)["headings"]] == [
+        "Guide",
+        "Install",
+        "Usage",
+    ]
+
+    section = index.section(index.find_heading("install"))
+    assert (section["start_index"], section["end_index"]) == (21, 68)
+    assert section["content"] == "Install\nRun setup now\nkey\tsetup\nOptions\n"
+    assert [block["type"] for block in section["blocks"]] == [
+        "heading",
+        "paragraph",
+        "table",
+        "heading",
+    ]
+    alone = index.section(index.find_heading(number=1), include_subsections=False)
+    assert alone["end_index"] == 60
+
+    with pytest.raises(ValueError, match="No heading"):
+        index.find_heading("missing")
+    index.find_heading("us")  # unique partial match
+    with pytest.raises(ValueError, match="several headings"):
+        index.find_heading("i")
+
+
+def test_find_maps_offsets_to_utf16_indexes():
+    """Matches after surrogate pairs and inline objects get the document's own indexes."""
+    index = build_index(sample_document())
+
+    text = index.find("text")
+    assert text["matches"][0]["start_index"] == 16  # after the two code units of 😀
+    assert text["matches"][0]["end_index"] == 20
+
+    setup = index.find("SETUP", limit=1)
+    assert setup["total"] == 2
+    assert setup["matches"] == [
+        {
+            "start_index": 34,
+            "end_index": 39,
+            "text": "setup",
+            "context": "Run setup now",
+            "block": "paragraph",
+            "section": "Install",
+        }
+    ]
+    assert index.find("setup")["matches"][1]["block"] == "table"
+    assert index.find("SETUP", match_case=True)["total"] == 0
+
+
+@pytest.fixture
+def fake_docs(fake_google):
+    """A fake document with headings and a server whose clients use the fake."""
+    fake, server, run = fake_google
+    document_id = fake.seed(documents=1, paragraphs=0)["documents"][0]
+    fake.documents[document_id].batch_update(
+        [
+            {
+                "insertText": {
+                    "location": {"index": 1},
+                    "text": "Plan\nAlpha notes\nBudget\nBeta costs\n",
+                }
+            },
+            {
+                "updateParagraphStyle": {
+                    "range": {"startIndex": 1, "endIndex": 2},
+                    "paragraphStyle": {"namedStyleType": "HEADING_1"},
+                    "fields": "namedStyleType",
+                }
+            },
+            {
+                "updateParagraphStyle": {
+                    "range": {"startIndex": 18, "endIndex": 19},
+                    "paragraphStyle": {"namedStyleType": "HEADING_1"},
+                    "fields": "namedStyleType",
+                }
+            },
+        ]
+    )
+    return fake, document_id, server, run
+
+
+async def test_tools_answer_from_cached_index(fake_docs):
+    """The index is built once per revision and its indexes address follow-up edits."""
+    fake, document_id, server, run = fake_docs
+
+    outline = await run("docs_outline", {"document_id": document_id})
+    assert [h["text"] for h in outline["headings"]] == ["Plan", "Budget"]
+
+    section = await run("docs_get_section", {"document_id": document_id, "heading": "budget"})
+    assert section["content"] == "Budget\nBeta costs\n\n"  # and the final empty paragraph
+
+    found = await run("docs_find", {"document_id": document_id, "query": "Beta"})
+    match = found["matches"][0]
+    assert match["section"] == "Budget"
+    assert server.contexts.get().docs.index_stats() == {"entries": 1, "hits": 2, "builds": 1}
+
+    await run(
+        "docs_batch_update",
+        {
+            "document_id": document_id,
+            "requests": [
+                {
+                    "deleteContentRange": {
+                        "range": {
+                            "startIndex": match["start_index"],
+                            "endIndex": match["end_index"],
+                        }
+                    }
+                }
+            ],
+        },
+    )
+    assert fake.documents[document_id].text.endswith("Budget\n costs\n\n")
+
+    again = await run("docs_find", {"document_id": document_id, "query": "Beta"})
+    assert again["total"] == 0
+    assert server.contexts.get().docs.index_stats()["builds"] == 2
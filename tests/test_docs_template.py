@@ -0,0 +1,76 @@
+"""Tests for creating documents from a template."""
+
+import pytest
+
+from mcp_google_suite.drive.paths import FOLDER_MIME_TYPE
+
+
+@pytest.fixture
+def fake_template(fake_google):
+    """A template document, a Reports folder and a runner for docs_create_from_template."""
+    fake, _server, run_tool = fake_google
+    fake._add_file("Reports", FOLDER_MIME_TYPE)
+    template_id = fake.seed(documents=1, paragraphs=0)["documents"][0]
+    fake.documents[template_id].batch_update(
+        [
+            {
+                "insertText": {
+                    "location": {"index": 1},
+                    "text": "Report for {{client}}\nTotal: {{total}} ({{client}})",
+                }
+            }
+        ]
+    )
+
+    async def run(arguments):
+        return await run_tool("docs_create_from_template", arguments)
+
+    return fake, template_id, run
+
+
+async def test_create_from_template_takes_one_copy_and_one_update(fake_template):
+    """The copy lands in the folder with its placeholders filled; the template is unchanged."""
+    fake, template_id, run = fake_template
+
+    result = await run(
+        {
+            "template_id": template_id,
+            "title": "Acme report",
+            "folder_path": "Reports",
+            "substitutions": {"client": "Acme", "total": 42, "region": "EU"},
+        }
+    )
+
+    document_id = result["document_id"]
+    assert result["title"] == "Acme report"
+    assert result["replacements"] == {"client": 2, "total": 1, "region": 0}
+    assert result["unmatched"] == ["region"]
+    assert fake.documents[document_id].text == "Report for Acme\nTotal: 42 (Acme)\n"
+    assert fake.documents[template_id].text.startswith("Report for {{client}}")
+    folder = next(file["id"] for file in fake.files.values() if file["name"] == "Reports")
+    assert fake.files[document_id]["parents"] == [folder]
+    requests = fake.stats()["requests"]
+    assert requests["drive.files.copy"] == 1
+    assert requests["docs.documents.batchUpdate"] == 1
+
+
+async def test_failed_fill_trashes_the_copy(fake_template):
+    """A copy that cannot be filled is moved to the trash and the call fails."""
+    fake, _template_id, run = fake_template
+    spreadsheet_id = fake.seed(spreadsheets=1, rows=1, columns=1)["spreadsheets"][0]
+
+    with pytest.raises(Exception, match="Failed to fill template"):
+        await run({"template_id": spreadsheet_id, "substitutions": {"client": "Acme"}})
+
+    copies = [file for file in fake.files.values() if file["name"].startswith("Copy of")]
+    assert [file["trashed"] for file in copies] == [True]
+
+
+async def test_spaced_placeholder_names_are_rejected(fake_template):
+    """Names that replaceAllText could never match fail before the template is copied."""
+    fake, template_id, run = fake_template
+
+    with pytest.raises(ValueError, match="Invalid placeholder names"):
+        await run({"template_id": template_id, "substitutions": {" client ": "Acme"}})
+
+    assert "drive.files.copy" not in fake.stats()["requests"]
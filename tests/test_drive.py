@@ -0,0 +1,118 @@
+"""Tests for the Drive service bulk operations and path resolution."""
+
+import re
+
+from mcp_google_suite.drive.paths import FOLDER_MIME_TYPE, PathTrie
+from mcp_google_suite.drive.service import DriveService
+
+
+class FakeRequest:
+    def __init__(self, method, **kwargs):
+        self.method = method
+        self.kwargs = kwargs
+
+
+class FakeFiles:
+    def get(self, **kwargs):
+        return FakeRequest("get", **kwargs)
+
+    def update(self, **kwargs):
+        return FakeRequest("update", **kwargs)
+
+    def list(self, **kwargs):
+        return FakeRequest("list", **kwargs)
+
+
+class FakeBatch:
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self, http=None):
+        self.service.batches.append([request.method for _id, request in self.requests])
+        for request_id, request in self.requests:
+            if request.method == "list":
+                query = re.match(r"'(.*)' in parents and name = '(.*)'", request.kwargs["q"])
+                parent, name = query.groups()
+                folder = {"id": f"{parent}/{name}", "mimeType": FOLDER_MIME_TYPE}
+                files = [] if name == "missing" else [folder]
+                self.callback(request_id, {"files": files}, None)
+            elif request.kwargs["fileId"] == "missing":
+                self.callback(request_id, None, Exception("File not found"))
+            elif request.method == "get":
+                self.callback(request_id, {"parents": ["old-parent"]}, None)
+            else:
+                self.callback(request_id, {"id": request.kwargs["fileId"], **request.kwargs}, None)
+
+
+class FakeService:
+    def __init__(self):
+        self.batches = []
+
+    def files(self):
+        return FakeFiles()
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(self, callback)
+
+
+class FakeAuth:
+    async def get_credentials(self):
+        return object()
+
+
+async def test_move_files_batches_lookups_and_updates():
+    """Parents are fetched in one batch and updates applied in another."""
+    drive = DriveService(auth=FakeAuth())
+    drive._service = FakeService()
+
+    result = await drive.move_files(["a", "missing", "b", "a"], "new-parent")
+
+    assert drive._service.batches == [["get", "get", "get"], ["update", "update"]]
+    assert [item["file_id"] for item in result["results"]] == ["a", "missing", "b"]
+    assert result["succeeded"] == 2
+    assert result["failed"] == 1
+    assert result["results"][0]["file"]["removeParents"] == "old-parent"
+    assert result["results"][1]["error"] == "File not found"
+
+
+async def test_resolve_paths_batches_each_level_and_caches():
+    """Cold paths need one batch per level; hot paths need none."""
+    drive = DriveService(auth=FakeAuth())
+    drive._service = FakeService()
+
+    resolved = await drive.resolve_paths(["Reports/2026/Q3", "Reports/2025", "Reports/missing/x"])
+
+    assert drive._service.batches == [["list"], ["list", "list", "list"], ["list"]]
+    assert resolved["Reports/2026/Q3"]["id"] == "root/Reports/2026/Q3"
+    assert resolved["Reports/missing/x"]["success"] is False
+
+    drive._service.batches.clear()
+    assert (await drive.resolve_path("/Reports/2026/Q3/"))["success"] is True
+    assert drive._service.batches == []
+
+
+def test_invalidate_drops_descendants():
+    """Moving a folder drops its cached paths, including descendants."""
+    trie = PathTrie()
+    trie.add_child("root", "Reports", "r", FOLDER_MIME_TYPE)
+    trie.add_child("r", "2026", "y", FOLDER_MIME_TYPE)
+    assert [node.file_id for node in trie.walk(["Reports", "2026"])] == ["r", "y"]
+
+    trie.invalidate("r")
+
+    assert trie.walk(["Reports", "2026"]) == []
+    assert trie.stats()["entries"] == 0
+
+
+def test_expired_entries_are_dropped():
+    """Entries past their TTL are not served."""
+    now = [0.0]
+    trie = PathTrie(ttl=10, clock=lambda: now[0])
+    trie.add_child("root", "Reports", "r", FOLDER_MIME_TYPE)
+    now[0] = 11
+    assert trie.walk(["Reports"]) == []
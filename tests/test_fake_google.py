@@ -0,0 +1,143 @@
+"""Tests for the fake Google backend and the services running against it."""
+
+import asyncio
+import json
+
+import pytest
+
+from mcp_google_suite.fake import (
+    FakeGoogle,
+    FakeSettings,
+)
+from mcp_google_suite.fake.models import DriveQuery
+
+
+def call(fake, method, path, body=None, **query):
+    """Dispatch one request to the fake as the HTTP app would."""
+    payload = json.dumps(body).encode() if body is not None else b""
+    return fake.dispatch(method, path, {k: [v] for k, v in query.items()}, payload, {})
+
+
+@pytest.fixture
+def fake_config():
+    """Keep the rate limiter on so injected errors are retried, with short backoffs."""
+    return {"rate_limit": {"backoff_base_seconds": 0.01, "max_retries": 2}}
+
+
+@pytest.fixture
+def fake_server(fake_google):
+    """A seeded fake and a runner for tools on a server whose clients use it."""
+    fake, _server, run = fake_google
+    seeded = fake.seed(documents=2, paragraphs=12, spreadsheets=1, rows=5)
+    return fake, seeded, run
+
+
+def test_documents_batch_update_and_field_mask():
+    """Edits apply in order, bump the revision, and responses honour ``fields``."""
+    fake = FakeGoogle()
+    status, _, document = call(fake, "POST", "/v1/documents", {"title": "Notes"})
+    assert status == 200
+    document_id = document["documentId"]
+
+    requests = [
+        {"insertText": {"location": {"index": 1}, "text": "Hello world"}},
+        {"replaceAllText": {"containsText": {"text": "world"}, "replaceText": "there"}},
+    ]
+    status, _, reply = call(
+        fake, "POST", f"/v1/documents/{document_id}:batchUpdate", {"requests": requests}
+    )
+    assert status == 200
+    assert reply["replies"][1] == {"replaceAllText": {"occurrencesChanged": 1}}
+
+    status, _, masked = call(
+        fake, "GET", f"/v1/documents/{document_id}", fields="documentId,revisionId"
+    )
+    assert set(masked) == {"documentId", "revisionId"}
+    assert masked["revisionId"] != document["revisionId"]
+    assert fake.documents[document_id].export("text/plain") == "Hello there\n"
+
+    stale = {"requests": requests, "writeControl": {"requiredRevisionId": "rev-old"}}
+    status, _, error = call(fake, "POST", f"/v1/documents/{document_id}:batchUpdate", stale)
+    assert status == 400
+    assert error["error"]["status"] == "INVALID_ARGUMENT"
+
+
+def test_drive_query():
+    """Drive queries combine parents, name and trashed terms with boolean operators."""
+    file = {"name": "Q3 report", "mimeType": "text/plain", "parents": ["f1"], "trashed": False}
+    assert DriveQuery("'f1' in parents and trashed = false").matches(file)
+    assert DriveQuery("name contains 'report' and not mimeType = 'x'").matches(file)
+    assert not DriveQuery("(name = 'a' or name = 'b') and 'f1' in parents").matches(file)
+    assert DriveQuery("fullText contains 'revenue'").matches(file, "Revenue grew")
+
+
+async def test_services_against_fake(fake_server):
+    """Docs, Drive (including the batch endpoint) and Sheets tools work end to end."""
+    fake, seeded, run = fake_server
+    document_id = seeded["documents"][0]
+
+    result = await run("docs_get_content", {"document_id": document_id, "format": "markdown"})
+    assert result["content"].startswith("# Section 1\n")
+
+    requests = [{"insertText": {"location": {"index": 1}, "text": "Draft "}}]
+    result = await run("docs_batch_update", {"document_id": document_id, "requests": requests})
+    assert result["success"] is True
+    assert fake.documents[document_id].export("text/plain").startswith("Draft Section 1")
+
+    folder = await run("drive_create_folder", {"name": "Archive"})
+    folder_id = folder["folder"]["id"]
+    moved = await run(
+        "drive_move_files", {"file_ids": seeded["documents"], "new_parent_id": folder_id}
+    )
+    assert moved["succeeded"] == 2
+    assert all(fake.files[file_id]["parents"] == [folder_id] for file_id in seeded["documents"])
+
+    spreadsheet_id = seeded["spreadsheets"][0]
+    updated = await run(
+        "sheets_update_values",
+        {"spreadsheet_id": spreadsheet_id, "range": "Sheet1!B2", "values": [[1, 2]]},
+    )
+    assert updated["result"]["updatedCells"] == 2
+    values = await run(
+        "sheets_get_values", {"spreadsheet_id": spreadsheet_id, "range": "Sheet1!A2:C2"}
+    )
+    assert values["values"] == [["R1C0", "1", "2"]]
+
+
+async def test_concurrent_calls_use_separate_connections(fake_server):
+    """Concurrent calls through one client do not share its httplib2 connection."""
+    fake, seeded, run = fake_server
+    fake.settings.latency_seconds = 0.02
+
+    calls = [
+        run("drive_get_file_metadata", {"file_id": seeded["documents"][i % 2]}) for i in range(8)
+    ]
+    results = await asyncio.gather(*calls)
+
+    assert all(result["success"] for result in results)
+
+
+async def test_injected_errors_are_retried(fake_server):
+    """Injected 503s are retried for reads and surface as failures once retries run out."""
+    fake, seeded, run = fake_server
+    fake.settings = FakeSettings(error_rate=1.0, error_status=503)
+
+    result = await run("drive_get_file_metadata", {"file_id": seeded["documents"][0]})
+
+    assert result["success"] is False
+    assert fake.injected_errors == 3
+    fake.settings = FakeSettings()
+    result = await run("drive_get_file_metadata", {"file_id": seeded["documents"][0]})
+    assert result["success"] is True
+
+
+async def test_injected_export_errors_are_retried(fake_server):
+    """Drive exports are retried on 503s like other reads before the call fails."""
+    fake, seeded, run = fake_server
+    fake.settings = FakeSettings(error_rate=1.0, error_status=503)
+
+    with pytest.raises(Exception, match="Failed to export document"):
+        await run("docs_get_content", {"document_id": seeded["documents"][0]})
+
+    assert fake.injected_errors == 3
+    assert fake.stats()["requests"].get("drive.files.export", 0) == 0
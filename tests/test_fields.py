@@ -0,0 +1,28 @@
+"""Tests for field mask resolution."""
+
+import pytest
+
+from mcp_google_suite.fields import PRESET_FIELDS, requested_names, resolve_fields
+
+
+def test_presets_and_defaults():
+    """Presets resolve to their masks and missing fields use the default."""
+    assert resolve_fields("drive.file", "minimal") == PRESET_FIELDS["drive.file"]["minimal"]
+    assert resolve_fields("drive.file", None) == PRESET_FIELDS["drive.file"]["default"]
+    assert resolve_fields("drive.file", None, default="id") == "id"
+
+
+def test_custom_fields_keep_nested_selections():
+    """Comma-separated and list selectors are validated on their top-level name."""
+    mask = resolve_fields("drive.file", "id, owners(emailAddress, displayName)")
+    assert mask == "id, owners(emailAddress, displayName)"
+    assert requested_names(mask) == ["id", "owners"]
+    assert resolve_fields("sheets.values", ["range", "values"]) == "range, values"
+
+
+def test_unknown_fields_rejected():
+    """Fields outside the allowlist raise ValueError."""
+    with pytest.raises(ValueError, match="secret"):
+        resolve_fields("docs.document", "title, secret")
+    with pytest.raises(ValueError, match="Unbalanced"):
+        resolve_fields("drive.file", "owners(emailAddress")
@@ -0,0 +1,122 @@
+"""Tests for idempotency keys on write tools."""
+
+import asyncio
+
+import pytest
+from starlette.testclient import TestClient
+
+from mcp_google_suite.config import Config, IdempotencyConfig
+from mcp_google_suite.idempotency import IdempotencyConflictError, IdempotencyStore
+from mcp_google_suite.server import GoogleWorkspaceMCPServer
+from mcp_google_suite.web_app import create_web_app
+
+
+async def test_retry_joins_then_replays_original_result():
+    """A repeat during the call joins it; a repeat afterwards replays it."""
+    store = IdempotencyStore()
+    writes = []
+    release = asyncio.Event()
+
+    async def write():
+        writes.append(1)
+        await release.wait()
+        return {"success": True, "write": len(writes)}
+
+    first = asyncio.create_task(store.run("docs_batch_update", "k1", {"id": "d"}, write))
+    retry = asyncio.create_task(store.run("docs_batch_update", "k1", {"id": "d"}, write))
+    await asyncio.sleep(0)
+    release.set()
+    assert await first == await retry == {"success": True, "write": 1}
+
+    assert await store.run("docs_batch_update", "k1", {"id": "d"}, write) == {
+        "success": True,
+        "write": 1,
+    }
+    assert len(writes) == 1
+    assert store.stats()["joined"] == 1 and store.stats()["replayed"] == 1
+
+    with pytest.raises(IdempotencyConflictError):
+        await store.run("docs_batch_update", "k1", {"id": "other"}, write)
+
+
+async def test_failed_calls_are_not_recorded():
+    """A failure leaves the key free so the retry runs again."""
+    store = IdempotencyStore()
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("timeout")
+        return {"success": True}
+
+    with pytest.raises(RuntimeError):
+        await store.run("docs_create", "k", {}, flaky)
+    assert await store.run("docs_create", "k", {}, flaky) == {"success": True}
+    assert len(attempts) == 2
+
+
+async def test_disk_store_replays_across_instances(tmp_path):
+    """Records on disk survive a new store, e.g. another worker or a restart."""
+    config = IdempotencyConfig(directory=str(tmp_path))
+    writes = []
+
+    async def write():
+        writes.append(1)
+        return {"success": True, "documentId": "d"}
+
+    await IdempotencyStore(config).run("docs_create", "k", {"title": "t"}, write)
+    replayed = await IdempotencyStore(config).run("docs_create", "k", {"title": "t"}, write)
+
+    assert replayed == {"success": True, "documentId": "d"}
+    assert len(writes) == 1
+    assert not list(tmp_path.glob("*.pending"))
+
+
+def test_invoke_tool_accepts_idempotency_key_header():
+    """The HTTP adapter replays a write retried with the same Idempotency-Key."""
+    server = GoogleWorkspaceMCPServer(Config())
+    context = server.contexts.get()
+    calls = []
+
+    async def authorized():
+        return True
+
+    async def create(title, content=None):
+        calls.append(title)
+        return {"success": True, "document": {"documentId": f"doc-{len(calls)}"}}
+
+    context.auth.is_authorized = authorized
+    context.docs.create_document = create
+    client = TestClient(create_web_app(server))
+    request = {"tool_name": "docs_create", "params": {"title": "Report"}}
+    headers = {"Idempotency-Key": "abc"}
+
+    first = client.post("/invoke-tool", json=request, headers=headers).json()
+    second = client.post("/invoke-tool", json=request, headers=headers).json()
+
+    assert first == second
+    assert calls == ["Report"]
+    schema = server.registry.schema("docs_create").inputSchema
+    assert "idempotency_key" in schema["properties"]
+    assert (
+        "idempotency_key"
+        not in server.registry.schema("docs_get_content").inputSchema["properties"]
+    )
+
+
+async def test_reported_failure_is_retried_upstream(fake_google):
+    """A write that returns ``success: False`` is not replayed; its retry calls Google again."""
+    fake, server, run = fake_google
+    arguments = {
+        "spreadsheet_id": "missing",
+        "range": "A1",
+        "values": [["x"]],
+        "idempotency_key": "k1",
+    }
+    for _attempt in range(2):
+        result = await run("sheets_update_values", dict(arguments))
+        assert result["success"] is False
+
+    assert fake.stats()["requests"]["sheets.spreadsheets.values.update"] == 2
+    assert server.idempotency.stats()["replayed"] == 0
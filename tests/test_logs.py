@@ -0,0 +1,88 @@
+"""Tests for queued structured logging and tool argument summaries."""
+
+import io
+import json
+import logging
+import queue
+
+import pytest
+
+from mcp_google_suite.config import Config, LoggingConfig
+from mcp_google_suite.logs import DeferredQueueHandler, configure_logging, summarize
+from mcp_google_suite.server import GoogleWorkspaceMCPServer
+
+
+def test_summarize_caps_size_and_redacts():
+    """Large payloads are cut per level and secrets hidden, whatever the input size."""
+    arguments = {
+        "spreadsheet_id": "sheet-1",
+        "auth": {"access_token": "ya29.secret", "nested": {"deep": {"deeper": 1}}},
+        "values": [["x" * 1000] * 50] * 100_000,
+    }
+
+    summary = summarize(arguments, max_chars=400, redact=["token"])
+
+    assert len(summary) < 450
+    assert summary.startswith('{"spreadsheet_id": "sheet-1"')
+    assert '"access_token": "[redacted]"' in summary and "ya29" not in summary
+    assert '"deep": "{1 keys}"' in summary
+    assert "+99995 items" in summarize({"rows": list(range(100_000))})
+    assert "...(+" in summarize({"text": "y" * 5000}, max_chars=50)
+
+
+def test_queue_handler_defers_formatting_and_never_blocks():
+    """Records are queued with their arguments unformatted; a full queue drops them."""
+    log_queue = queue.Queue(maxsize=1)
+    handler = DeferredQueueHandler(log_queue)
+    record = logging.makeLogRecord({"msg": "tool %s", "args": ("docs_create",)})
+
+    handler.handle(record)
+    handler.handle(logging.makeLogRecord({"msg": "overflow"}))
+
+    queued = log_queue.get_nowait()
+    assert queued.msg == "tool %s" and queued.args == ("docs_create",)
+    assert handler.dropped == 1
+
+
+@pytest.fixture
+def log_stream():
+    """Route logging into a buffer for one test and restore the root logger afterwards."""
+    root = logging.getLogger()
+    level = root.level
+    stream = io.StringIO()
+    # The default level keeps the INFO tool call lines
+    config = LoggingConfig(format="json", tool_sample_rates={"sampled": 0.0})
+    pipeline = configure_logging(config, stream)
+    try:
+        yield pipeline, stream
+    finally:
+        pipeline.stop()
+        root.setLevel(level)
+
+
+async def test_tool_calls_are_logged_as_json(log_stream):
+    """Each call gets one JSON line with a bounded argument summary; sampling skips successes."""
+    pipeline, stream = log_stream
+    server = GoogleWorkspaceMCPServer(Config(logging=pipeline.config))
+
+    async def ok(context, arguments):
+        return {"success": True}
+
+    async def fail(context, arguments):
+        raise ValueError("bad input")
+
+    await server.run_tool("docs_create", ok, None, {"title": "t", "content": "z" * 10_000})
+    await server.run_tool("sampled", ok, None, {})
+    with pytest.raises(ValueError):
+        await server.run_tool("sampled", fail, None, {})
+    pipeline.stop()
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    calls = [line for line in lines if line["logger"] == "mcp_google_suite.tool_calls"]
+    assert [(line["tool"], line["outcome"], line["level"]) for line in calls] == [
+        ("docs_create", "ok", "INFO"),
+        ("sampled", "ValueError", "WARNING"),
+    ]
+    assert "+9920 chars" in calls[0]["arguments"]
+    assert calls[0]["duration_ms"] >= 0
+    assert server.call_log.stats()["sampled_out"] == 1
@@ -0,0 +1,75 @@
+"""Tests for metrics collection and the /metrics endpoint."""
+
+import pytest
+from starlette.testclient import TestClient
+
+from mcp_google_suite.config import Config
+from mcp_google_suite.launcher import dump_metrics
+from mcp_google_suite.metrics import MetricsRegistry
+from mcp_google_suite.server import GoogleWorkspaceMCPServer
+from mcp_google_suite.web_app import create_web_app
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Observations land in pre-computed buckets rendered cumulatively."""
+    registry = MetricsRegistry(prefix="test")
+    histogram = registry.histogram("latency_seconds", "Latency", ["tool"], buckets=(0.1, 1.0))
+    histogram.observe(0.05, "a")
+    histogram.observe(0.5, "a")
+    histogram.observe(5.0, "a")
+
+    text = registry.render()
+
+    assert 'test_latency_seconds_bucket{tool="a",le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{tool="a",le="1.0"} 2' in text
+    assert 'test_latency_seconds_bucket{tool="a",le="+Inf"} 3' in text
+    assert 'test_latency_seconds_count{tool="a"} 3' in text
+
+
+async def test_tool_calls_are_measured():
+    """run_tool records latency, in-flight and errors per tool."""
+    server = GoogleWorkspaceMCPServer(Config())
+
+    async def ok(context, arguments):
+        return {"success": True}
+
+    async def broken(context, arguments):
+        raise ValueError("bad input")
+
+    await server.run_tool("docs_create", ok, None, {})
+    with pytest.raises(ValueError):
+        await server.run_tool("docs_create", broken, None, {})
+
+    text = server.metrics.render()
+    assert 'mcp_google_suite_tool_call_duration_seconds_count{tool="docs_create"} 2' in text
+    assert 'mcp_google_suite_tool_calls_in_flight{tool="docs_create"} 0' in text
+    assert 'tool_call_errors_total{tool="docs_create",error="ValueError"} 1' in text
+
+
+def test_metrics_endpoint_serves_prometheus_text():
+    """The web app exposes the registry at /metrics."""
+    server = GoogleWorkspaceMCPServer(Config())
+    server.metrics.upstream("docs", "docs.documents.get", 200, 0.2, received=1024)
+
+    response = TestClient(create_web_app(server)).get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'mcp_google_suite_upstream_received_bytes_total{service="docs"} 1024' in response.text
+    assert 'method="docs.documents.get",status="200"' in response.text
+
+
+def test_metrics_are_dumped_on_exit_only_to_a_dump_path(tmp_path, capsys):
+    """Without a dump path the exit dump is skipped; SIGUSR1 still writes to stderr."""
+    server = GoogleWorkspaceMCPServer(Config())
+
+    dump_metrics(server, requested=False)
+    assert capsys.readouterr().err == ""
+    dump_metrics(server)
+    assert "mcp_google_suite_" in capsys.readouterr().err
+
+    path = tmp_path / "metrics.prom"
+    server = GoogleWorkspaceMCPServer(Config(metrics={"dump_path": str(path)}))
+    dump_metrics(server, requested=False)
+    assert "mcp_google_suite_" in path.read_text()
+    assert capsys.readouterr().err == ""
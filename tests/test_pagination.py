@@ -0,0 +1,119 @@
+"""Tests for result-size budgets and continuation tokens."""
+
+import pytest
+from starlette.testclient import TestClient
+
+from mcp_google_suite.config import Config, PaginationConfig
+from mcp_google_suite.pagination import ResultPager, cut
+from mcp_google_suite.server import GoogleWorkspaceMCPServer
+from mcp_google_suite.web_app import create_web_app
+
+
+def test_cut_keeps_paragraphs_and_rows_whole():
+    """Pages end after a line break or a whole row, and always make progress."""
+    text = "first paragraph\nsecond paragraph\nthird\n"
+
+    assert cut(text, 0, 30) == len("first paragraph\n")
+    assert cut(text, 16, 100) == len(text)
+    assert cut("x" * 50, 0, 20) == 20
+
+    rows = [["a", "b"], ["c", "d"], ["e", "f"]]
+    assert cut(rows, 0, 25) == 2
+    assert cut(rows, 0, 1) == 1
+    assert cut(rows, 2, 1) == 3
+
+
+def test_pages_reassemble_the_result():
+    """Following continuation tokens returns the rest of the text in order."""
+    pager = ResultPager(PaginationConfig(max_result_chars=40))
+    text = "".join(f"paragraph {index}\n" for index in range(20))
+
+    page = pager.paginate("docs_get_content", {"content": text, "format": "text"})
+    parts = [page["content"]]
+    while page["truncated"]:
+        page = pager.fetch(page["continuation_token"])
+        assert page["format"] == "text"
+        parts.append(page["content"])
+
+    assert "".join(parts) == text
+    assert all(part.endswith("\n") for part in parts)
+    assert pager.paginate("docs_get_content", {"content": "short"}) == {"content": "short"}
+    assert pager.paginate("docs_create", {"content": text})["content"] == text
+
+    with pytest.raises(ValueError, match="expired or is unknown"):
+        pager.fetch("unknown.0")
+    with pytest.raises(ValueError, match="Invalid"):
+        pager.fetch("no-position")
+    with pytest.raises(ValueError, match="positive integer"):
+        pager.paginate("docs_get_content", {"content": text}, max_chars=0)
+
+
+def test_memory_store_is_bounded_and_disk_store_is_shared(tmp_path):
+    """Old spills are evicted past the limits; spills on disk resolve in another process."""
+    config = PaginationConfig(max_result_chars=10, max_entries=2)
+    pager = ResultPager(config)
+    tokens = [
+        pager.paginate("docs_get_content", {"content": "line\n" * 10})["continuation_token"]
+        for _ in range(3)
+    ]
+
+    assert pager.stats()["store"]["entries"] == 2
+    with pytest.raises(ValueError):
+        pager.fetch(tokens[0])
+    assert pager.fetch(tokens[2])["offset"] == 10
+
+    small = ResultPager(PaginationConfig(max_result_chars=10, max_bytes=20))
+    page = small.paginate("docs_get_content", {"content": "line\n" * 10})
+    assert page["truncated"] and "continuation_token" not in page
+
+    disk = PaginationConfig(max_result_chars=10, directory=str(tmp_path))
+    page = ResultPager(disk).paginate("sheets_get_values", {"values": [["x"]] * 10})
+    assert ResultPager(disk).fetch(page["continuation_token"])["values"] == [["x"]]
+
+
+def test_fetch_more_serves_the_rest_without_calling_google():
+    """Oversized sheet values are cut at rows and fetch_more pages through the remainder."""
+    server = GoogleWorkspaceMCPServer(Config())
+    context = server.contexts.get()
+    calls = []
+
+    async def authorized():
+        return True
+
+    async def get_values(spreadsheet_id, range_name, fields=None):
+        calls.append(range_name)
+        rows = [[f"r{index}", "value"] for index in range(100)]
+        return {"success": True, "range": range_name, "values": rows}
+
+    context.auth.is_authorized = authorized
+    context.sheets.get_values = get_values
+    client = TestClient(create_web_app(server))
+
+    first = client.post(
+        "/invoke-tool",
+        json={
+            "tool_name": "sheets_get_values",
+            "params": {"spreadsheet_id": "s", "range": "A:B", "max_result_chars": 300},
+        },
+    ).json()["result"]
+    rows = list(first["values"])
+    token = first["continuation_token"]
+    while token:
+        page = client.post(
+            "/invoke-tool",
+            json={"tool_name": "fetch_more", "params": {"continuation_token": token}},
+        ).json()["result"]
+        assert page["range"] == "A:B" and page["offset"] == len(rows)
+        rows.extend(page["values"])
+        token = page.get("continuation_token")
+
+    assert first["truncated"] and first["remaining"] == 100 - len(first["values"])
+    assert rows == [[f"r{index}", "value"] for index in range(100)]
+    assert calls == ["A:B"]
+    expired = client.post(
+        "/invoke-tool",
+        json={"tool_name": "fetch_more", "params": {"continuation_token": "gone.0"}},
+    )
+    assert expired.status_code == 400
+    schema = server.registry.schema("sheets_get_values").inputSchema
+    assert "max_result_chars" in schema["properties"]
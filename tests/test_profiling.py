@@ -0,0 +1,53 @@
+"""Tests for sampled tool call profiles and on-demand process profiles."""
+
+import asyncio
+
+from starlette.testclient import TestClient
+
+from mcp_google_suite.config import Config, ProfilingConfig
+from mcp_google_suite.server import GoogleWorkspaceMCPServer
+from mcp_google_suite.web_app import create_web_app
+
+
+async def test_sampled_tool_call_writes_folded_profile(tmp_path):
+    """A profiled call leaves a folded stack file naming the code that waited."""
+    config = Config(
+        profiling=ProfilingConfig(sample_rate=1.0, interval_seconds=0.001, directory=str(tmp_path))
+    )
+    server = GoogleWorkspaceMCPServer(config)
+
+    async def slow_upstream_call():
+        await asyncio.sleep(0.05)
+
+    async def handler(context, arguments):
+        await slow_upstream_call()
+        return {"success": True}
+
+    assert await server.run_tool("docs_create", handler, None, {}) == {"success": True}
+
+    (profile,) = tmp_path.glob("*-docs_create-*.folded")
+    lines = profile.read_text().splitlines()
+    assert lines
+    assert any("slow_upstream_call" in line for line in lines)
+    assert server.profiler.stats()["calls_profiled"] == 1
+
+
+def test_debug_profile_endpoint(tmp_path):
+    """/debug/profile is opt-in and returns stacks, memory figures and file paths."""
+    server = GoogleWorkspaceMCPServer(Config())
+    assert TestClient(create_web_app(server)).get("/debug/profile").status_code == 404
+
+    config = Config(
+        profiling=ProfilingConfig(
+            debug_endpoints=True, interval_seconds=0.001, directory=str(tmp_path)
+        )
+    )
+    server = GoogleWorkspaceMCPServer(config)
+    response = TestClient(create_web_app(server)).get("/debug/profile?seconds=0.05")
+
+    assert response.status_code == 200
+    report = response.json()
+    assert report["samples"] > 0
+    assert report["memory"]["peak_bytes"] >= 0
+    assert (tmp_path / report["files"]["profile"].split("/")[-1]).exists()
+    assert (tmp_path / report["files"]["memory"].split("/")[-1]).exists()
@@ -0,0 +1,97 @@
+"""Tests for client-side rate limiting and retries."""
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from mcp_google_suite.config import QuotaConfig, RateLimitConfig
+from mcp_google_suite.ratelimit import READ, WRITE, RateLimitedError, RateLimiter
+
+
+class FakeTime:
+    """Clock and sleep that advance together without real waiting."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def clock(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def http_error(status, retry_after=None, content=b"{}"):
+    headers = {"status": status}
+    if retry_after is not None:
+        headers["retry-after"] = str(retry_after)
+    return HttpError(httplib2.Response(headers), content)
+
+
+def make_limiter(**overrides):
+    fake = FakeTime()
+    config = RateLimitConfig(
+        quotas={"docs": QuotaConfig(read_per_minute=60, write_per_minute=60)},
+        burst_seconds=2,
+        **overrides,
+    )
+    return RateLimiter(config, clock=fake.clock, sleep=fake.sleep), fake
+
+
+async def test_bucket_throttles_beyond_burst_and_drops_long_waits():
+    """Calls past the burst wait for refill; waits beyond the limit are dropped."""
+    limiter, fake = make_limiter(max_wait_seconds=3)
+
+    for _ in range(4):
+        await limiter.acquire("docs", "cred", READ)
+    assert fake.sleeps == [1.0, 1.0]
+
+    with pytest.raises(RateLimitedError):
+        await limiter.acquire("docs", "cred", READ, count=10)
+
+    # Other credentials and write quota have their own buckets
+    await limiter.acquire("docs", "other", READ)
+    await limiter.acquire("docs", "cred", WRITE)
+    assert fake.sleeps == [1.0, 1.0]
+    assert limiter.stats()["services"]["docs"]["throttled"] == 2
+    assert limiter.stats()["services"]["docs"]["dropped"] == 10
+
+
+async def test_retries_honor_retry_after_for_safe_calls_only():
+    """A 429 is retried after at least Retry-After seconds unless the call is unsafe."""
+    limiter, fake = make_limiter()
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise http_error(429, retry_after=5)
+        return {"ok": True}
+
+    assert await limiter.call("docs", "cred", READ, flaky, retry=True) == {"ok": True}
+    assert fake.sleeps[-1] >= 5
+    assert limiter.stats()["services"]["docs"]["retried"] == 1
+
+    async def failing():
+        raise http_error(503)
+
+    with pytest.raises(HttpError):
+        await limiter.call("docs", "cred", WRITE, failing, retry=False)
+    assert limiter.stats()["services"]["docs"]["retried"] == 1
+
+
+async def test_rate_limit_403_is_retried_until_exhausted():
+    """403 rateLimitExceeded counts as throttling; retries stop at max_retries."""
+    limiter, _fake = make_limiter(max_retries=2)
+    attempts = []
+
+    async def throttled():
+        attempts.append(1)
+        raise http_error(403, content=b'{"error": {"errors": [{"reason": "rateLimitExceeded"}]}}')
+
+    with pytest.raises(HttpError):
+        await limiter.call("docs", "cred", READ, throttled, retry=True)
+    assert len(attempts) == 3
+    assert limiter.stats()["services"]["docs"]["dropped"] == 1
@@ -0,0 +1,98 @@
+"""Tests for trace replay (``mcp-google-suite bench replay``)."""
+
+import asyncio
+import json
+
+import pytest
+
+from mcp_google_suite.replay import DROPPED, load_trace, main, remap_ids, replay, schedule
+
+
+def write_trace(path, entries):
+    path.write_text("".join(json.dumps(entry) + "\n" for entry in entries))
+    return str(path)
+
+
+def test_load_trace_orders_calls_and_accepts_aliases(tmp_path):
+    """Timestamps become offsets from the first call; an untimed line joins the one above it."""
+    trace = write_trace(
+        tmp_path / "trace.jsonl",
+        [
+            {"timestamp": "2024-06-10T09:00:01.5Z", "tool": "b", "arguments": {"x": 1}},
+            {"timestamp": "2024-06-10T09:00:01Z", "tool_name": "a"},
+            {"name": "c"},
+        ],
+    )
+
+    calls = load_trace(trace)
+
+    timeline = [(call.tool_name, call.offset) for call in calls]
+    assert timeline == [("a", 0.0), ("c", 0.0), ("b", 0.5)]
+    assert calls[2].params == {"x": 1}
+
+    bad = tmp_path / "bad.jsonl"
+    bad.write_text('{"tool_name": "a"}\n{"params": {}}\n')
+    with pytest.raises(ValueError, match=r"bad\.jsonl:2"):
+        load_trace(str(bad))
+
+
+def test_schedule_and_remap(tmp_path):
+    """Speed scales the recorded gaps, rate ignores them, and IDs map to fake files stably."""
+    calls = load_trace(
+        write_trace(tmp_path / "t.jsonl", [{"offset": 0, "tool": "a"}, {"offset": 2, "tool": "b"}])
+    )
+
+    assert schedule(calls, speed=2) == [0.0, 1.0]
+    assert schedule(calls, rate=4, repeat=2) == [0.0, 0.25, 0.5, 0.75]
+    assert schedule(calls, repeat=2) == [0.0, 2.0, 4.0, 6.0]
+
+    seeded = {"documents": ["d1", "d2"], "spreadsheets": ["s1"]}
+    first = remap_ids({"document_id": "prod", "spreadsheet_id": "x", "parent_id": "p"}, seeded)
+    again = remap_ids({"file_ids": ["prod"]}, seeded)
+    assert first["spreadsheet_id"] == "s1" and first["parent_id"] == "root"
+    assert again["file_ids"] == [first["document_id"]]
+
+
+async def test_replay_is_open_loop_with_warmup_and_drops(tmp_path):
+    """Calls go out on schedule while earlier ones are outstanding; excess calls are dropped."""
+    calls = load_trace(write_trace(tmp_path / "t.jsonl", [{"tool": "slow"}, {"tool": "fast"}]))
+
+    async def send(tool_name, params):
+        await asyncio.sleep(0.2 if tool_name == "slow" else 0.01)
+        return 200 if tool_name == "fast" else 503
+
+    report = await replay(calls, schedule(calls, rate=100, repeat=5), send, warmup_seconds=0.02)
+
+    assert report["seconds"] < 0.5  # ten calls of up to 200 ms, not run one after another
+    assert report["warmup_calls"] == 2
+    assert report["tools"]["slow"]["errors"] == 4
+    assert report["tools"]["fast"]["errors"] == 0
+    assert report["peak_in_flight"] >= 5
+
+    limited = await replay(calls, schedule(calls, rate=100, repeat=2), send, max_in_flight=1)
+    assert limited["total"]["dropped"] == 3
+    assert DROPPED == -1
+
+
+def test_replay_command_against_fake(tmp_path, capsys):
+    """``bench replay --fake`` serves the fake APIs and writes a per-tool report."""
+    trace = write_trace(
+        tmp_path / "trace.jsonl",
+        [
+            {"offset": 0, "tool_name": "drive_get_file_metadata", "params": {"file_id": "a"}},
+            {
+                "offset": 0.05,
+                "tool_name": "docs_get_content",
+                "params": {"document_id": "b", "format": "text"},
+            },
+        ],
+    )
+    output = tmp_path / "report.json"
+
+    main(["replay", trace, "--fake", "--fake-latency", "0", "--output", str(output)])
+
+    report = json.loads(output.read_text())
+    assert report["total"]["calls"] == 2
+    assert report["total"]["errors"] == 0
+    assert set(report["tools"]) == {"drive_get_file_metadata", "docs_get_content"}
+    assert "docs_get_content" in capsys.readouterr().out
@@ -0,0 +1,30 @@
+"""Tests for tool result serialization."""
+
+import json
+
+from mcp_google_suite.serialization import ResultSerializer
+
+
+RESULT = {"content": "héllo", "values": [[1, 2], [3, 4]]}
+
+
+def test_compact_output_by_default():
+    """Results are serialized without whitespace."""
+    serializer = ResultSerializer(backend="json")
+    assert serializer.dumps("tool", RESULT) == json.dumps(
+        RESULT, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+
+
+def test_chunks_match_single_serialization_and_record_stats():
+    """Streaming produces the same bytes and both paths are counted per tool."""
+    for backend in ("json", "orjson"):
+        serializer = ResultSerializer(backend=backend)
+        whole = serializer.dumps("sheets_get_values", RESULT)
+        chunks = serializer.iter_chunks("sheets_get_values", RESULT, 4)
+        streamed = b"".join(bytes(chunk) for chunk in chunks)
+
+        assert json.loads(streamed) == json.loads(whole) == RESULT
+        stats = serializer.stats()["tools"]["sheets_get_values"]
+        assert stats["calls"] == 2
+        assert stats["bytes"] == len(whole) + len(streamed)
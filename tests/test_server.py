@@ -1,9 +1,13 @@
 """Integration test for MCP server."""
 
+import json
+
 import pytest
+from starlette.testclient import TestClient
 
 from mcp_google_suite.config import Config
 from mcp_google_suite.server import GoogleWorkspaceMCPServer
+from mcp_google_suite.web_app import create_web_app
 
 
 @pytest.mark.asyncio
@@ -29,3 +33,27 @@ async def test_server_tools():
     }
 
     assert expected_tools.issubset(tool_names), "Not all expected tools are available"
+
+
+def test_tool_registry_is_prebuilt():
+    """Every listed tool has a handler and the /tools payload matches the schemas."""
+    server = GoogleWorkspaceMCPServer(Config())
+    registry = server.registry
+
+    assert set(registry.names) == {tool.name for tool in registry.tools}
+    assert server._get_tools_list() == list(registry.tools)
+    payload = json.loads(registry.payload)
+    assert [tool["name"] for tool in payload["tools"]] == list(registry.names)
+
+
+def test_tools_endpoint_revalidates_with_etag():
+    """/tools serves the cached payload and answers a matching ETag with 304."""
+    server = GoogleWorkspaceMCPServer(Config())
+    client = TestClient(create_web_app(server))
+
+    response = client.get("/tools")
+    assert response.status_code == 200
+    assert response.content == server.registry.payload
+
+    cached = client.get("/tools", headers={"If-None-Match": response.headers["etag"]})
+    assert cached.status_code == 304
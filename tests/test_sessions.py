@@ -0,0 +1,38 @@
+"""Tests for the shared context pool and per-session state."""
+
+import asyncio
+
+from mcp_google_suite.config import Config
+from mcp_google_suite.server import GoogleWorkspaceMCPServer
+from mcp_google_suite.sessions import current_session
+
+
+async def test_sessions_share_one_context_and_end_independently():
+    """Concurrent sessions reuse the same context; closing one leaves the other intact."""
+    server = GoogleWorkspaceMCPServer(Config())
+    first_open, second_done = asyncio.Event(), asyncio.Event()
+    seen = {}
+
+    async def first():
+        async with server.lifespan("sse") as context:
+            seen["first"] = context
+            first_open.set()
+            await second_done.wait()
+            assert server.contexts.current is context
+            seen["first_session"] = current_session.get().transport
+
+    async def second():
+        await first_open.wait()
+        async with server.lifespan("ws") as context:
+            seen["second"] = context
+            assert server.contexts.stats()["sessions"] == {"sse": 1, "ws": 1}
+        second_done.set()
+
+    await asyncio.gather(first(), second())
+
+    assert seen["first"] is seen["second"]
+    assert seen["first_session"] == "sse"
+    stats = server.contexts.stats()
+    assert stats["created"] == 1
+    assert stats["refs"] == 0
+    assert current_session.get() is None
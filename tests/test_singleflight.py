@@ -0,0 +1,62 @@
+"""Tests for singleflight collapsing of identical read calls."""
+
+import asyncio
+
+from mcp_google_suite.config import Config
+from mcp_google_suite.server import GoogleWorkspaceMCPServer
+from mcp_google_suite.singleflight import SingleFlight, call_key
+
+
+def test_call_key_normalizes_arguments():
+    """Argument order and unset values do not change the key."""
+    assert call_key("t", {"a": 1, "b": None, "c": [2]}) == call_key("t", {"c": [2], "a": 1})
+    assert call_key("t", {"a": 1}) != call_key("u", {"a": 1})
+
+
+async def test_concurrent_identical_reads_share_one_call():
+    """Identical read calls collapse; writes and different arguments do not."""
+    server = GoogleWorkspaceMCPServer(Config())
+    upstream = []
+    release = asyncio.Event()
+
+    async def handler(context, arguments):
+        upstream.append(arguments)
+        await release.wait()
+        return {"success": True, "calls": len(upstream)}
+
+    read = {"document_id": "doc"}
+    calls = [
+        server.run_tool("docs_get_content", handler, None, dict(read)),
+        server.run_tool("docs_get_content", handler, None, dict(read)),
+        server.run_tool("docs_get_content", handler, None, {"document_id": "other"}),
+        server.run_tool("docs_batch_update", handler, None, dict(read)),
+        server.run_tool("docs_batch_update", handler, None, dict(read)),
+    ]
+    tasks = [asyncio.create_task(call) for call in calls]
+    await asyncio.sleep(0.01)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert len(upstream) == 4
+    assert results[0] is results[1]
+    stats = server.singleflight.stats()
+    assert stats["tools"]["docs_get_content"] == {"calls": 3, "collapsed": 1}
+    assert stats["inflight"] == 0
+
+
+async def test_follower_survives_leader_cancellation():
+    """Cancelling the first caller does not cancel the shared call."""
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def call():
+        await release.wait()
+        return "done"
+
+    leader = asyncio.create_task(flight.do("t", {}, call))
+    follower = asyncio.create_task(flight.do("t", {}, call))
+    await asyncio.sleep(0)
+    leader.cancel()
+    release.set()
+
+    assert await follower == "done"
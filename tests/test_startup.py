@@ -0,0 +1,40 @@
+"""Tests for the stdio fast-start path."""
+
+import io
+import subprocess
+import sys
+
+from mcp_google_suite.startup import StartupProfile
+
+
+def test_stdio_path_defers_heavy_imports():
+    """Creating a server does not load the web stack or the Google API clients."""
+    code = (
+        "import sys\n"
+        "from mcp_google_suite.server import GoogleWorkspaceMCPServer\n"
+        "GoogleWorkspaceMCPServer()\n"
+        "heavy = ['uvicorn', 'starlette', 'googleapiclient.discovery', 'google_auth_oauthlib']\n"
+        "print(','.join(name for name in heavy if name in sys.modules))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == ""
+
+
+def test_profile_reports_phases():
+    """Enabled profiles list every phase; disabled ones write nothing."""
+    stream = io.StringIO()
+    profile = StartupProfile(enabled=True, stream=stream)
+    with profile.phase("import json"):
+        import json  # noqa: F401
+    profile.report()
+    assert "import json" in stream.getvalue()
+    assert "total" in stream.getvalue()
+
+    quiet = io.StringIO()
+    disabled = StartupProfile(stream=quiet)
+    with disabled.phase("noop"):
+        pass
+    disabled.report()
+    assert disabled.phases == [] and quiet.getvalue() == ""
@@ -0,0 +1,109 @@
+"""Tests for per-call tracing and trace context propagation."""
+
+import json
+from typing import ClassVar
+
+import pytest
+from starlette.testclient import TestClient
+
+from mcp_google_suite.config import Config, TracingConfig
+from mcp_google_suite.server import GoogleWorkspaceMCPServer
+from mcp_google_suite.tracing import SpanExporter, parse_traceparent
+from mcp_google_suite.web_app import create_web_app
+
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+class FakeResponse(dict):
+    status = 200
+
+
+class FakeRequest:
+    """Stands in for an HttpRequest; execute runs postproc like the real one."""
+
+    method = "POST"
+    methodId = "docs.documents.create"  # noqa: N815 - HttpRequest attribute name
+    uri = "https://docs.googleapis.com/v1/documents"
+    body = '{"title": "Report"}'
+    headers: ClassVar[dict] = {}
+
+    def __init__(self):
+        self.postproc = lambda resp, content: json.loads(content)
+
+    def execute(self):
+        return self.postproc(FakeResponse(), b'{"documentId": "doc-1"}')
+
+
+def test_parse_traceparent():
+    """Valid headers yield trace and parent IDs; malformed or all-zero ones are ignored."""
+    assert parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-01") == (TRACE_ID, PARENT_ID, True)
+    assert parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-00")[2] is False
+    assert parse_traceparent(f"00-{'0' * 32}-{PARENT_ID}-01") is None
+    assert parse_traceparent("00-xyz-01") is None
+    assert parse_traceparent(None) is None
+
+
+def test_exporter_without_write_cannot_be_created():
+    """A SpanExporter subclass must implement write."""
+
+    class Incomplete(SpanExporter):
+        pass
+
+    with pytest.raises(TypeError, match="write"):
+        Incomplete()
+
+
+async def test_tracing_disabled_records_nothing():
+    """Without tracing, tool calls run without spans or exporters."""
+    server = GoogleWorkspaceMCPServer(Config())
+
+    async def ok(context, arguments):
+        return {"success": True}
+
+    assert await server.run_tool("docs_create", ok, None, {}) == {"success": True}
+    assert server.tracer.exporters == []
+    assert server.tracer.stats()["traces"] == 0
+
+
+def test_invoke_tool_continues_incoming_trace(tmp_path):
+    """Spans of an HTTP call join the caller's trace and are written as JSON lines."""
+    trace_file = tmp_path / "traces.jsonl"
+    config = Config(tracing=TracingConfig(enabled=True, file_path=str(trace_file)))
+    server = GoogleWorkspaceMCPServer(config)
+    context = server.contexts.get()
+
+    async def authorized():
+        return True
+
+    async def create_document(title, content=None):
+        return await context.docs.execute(FakeRequest())
+
+    context.auth.is_authorized = authorized
+    context.docs.create_document = create_document
+    client = TestClient(create_web_app(server))
+
+    response = client.post(
+        "/invoke-tool",
+        json={"tool_name": "docs_create", "params": {"title": "Report"}},
+        headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"},
+    )
+    server.tracer.flush()
+
+    assert response.status_code == 200
+    assert response.headers["traceparent"].startswith(f"00-{TRACE_ID}-")
+    spans = {span["name"]: span for span in map(json.loads, trace_file.read_text().splitlines())}
+    assert {span["trace_id"] for span in spans.values()} == {TRACE_ID}
+    assert spans["http.invoke_tool"]["parent_id"] == PARENT_ID
+    for name, parent in [
+        ("auth.check", "http.invoke_tool"),
+        ("tool.run", "http.invoke_tool"),
+        ("admission.wait", "tool.run"),
+        ("google.request", "tool.run"),
+        ("executor.wait", "google.request"),
+        ("serialize", "http.invoke_tool"),
+    ]:
+        assert spans[name]["parent_id"] == spans[parent]["span_id"], name
+    assert spans["google.request"]["attributes"]["method"] == "docs.documents.create"
+    assert spans["google.request"]["attributes"]["http.status_code"] == 200
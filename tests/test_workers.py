@@ -0,0 +1,79 @@
+"""Tests for multi-worker serving support."""
+
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from starlette.testclient import TestClient
+
+from mcp_google_suite import localdirs
+from mcp_google_suite.auth.shared_tokens import SharedTokenCache
+from mcp_google_suite.web_app import CONFIG_PATH_ENV, WORKERS_ENV, create_app
+
+
+class FakeCredentials:
+    """Stand-in for google.oauth2 credentials with a controllable refresh."""
+
+    client_id = "client"
+    refresh_token = "refresh"
+
+    def __init__(self, calls):
+        self.token = "stale"
+        self.expiry = datetime.utcnow() - timedelta(minutes=1)
+        self.calls = calls
+
+    @property
+    def valid(self):
+        return self.expiry > datetime.utcnow()
+
+    def refresh(self, request):
+        self.calls.append(request)
+        self.token = f"fresh-{len(self.calls)}"
+        self.expiry = datetime.utcnow() + timedelta(hours=1)
+
+
+def test_shared_token_cache_refreshes_once(tmp_path):
+    """A second worker adopts the token published by the first."""
+    calls = []
+    first, second = FakeCredentials(calls), FakeCredentials(calls)
+
+    assert SharedTokenCache(str(tmp_path)).refresh(first, object) is True
+    assert SharedTokenCache(str(tmp_path)).refresh(second, object) is False
+
+    assert len(calls) == 1
+    assert second.token == first.token == "fresh-1"
+    assert second.valid
+
+
+def test_shared_token_cache_refuses_directory_open_to_others(tmp_path):
+    """A token directory other users can read or write is not used."""
+    directory = tmp_path / "tokens"
+    directory.mkdir(mode=0o700)
+    os.chmod(directory, 0o777)
+
+    with pytest.raises(PermissionError, match="accessible to other users"):
+        SharedTokenCache(str(directory))
+
+    os.chmod(directory, 0o700)
+    assert SharedTokenCache(str(directory)).directory == str(directory)
+
+
+def test_app_factory_reports_worker_load(tmp_path, monkeypatch):
+    """Workers built by the factory share state on local disk and report their load."""
+    config_path = tmp_path / "config.json"
+    config_path.write_text("{}")
+    monkeypatch.setenv(CONFIG_PATH_ENV, str(config_path))
+    monkeypatch.setenv(WORKERS_ENV, "4")
+    monkeypatch.setattr(localdirs, "DEFAULT_SHARED_DIR", str(tmp_path / "shared"))
+
+    with TestClient(create_app()) as client:
+        health = client.get("/health").json()
+
+    # Tokens, idempotency records and spills are shared through private directories
+    for name in ("tokens", "idempotency", "spills"):
+        assert (tmp_path / "shared" / name).stat().st_mode & 0o777 == 0o700
+
+    assert health["status"] == "ok"
+    assert health["worker"]["workers"] == 4
+    assert health["worker"]["in_flight"] == 0
+    assert "loop_lag_ms" in health["worker"]